@@ -0,0 +1,66 @@
+"""
+Виграш від memoize на даних з великою кількістю повторів.
+
+    python bench_memoize.py [--records 1000000] [--unique 5000]
+
+records вхідних рядків вибираються з unique різних значень; кожна функція
+проганяється без кешу (__wrapped__) і з кешем (холодний старт).
+"""
+
+from __future__ import annotations
+import argparse
+import random
+import time
+from datetime import date
+from typing import Callable, List
+
+from module04_3 import normalize_phone
+from module04_4 import parse_birthday
+
+PHONE_TEMPLATES = ("({0}) {1}-{2}", "+38 {0} {1} {2}", "38{0}-{1}-{2}", "  {0}{1}{2}\n")
+
+
+def generate_phones(records: int, unique: int, rnd: random.Random) -> List[str]:
+    pool = [
+        rnd.choice(PHONE_TEMPLATES).format(f"0{rnd.randrange(50, 100)}", rnd.randrange(100, 1000), rnd.randrange(1000, 10000))
+        for _ in range(unique)
+    ]
+    return [rnd.choice(pool) for _ in range(records)]
+
+
+def generate_birthdays(records: int, unique: int, rnd: random.Random) -> List[str]:
+    first = date(1950, 1, 1).toordinal()
+    pool = [date.fromordinal(first + rnd.randrange(20000)).strftime("%Y.%m.%d") for _ in range(unique)]
+    return [rnd.choice(pool) for _ in range(records)]
+
+
+def run(name: str, func: Callable, inputs: List[str]) -> None:
+    plain = func.__wrapped__
+    start = time.perf_counter()
+    expected = [plain(x) for x in inputs]
+    uncached = time.perf_counter() - start
+    func.cache_clear()
+    start = time.perf_counter()
+    got = [func(x) for x in inputs]
+    cached = time.perf_counter() - start
+    assert got == expected
+    info = func.cache_info()
+    print(f"{name:<16} | {uncached:<10.3f} | {cached:<10.3f} | {uncached / cached:<7.1f} | "
+          f"{info.hits}/{info.misses}/{info.evictions}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Порівняння функцій з memoize і без")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Кількість вхідних рядків")
+    parser.add_argument("--unique", type=int, default=5000, help="Кількість різних значень")
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    print(f"{'Функція':<16} | {'без кешу':<10} | {'з кешем':<10} | {'x':<7} | влучання/промахи/витіснення")
+    print("-" * 17 + "|" + "-" * 12 + "|" + "-" * 12 + "|" + "-" * 9 + "|" + "-" * 28)
+    run("normalize_phone", normalize_phone, generate_phones(args.records, args.unique, rnd))
+    run("parse_birthday", parse_birthday, generate_birthdays(args.records, args.unique, rnd))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Декоратор memoize: кеш результатів чистих функцій.
+
+    @memoize(maxsize=4096, ttl=60, max_bytes=1 << 20)
+    def f(x): ...
+
+Витіснення — за кількістю записів (maxsize), за сумарним розміром
+(max_bytes, оцінка sys.getsizeof ключа й значення, без вкладених об'єктів)
+і за віком (ttl, секунди). Порядок витіснення — CLOCK (друга спроба),
+наближення LRU: читання лише позначає запис як використаний, тому шлях
+читання не бере блокування — достатньо атомарного dict.get під GIL.
+Запис і витіснення йдуть під threading.Lock. Функція при промаху
+викликається поза блокуванням: два потоки можуть порахувати одне значення
+двічі, що для чистої функції безпечно. Винятки не кешуються.
+f.cache_info() — лічильники, f.cache_clear() — очищення.
+
+Кожне ДЗ самодостатнє, тож модуль лежить у двох однакових копіях:
+goit-pycore-hw-03 і goit-pycore-hw-05. Змінюйте їх разом.
+"""
+
+from __future__ import annotations
+import functools
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional
+
+# Поля запису кешу (список, щоб позначку використання можна було змінити на місці)
+VALUE, EXPIRES, SIZE, REFERENCED = range(4)
+# Роздільник позиційних та іменованих аргументів у ключі
+KWARGS_MARK = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    bytes: int
+
+
+def memoize(
+    func: Optional[Callable] = None, *, maxsize: Optional[int] = 128,
+    ttl: Optional[float] = None, max_bytes: Optional[int] = None,
+) -> Callable:
+    """
+    maxsize=None — без обмеження кількості, 0 — без кешу. Незахешовні
+    аргументи (списки тощо) передаються у функцію напряму, повз кеш.
+    Лічильник влучань збільшується без блокування, тож за одночасних
+    потоків може трохи відставати; промахи й витіснення точні.
+    """
+    if func is None:
+        return lambda f: memoize(f, maxsize=maxsize, ttl=ttl, max_bytes=max_bytes)
+
+    data: Dict[Hashable, List[Any]] = {}
+    lock = threading.Lock()
+    hits = misses = evictions = total_bytes = 0
+
+    def evict() -> None:
+        # CLOCK: найстаріший запис з позначкою отримує другу спробу — в кінець черги
+        nonlocal evictions, total_bytes
+        while True:
+            key = next(iter(data))
+            entry = data.pop(key)
+            if entry[REFERENCED]:
+                entry[REFERENCED] = False
+                data[key] = entry
+                continue
+            total_bytes -= entry[SIZE]
+            evictions += 1
+            return
+
+    def store(key: Hashable, value: Any) -> None:
+        nonlocal misses, total_bytes
+        expires = time.monotonic() + ttl if ttl is not None else None
+        size = sys.getsizeof(key) + sys.getsizeof(value) if max_bytes is not None else 0
+        with lock:
+            misses += 1
+            old = data.pop(key, None)
+            if old is not None:
+                total_bytes -= old[SIZE]
+            if maxsize == 0 or (max_bytes is not None and size > max_bytes):
+                return  # кеш вимкнено або запис більший за весь бюджет
+            # новий запис позначений, щоб його не витіснило одразу ж
+            data[key] = [value, expires, size, True]
+            total_bytes += size
+            while (maxsize is not None and len(data) > maxsize) or \
+                    (max_bytes is not None and total_bytes > max_bytes):
+                evict()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal hits
+        key = args + (KWARGS_MARK,) + tuple(sorted(kwargs.items())) if kwargs else args
+        try:
+            entry = data.get(key)
+        except TypeError:  # незахешовний аргумент
+            return func(*args, **kwargs)
+        if entry is not None and (entry[EXPIRES] is None or entry[EXPIRES] > time.monotonic()):
+            entry[REFERENCED] = True
+            hits += 1
+            return entry[VALUE]
+        value = func(*args, **kwargs)
+        store(key, value)
+        return value
+
+    def cache_info() -> CacheInfo:
+        with lock:
+            return CacheInfo(hits, misses, evictions, len(data), total_bytes)
+
+    def cache_clear() -> None:
+        nonlocal hits, misses, evictions, total_bytes
+        with lock:
+            data.clear()
+            hits = misses = evictions = total_bytes = 0
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    return wrapper
@@ -1,5 +1,10 @@
 import re
 
+from memoize import memoize
+
+
+# Масові розсилки повторюють ті самі номери: результат кешується
+@memoize(maxsize=65536)
 def normalize_phone(phone_number: str) -> str:
     # чи phone_number є рядком
     if not isinstance(phone_number, str):
@@ -15,23 +20,25 @@ def normalize_phone(phone_number: str) -> str:
         return '+' + digits
     else:
         return '+38' + digits
-    
-# Приклад введення данних
-raw_numbers = [
-    "067\t123 4567",
-    "(095) 234-5678\n",
-    "+380 44 123 4567",
-    "380501234567",
-    "    +38(050)123-32-34",
-    "     0503451234",
-    "(050)8889900",
-    "38050-111-22-22",
-    "38050 111 22 11   ",
-]
 
-sanitized_numbers = [normalize_phone(num) for num in raw_numbers]
-print("Нормалізовані номери телефонів для SMS-розсилки:", sanitized_numbers)
-# Вивід:
-# ['+380671234567', '+380952345678', '+380441234567', 
-# '+380501234567', '+380501233234',  '+380503451234', 
-# '+380508889900', '+380501112222', '+380501112211']
+
+if __name__ == "__main__":
+    # Приклад введення данних
+    raw_numbers = [
+        "067\t123 4567",
+        "(095) 234-5678\n",
+        "+380 44 123 4567",
+        "380501234567",
+        "    +38(050)123-32-34",
+        "     0503451234",
+        "(050)8889900",
+        "38050-111-22-22",
+        "38050 111 22 11   ",
+    ]
+
+    sanitized_numbers = [normalize_phone(num) for num in raw_numbers]
+    print("Нормалізовані номери телефонів для SMS-розсилки:", sanitized_numbers)
+    # Вивід:
+    # ['+380671234567', '+380952345678', '+380441234567', 
+    # '+380501234567', '+380501233234',  '+380503451234', 
+    # '+380508889900', '+380501112222', '+380501112211']
@@ -1,5 +1,10 @@
 from datetime import datetime, date, timedelta
 
+from memoize import memoize
+
+
+# strptime повільний, а дати народження у великих списках повторюються
+@memoize(maxsize=65536)
 def parse_birthday(bday_str: str) -> date:
     # Парсить 'YYYY.MM.DD' у date. Повертає None при помилці формату.
     try:
@@ -59,21 +64,22 @@ def get_upcoming_birthdays(users: list[dict], today: date) -> list[dict]:
     return result
 
 
-# Приклади
-employees = [
-    {"name": "John Doe", "birthday": "1985.12.31"},  # 2005,2006,2016,2017 роки де 31 грудня вихідний
-    {"name": "Mike Doe", "birthday": "1980.01.02"},
-    {"name": "Jane Smith", "birthday": "1990.01.27"},  # 27 січня (звичайний кейс)
-    {"name": "Sam Smith", "birthday": "1980.01.25"},
-    {"name": "Leap Guy", "birthday": "2000.02.29"}  # 2000 високосний
-]
+if __name__ == "__main__":
+    # Приклади
+    employees = [
+        {"name": "John Doe", "birthday": "1985.12.31"},  # 2005,2006,2016,2017 роки де 31 грудня вихідний
+        {"name": "Mike Doe", "birthday": "1980.01.02"},
+        {"name": "Jane Smith", "birthday": "1990.01.27"},  # 27 січня (звичайний кейс)
+        {"name": "Sam Smith", "birthday": "1980.01.25"},
+        {"name": "Leap Guy", "birthday": "2000.02.29"}  # 2000 високосний
+    ]
 
-test_days = [date(2005, 1, 25), date(2005, 12, 30), date(2004, 2, 27)]
+    test_days = [date(2005, 1, 25), date(2005, 12, 30), date(2004, 2, 27)]
 
 
-for tday in test_days:
-    upcoming = get_upcoming_birthdays(employees, tday)
-    print(f"Сьогодні: {tday}")
-    print("Список привітань на цьому тижні:")
-    for u in upcoming:
-        print(u)
+    for tday in test_days:
+        upcoming = get_upcoming_birthdays(employees, tday)
+        print(f"Сьогодні: {tday}")
+        print("Список привітань на цьому тижні:")
+        for u in upcoming:
+            print(u)
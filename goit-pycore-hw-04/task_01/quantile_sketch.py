@@ -0,0 +1,63 @@
+"""
+Потоковий скетч квантилів (спрощений KLL, Karnin–Lang–Liberty, 2016).
+
+Рівень h зберігає значення з вагою 2**h. Коли рівень переповнюється,
+він сортується, і з нього лишається кожне друге значення (парні чи
+непарні позиції — випадково), яке переходить на рівень вище з подвоєною
+вагою. На кожному рівні не більше capacity значень, тож пам'ять —
+O(capacity * log(n / capacity)) незалежно від розміру файлу. Похибка
+рангу квантиля — порядку 1 / capacity від кількості значень.
+"""
+
+from __future__ import annotations
+import random
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterable, List, Sequence
+
+DEFAULT_CAPACITY = 2048
+
+
+class QuantileSketch:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, seed: int = 0) -> None:
+        self.capacity = capacity
+        self.count = 0
+        self.levels: List[List[float]] = [[]]
+        # Фіксоване зерно — однаковий результат для однакового входу
+        self.rng = random.Random(seed)
+
+    def update_many(self, values: Iterable[float]) -> None:
+        level = self.levels[0]
+        before = len(level)
+        level.extend(values)
+        self.count += len(level) - before
+        self._compact()
+
+    def _compact(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.capacity:
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                level.sort()
+                # непарна довжина: останнє (найбільше) значення лишається на рівні
+                odd = level.pop() if len(level) % 2 else None
+                self.levels[h + 1].extend(level[self.rng.randrange(2)::2])
+                self.levels[h] = [odd] if odd is not None else []
+            h += 1
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """
+        Наближені квантилі для q з [0, 1] (0.5 — медіана); порожній скетч — nan.
+        """
+        weighted = sorted((value, 1 << h) for h, level in enumerate(self.levels) for value in level)
+        if not weighted:
+            return [float("nan")] * len(qs)
+        cumulative = list(accumulate(weight for _, weight in weighted))
+        total = cumulative[-1]
+        result = []
+        for q in qs:
+            i = bisect_left(cumulative, q * total)
+            result.append(weighted[min(i, len(weighted) - 1)][0])
+        return result
@@ -1,41 +1,178 @@
 import pathlib
+import re
+from array import array
+from typing import Dict, IO, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
+from quantile_sketch import QuantileSketch
 
-def total_salary(path: str):
+try:
+    import numpy as np
+except ImportError:  # без numpy — ті самі результати, підсумки рахує Python
+    np = None
+
+# Файл читається блоками такого розміру: пам'ять не залежить від розміру файлу
+CHUNK_BYTES = 8 << 20
+PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+# Рядок з двома комами і більше
+EXTRA_COMMA = re.compile(rb",[^,\n]*,")
+# Довше поле numpy не перетворює одним масивом: масив байтових рядків
+# займає кількість полів × довжину найдовшого
+MAX_FIELD_BYTES = 64
+
+
+class SalaryStats(NamedTuple):
+    total: float
+    average: float
+    count: int
+    malformed: int
+    # квантиль -> значення (наближене, див. quantile_sketch.py)
+    percentiles: Dict[float, float]
+
+
+def read_blocks(file: IO[bytes], size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    # Блоки, що закінчуються на межі рядка; неповний рядок переходить у наступний блок
+    tail = b""
+    while True:
+        data = file.read(size)
+        if not data:
+            break
+        data = tail + data
+        cut = data.rfind(b"\n") + 1
+        if cut:
+            yield data[:cut]
+        tail = data[cut:]
+    if tail:
+        yield tail
+
+
+def parse_line(raw: bytes) -> Tuple[List[float], int]:
+    # Повільний шлях для одного рядка: (зарплати, кількість некоректних рядків)
+    salaries, malformed = [], 0
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return salaries, 1
+    # \r у текстовому режимі теж закінчує рядок
+    for line in text.split("\r"):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            _, salary_str = line.split(',')
+            salaries.append(float(salary_str))
+        except ValueError:
+            malformed += 1
+    return salaries, malformed
+
+
+def to_floats(items: Sequence) -> Sequence[float]:
+    # Масив чисел: numpy, якщо встановлено, інакше array('d'); ValueError — є не число
+    if np is None:
+        return array('d', map(float, items))
+    if items and isinstance(items[0], bytes) and max(map(len, items)) <= MAX_FIELD_BYTES:
+        # байтові поля — одним викликом; чого numpy не розбирає, перевіряє float нижче
+        try:
+            return np.array(items).astype(np.float64)
+        except ValueError:
+            pass
+    return np.fromiter(map(float, items), dtype=np.float64, count=len(items))
+
+
+def is_utf8(data: bytes) -> bool:
+    if data.isascii():
+        return True
     try:
-        with open(path, 'r', encoding='utf-8') as file:
-            counter = 0
-            sums = 0
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
+
 
-            for line in file:
-                # Прибираємо пробіли та символи нового рядка
-                line = line.strip()
-                if not line:  # пропускаємо порожні рядки
-                    continue
+def parse_block(block: bytes) -> Tuple[Sequence[float], int]:
+    """
+    Зарплати блоку і кількість некоректних рядків. Якщо в кожному рядку
+    рівно одна кома, блок розбирається цілком: після заміни переводів
+    рядка на коми кожне друге поле — зарплата, і всі поля перетворюються
+    одним викликом. Інакше (порожні чи некоректні рядки, CR без LF,
+    байти не UTF-8, NUL, який numpy відкинув би в кінці поля) — рядок
+    за рядком.
+    """
+    body = block[:-1] if block.endswith(b"\n") else block
+    # ком стільки ж, скільки рядків, і ніде не дві — отже, в кожному рядку одна
+    if body.count(b",") == body.count(b"\n") + 1 and not EXTRA_COMMA.search(body) \
+            and body.count(b"\r") == body.count(b"\r\n") and b"\0" not in body and is_utf8(body):
+        try:
+            return to_floats(body.replace(b"\n", b",").split(b",")[1::2]), 0
+        except ValueError:
+            pass
+    salaries, malformed = [], 0
+    for raw in body.split(b"\n"):
+        values, bad = parse_line(raw)
+        salaries.extend(values)
+        malformed += bad
+    return to_floats(salaries), malformed
 
-                _, salary_str = line.split(',')
-                salary = float(salary_str)
-                counter += 1
-                sums += salary
 
-            # Якщо файл порожній — повертаємо нулі
-            if counter == 0:
-                return (0, 0)
+def salary_stats(path: str, percentiles: Sequence[float] = PERCENTILES) -> SalaryStats:
+    """
+    Сума, середнє, кількість і процентилі зарплат у файлі "ім'я,зарплата"
+    (порожній percentiles — без скетча квантилів, швидше).
+    Файл читається блоками по CHUNK_BYTES; числа блоку перетворюються
+    одним викликом (numpy.fromiter або array) і сумуються векторно.
+    Некоректні рядки не зупиняють підрахунок, а рахуються в malformed.
+    """
+    total, count, malformed = 0.0, 0, 0
+    sketch = QuantileSketch() if percentiles else None
+    with open(path, 'rb') as file:
+        for block in read_blocks(file):
+            values, bad = parse_block(block)
+            malformed += bad
+            count += len(values)
+            total += float(values.sum()) if np is not None else sum(values)
+            if sketch is not None:
+                # відсортований numpy блок скетч зливає за лінійний час
+                sketch.update_many(np.sort(values).tolist() if np is not None else values)
 
-            return sums, sums/counter
+    average = total / count if count else 0
+    quantiles = sketch.quantiles(percentiles) if sketch is not None else []
+    return SalaryStats(total, average, count, malformed, dict(zip(percentiles, quantiles)))
 
+
+def load_stats(path: str, percentiles: Sequence[float] = PERCENTILES) -> Optional[SalaryStats]:
+    # salary_stats з повідомленнями для користувача замість винятків
+    try:
+        stats = salary_stats(path, percentiles)
     except FileNotFoundError:
         print(f"Помилка: файл '{path}' не знайдено.")
-    except ValueError:
-        print("Помилка: некоректні дані у файлі (не можна перетворити зарплату у число).")
+        return None
+
+    if stats.malformed:
+        print(f"Попередження: пропущено некоректних рядків: {stats.malformed}.")
+    return stats
+
+
+def total_salary(path: str) -> Optional[Tuple[float, float]]:
+    stats = load_stats(path, percentiles=())
+    if stats is None:
+        return None
+
+    # Якщо файл порожній — повертаємо нулі
+    if stats.count == 0:
+        return (0, 0)
+
+    return stats.total, stats.average
 
 def main():
     filename = "salary_file.txt"
     full_name = pathlib.Path(__file__).parent / filename
 
-    total, average = total_salary(full_name)
+    stats = load_stats(full_name)
+    if stats is None:
+        return
 
-    print(f"Загальна сума заробітної плати: {total}, Середня заробітна плата: {average}")
+    print(f"Загальна сума заробітної плати: {stats.total}, Середня заробітна плата: {stats.average}")
+    print(f"Медіана (наближено): {stats.percentiles[0.5]}")
+    print("Процентилі: " + ", ".join(f"p{q * 100:g}={value}" for q, value in stats.percentiles.items()))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,44 @@
+"""
+Виграш від memoize для validate_phone на даних з великою кількістю повторів.
+
+    python bench_memoize.py [--records 1000000] [--unique 5000]
+
+records номерів вибираються з unique різних значень; функція проганяється
+без кешу (__wrapped__) і з кешем (холодний старт).
+"""
+
+from __future__ import annotations
+import argparse
+import random
+import time
+
+from hw04 import validate_phone
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="validate_phone з memoize і без")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Кількість номерів")
+    parser.add_argument("--unique", type=int, default=5000, help="Кількість різних номерів")
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    pool = [f"+38 (0{rnd.randrange(50, 100)}) {rnd.randrange(100, 1000)}-{rnd.randrange(1000, 10000)}"
+            for _ in range(args.unique)]
+    inputs = [rnd.choice(pool) for _ in range(args.records)]
+
+    start = time.perf_counter()
+    expected = [validate_phone.__wrapped__(x) for x in inputs]
+    uncached = time.perf_counter() - start
+    validate_phone.cache_clear()
+    start = time.perf_counter()
+    got = [validate_phone(x) for x in inputs]
+    cached = time.perf_counter() - start
+    assert got == expected
+
+    info = validate_phone.cache_info()
+    print(f"без кешу: {uncached:.3f} с, з кешем: {cached:.3f} с (x{uncached / cached:.1f})")
+    print(f"влучання: {info.hits}, промахи: {info.misses}, витіснення: {info.evictions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Контрольна точка інкрементального аналізу лог-файлу.
+
+Зберігає, докуди файл уже розібрано (зсув після останнього повного рядка),
+скільки рядків пройдено та накопичені лічильники за рівнями. Наступний запуск
+розбирає лише дописані відтоді байти. Ротацію (інший inode), обрізання
+(файл коротший за зсув) і перезапис на місці (змінилися перші байти) виявляє
+same_file — тоді аналіз починається з нуля.
+"""
+
+from __future__ import annotations
+import json
+import os
+from typing import Dict, Optional
+
+CHECKPOINT_VERSION = 1
+# Скільки перших байтів файлу запам'ятовувати як його «відбиток»
+HEAD_BYTES = 64
+
+
+def fingerprint(data, end: int) -> str:
+    """
+    Відбиток уже обробленої частини файлу data[:end] (bytes чи mmap): перші
+    та останні HEAD_BYTES байтів, hex. Індекси поруч із логом (.idx, .tok)
+    звіряють його, щоб помітити перезапис на місці з тим самим inode.
+    """
+    return (data[:min(HEAD_BYTES, end)] + data[max(0, end - HEAD_BYTES):end]).hex()
+
+
+class Checkpoint:
+    def __init__(self, inode: int, levels, head: bytes = b"") -> None:
+        self.inode = inode
+        self.head = head
+        self.offset = 0
+        self.lines = 0
+        self.counts: Dict[str, int] = dict.fromkeys(levels, 0)
+
+    def same_file(self, inode: int, size: int, head: bytes) -> bool:
+        return inode == self.inode and size >= self.offset and head.startswith(self.head)
+
+    @classmethod
+    def load(cls, path: str, levels) -> Optional["Checkpoint"]:
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                raw = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if raw.get("version") != CHECKPOINT_VERSION:
+            return None
+        state = cls(raw["inode"], levels, bytes.fromhex(raw["head"]))
+        state.offset = raw["offset"]
+        state.lines = raw["lines"]
+        for lvl in levels:
+            state.counts[lvl] = raw["counts"].get(lvl, 0)
+        return state
+
+    def save(self, path: str) -> None:
+        # Тимчасовий файл + os.replace: перерваний запис не псує попередню точку
+        raw = {
+            "version": CHECKPOINT_VERSION,
+            "inode": self.inode,
+            "head": self.head.hex(),
+            "offset": self.offset,
+            "lines": self.lines,
+            "counts": self.counts,
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(raw, fh)
+        os.replace(tmp, path)
@@ -0,0 +1,148 @@
+"""
+Прозоре читання стиснених логів: .gz, .bz2, .xz.
+
+Тип визначається за «магічними» байтами на початку файлу, а для
+нерегулярних файлів (канали) — за розширенням. Розпакування йде потоково,
+без тимчасових файлів на диску. read_chunks читає у фоновому потоці:
+zlib/bz2/lzma відпускають GIL, тож розпакування йде паралельно з розбором.
+Для gzip із кількох членів (member) iter_gzip_members розпаковує члени,
+що починаються в заданому діапазоні байтів, — на цьому побудовано
+паралельне розпакування у hw03.py.
+"""
+
+from __future__ import annotations
+import bz2
+import gzip
+import lzma
+import mmap
+import os
+import queue
+import threading
+import zlib
+from typing import IO, Callable, Iterator, Optional
+
+MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+# Помилки пошкодженого архіву, які показуються як помилка читання файлу
+DECOMPRESS_ERRORS = (OSError, EOFError, lzma.LZMAError, zlib.error)
+
+READ_CHUNK_BYTES = 8 << 20
+READ_AHEAD_CHUNKS = 4
+# Стиснені байти, що подаються zlib за раз, і скільки розпакувати для перевірки кандидата
+GZIP_FEED_BYTES = 1 << 20
+GZIP_PROBE_BYTES = 64 << 10
+GZIP_MEMBER_MAGIC = b"\x1f\x8b\x08"
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    # None — звичайний текст
+    if os.path.isfile(file_path):
+        try:
+            with open(file_path, "rb") as fh:
+                magic = fh.read(6)
+        except OSError:
+            magic = b""  # помилку відкриття покаже основний код
+        for signature, kind in MAGIC:
+            if magic.startswith(signature):
+                return kind
+        return None
+    return SUFFIXES.get(os.path.splitext(file_path)[1].lower())
+
+
+def open_text(file_path: str, kind: Optional[str]) -> IO[str]:
+    # Текстовий режим з тими самими правилами рядків, що й звичайний open
+    if kind is None:
+        return open(file_path, "r", encoding="utf-8")
+    return OPENERS[kind](file_path, "rt", encoding="utf-8")
+
+
+def open_binary(file_path: str, kind: Optional[str]) -> IO[bytes]:
+    if kind is None:
+        return open(file_path, "rb")
+    return OPENERS[kind](file_path, "rb")
+
+
+def read_chunks(fh: IO[bytes], size: int = READ_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Шматки файлу, прочитані наперед у фоновому потоці (черга на
+    READ_AHEAD_CHUNKS шматків обмежує пам'ять). Помилки читання
+    прокидаються у споживача.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=READ_AHEAD_CHUNKS)
+
+    def produce() -> None:
+        try:
+            while True:
+                data = fh.read(size)
+                chunks.put(data)
+                if not data:
+                    return
+        except BaseException as e:  # передаємо споживачу, там і обробимо
+            chunks.put(e)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = chunks.get()
+        if isinstance(item, BaseException):
+            raise item
+        if not item:
+            return
+        yield item
+
+
+def _is_member_start(buf: mmap.mmap, pos: int) -> bool:
+    # Кандидат справжній, якщо з нього без помилок розпаковується початок члена
+    try:
+        zlib.decompressobj(31).decompress(buf[pos:pos + GZIP_PROBE_BYTES], GZIP_PROBE_BYTES)
+    except zlib.error:
+        return False
+    return True
+
+
+def find_gzip_member(buf: mmap.mmap, start: int, end: int) -> Optional[int]:
+    """
+    Зсув першого члена gzip, що починається в [start, end); None — такого немає.
+    Сигнатура може трапитися і всередині стиснених даних, тож кожен кандидат
+    перевіряється пробним розпакуванням; остаточно межі звіряє викликач.
+    """
+    if start == 0:
+        return 0
+    pos = start
+    while pos < end:
+        pos = buf.find(GZIP_MEMBER_MAGIC, pos, end)
+        if pos == -1:
+            return None
+        if _is_member_start(buf, pos):
+            return pos
+        pos += 1
+    return None
+
+
+def iter_gzip_members(buf: mmap.mmap, pos: int, end: int, on_stop: Callable[[int], None]) -> Iterator[bytes]:
+    """
+    Розпаковує члени gzip, починаючи з pos, доки черговий член починається
+    до end (останній член дочитується до кінця, навіть якщо виходить за end).
+    Контрольна сума кожного члена перевіряється zlib. Після завершення
+    on_stop отримує зсув кінця останнього члена.
+    """
+    size = len(buf)
+    while pos < end and pos < size:
+        d = zlib.decompressobj(31)
+        while not d.eof:
+            if pos >= size:
+                raise EOFError("Стиснений файл обірвано посередині члена gzip")
+            feed = buf[pos:pos + GZIP_FEED_BYTES]
+            pos += len(feed)
+            data = d.decompress(feed)
+            if data:
+                yield data
+        data = d.flush()
+        if data:
+            yield data
+        pos -= len(d.unused_data)
+    on_stop(pos)
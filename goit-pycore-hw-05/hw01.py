@@ -1,15 +1,36 @@
-def caching_fibonacci():
+import argparse
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+
+def fib_pair(n: int) -> Tuple[int, int]:
+    """
+    Пара (F(n), F(n+1)) методом швидкого подвоєння за O(log n) кроків:
+    F(2k) = F(k) * (2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2.
+    Біти n обходяться від старшого до молодшого — без рекурсії.
+    """
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == "1":
+            a, b = b, a + b
+    return a, b
+
+
+def caching_fibonacci(maxsize: Optional[int] = None):
     """
     Функція створює замикання для обчислення чисел Фібоначчі з кешуванням результатів.
     Повертає внутрішню функцію fibonacci(n), яка використовує кеш для збереження проміжних результатів.
+    Відсутнє в кеші значення рахується швидким подвоєнням (fib_pair), тож
+    рекурсії немає і fib(5000) працює з холодного кешу. У кеш потрапляють лише
+    запитані n; maxsize обмежує його (LRU), 0 — без кешу, None — без обмеження.
     """
 
-    # створюємо порожній кеш у вигляді словника
-    cache = {}
+    # кеш: n -> F(n); порядок ключів — від найдавніше до найнедавніше використаних
+    cache: "OrderedDict[int, int]" = OrderedDict()
 
-    def fibonacci(n):        
-        #Обчислює n-те число Фібоначчі рекурсивно з кешуванням результатів.
-        
+    def fibonacci(n: int) -> int:
         # базові випадки
         if n <= 0:
             return 0
@@ -18,20 +39,107 @@ def caching_fibonacci():
 
         # якщо значення вже є у кеші — повертаємо його
         if n in cache:
+            cache.move_to_end(n)
             return cache[n]
 
-        # якщо нема — обчислюємо рекурсивно і зберігаємо у кеш
-        cache[n] = fibonacci(n - 1) + fibonacci(n - 2)
+        value = fib_pair(n)[0]
+        if maxsize != 0:
+            cache[n] = value
+            if maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)
+        return value
+
+    # повертаємо саму функцію fibonacci (замикання)
+    return fibonacci
+
+
+def fibonacci_range(start: int, stop: int) -> Iterator[int]:
+    # F(n) для n у range(start, stop): одне подвоєння на початку, далі додавання
+    for n in range(start, min(stop, 1)):
+        yield 0
+    a, b = fib_pair(max(start, 1))
+    for _ in range(max(start, 1), stop):
+        yield a
+        a, b = b, a + b
+
+
+def fibonacci_many(ns: Iterable[int]) -> Dict[int, int]:
+    """
+    {n: F(n)} для багатьох n. Значення рахуються за зростанням n, і кожне
+    наступне виводиться з попередньої пари зсувом на відстань g:
+    F(a+g) = F(a+1)F(g) + F(a)F(g-1), F(a+g+1) = F(a+1)F(g+1) + F(a)F(g).
+    Для близьких n це множення великого числа на мале замість повного подвоєння.
+    """
+    result: Dict[int, int] = {}
+    prev = 0
+    a, b = 0, 1  # (F(prev), F(prev+1))
+    for n in sorted(set(ns)):
+        if n <= 0:
+            result[n] = 0
+            continue
+        gap = n - prev
+        if gap < prev:
+            g0, g1 = fib_pair(gap - 1)  # (F(g-1), F(g))
+            a, b = b * g1 + a * g0, b * (g0 + g1) + a * g1
+        else:
+            a, b = fib_pair(n)
+        result[n] = a
+        prev = n
+    return result
+
+
+def _recursive_caching_fibonacci():
+    # Попередня реалізація: рекурсія на кожне n і необмежений кеш (лише для порівняння в benchmark)
+    cache = {}
 
+    def fibonacci(n):
+        if n <= 0:
+            return 0
+        elif n == 1:
+            return 1
+        if n in cache:
+            return cache[n]
+        cache[n] = fibonacci(n - 1) + fibonacci(n - 2)
         return cache[n]
 
-    # повертаємо саму функцію fibonacci (замикання)
     return fibonacci
 
 
-# Приклад використання:
-fib = caching_fibonacci()
-print(fib(10))  # Виведе 55 - це 10 елемент у ряді Фібо
-print(fib(15))  # Виведе 610 - це 15 елемент у ряді Фібо
-print(fib(3))   # Виведе 2 - це 3 елемент у ряді Фібо
+def benchmark() -> None:
+    # Холодний кеш на кожен замір; рекурсивна версія — лише в межах ліміту рекурсії
+    def measure(func) -> float:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    print(f"{'Задача':<32} | {'рекурсія':<10} | {'подвоєння':<10}")
+    print("-" * 33 + "|" + "-" * 12 + "|" + "-" * 11)
+    for n in (100, 500, 900):
+        old = measure(lambda: _recursive_caching_fibonacci()(n))
+        new = measure(lambda: caching_fibonacci()(n))
+        print(f"{f'fib({n})':<32} | {old:<10.6f} | {new:<10.6f}")
+    old = measure(lambda: [f(i) for f in [_recursive_caching_fibonacci()] for i in range(20000)])
+    new = measure(lambda: list(fibonacci_range(0, 20000)))
+    print(f"{'F(0..19999) ряд':<32} | {old:<10.6f} | {new:<10.6f}")
+    ns = range(10 ** 5, 10 ** 5 + 200 * 97, 97)
+    old = measure(lambda: [caching_fibonacci(0)(n) for n in ns])
+    new = measure(lambda: fibonacci_many(ns))
+    print(f"{'200 n біля 10^5: поодинці/пакет':<32} | {old:<10.6f} | {new:<10.6f}")
+    for n in (10 ** 4, 10 ** 6):
+        new = measure(lambda: caching_fibonacci()(n))
+        print(f"{f'fib({n})':<32} | {'-':<10} | {new:<10.6f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Числа Фібоначчі з кешуванням")
+    parser.add_argument("--benchmark", action="store_true", help="Порівняти з рекурсивною версією")
+    args = parser.parse_args()
 
+    if args.benchmark:
+        benchmark()
+    else:
+        # Приклад використання:
+        fib = caching_fibonacci()
+        print(fib(10))  # Виведе 55 - це 10 елемент у ряді Фібо
+        print(fib(15))  # Виведе 610 - це 15 елемент у ряді Фібо
+        print(fib(3))   # Виведе 2 - це 3 елемент у ряді Фібо
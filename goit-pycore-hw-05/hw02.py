@@ -1,11 +1,26 @@
+import codecs
+import mmap
+import os
 import re
-from decimal import Decimal
-from typing import Callable, Generator
+from concurrent.futures import ProcessPoolExecutor
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, ROUND_FLOOR, Context, Decimal, Inexact, getcontext
+from typing import IO, Callable, Generator, Iterable, Iterator, List, Optional, Tuple, Union
 
 
 # Патерн: число зі знаком/без, ціла або з десятковою крапкою.
 # Обмеження (?<!\S) / (?!\S) гарантують, що число відокремлене пробілами або межами рядка.
 NUMBER_PATTERN = re.compile(r'(?<!\S)[+-]?(?:\d+(?:\.\d+)?|\.\d+)(?!\S)')
+# Усі початки чисел NUMBER_PATTERN: слово, що не збігається повністю, вже не може стати числом
+NUMBER_PREFIX = re.compile(r'[+-]?\d*(?:\.\d*)?')
+CHUNK_SIZE = 1 << 20
+# Пробільні байти ASCII: в UTF-8 не трапляються всередині багатобайтових символів,
+# тож по них файл ріжеться на частини для паралельного підсумовування
+SPACE_BYTE = re.compile(rb'[\t-\r\x1c- ]')
+SPACE_CHAR = re.compile(r'\s')
+# Менші входи паралельно не ділимо: запуск пулу дорожчий за саму роботу
+PARALLEL_MIN_CHARS = 4 << 20
+# Точний контекст для «незвичних» чисел (більше двох знаків після крапки)
+EXACT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN, traps=[Inexact])
 
 
 def generator_numbers(text: str) -> Generator[Decimal, None, None]:
@@ -17,9 +32,56 @@ def generator_numbers(text: str) -> Generator[Decimal, None, None]:
         # Decimal гарантує точність для грошових сум
         yield Decimal(m.group())
 
-def sum_profit(text: str, func: Callable[[str], Generator[Decimal, None, None]]) -> Decimal:
+
+def read_chunks(source: Union[IO[str], Iterable[str]], chunk_size: int) -> Iterable[str]:
+    # Файл читаємо шматками фіксованого розміру, а не рядками: рядок може бути як завгодно довгим
+    if hasattr(source, "read"):
+        return iter(lambda: source.read(chunk_size), "")
+    return source
+
+
+def generator_numbers_stream(
+    source: Union[IO[str], Iterable[str]], chunk_size: int = CHUNK_SIZE
+) -> Generator[Decimal, None, None]:
+    """
+    Те саме, що generator_numbers, але для файлу або ітерованих шматків
+    тексту: весь текст у пам'ять не завантажується.
+    Шматок обробляється до останнього пробільного символу, а незавершене
+    слово після нього переноситься в наступний шматок — так межі шматків
+    не розрізають чисел і не склеюють сусідніх слів. Перенесене слово,
+    що вже не може бути числом, замінюється одним символом "x", тож пам'ять
+    обмежена розміром шматка (і довжиною найдовшого числа).
+    """
+    for piece in complete_pieces(read_chunks(source, chunk_size)):
+        for m in NUMBER_PATTERN.finditer(piece):
+            yield Decimal(m.group())
+
+
+def complete_pieces(chunks: Iterable[str]) -> Iterator[str]:
+    # Шматки тексту, обрізані по останньому пробілу; хвіст переноситься далі
+    tail = ""
+    for chunk in chunks:
+        data = tail + chunk
+        cut = len(data)
+        while cut and not data[cut - 1].isspace():
+            cut -= 1
+        # до cut кожне слово вже завершене пробілом, тож (?!\S) перевіряється правильно
+        if cut:
+            yield data[:cut]
+        tail = data[cut:]
+        if not NUMBER_PREFIX.fullmatch(tail):
+            tail = "x"
+    # початок tail іде одразу після пробілу, тож (?<!\S) на межі рядка теж правильне
+    if tail:
+        yield tail
+
+
+def sum_profit(
+    text: Union[str, IO[str], Iterable[str]], func: Callable[..., Generator[Decimal, None, None]]
+) -> Decimal:
     """
     Повертає суму всіх чисел, знайдених генератором `func`.
+    Для великого файлу: sum_profit(open(path, encoding="utf-8"), generator_numbers_stream).
     Повертаємо Decimal, щоб уникнути похибок з плаваючою крапкою.
     """
     total = Decimal(0)
@@ -27,11 +89,195 @@ def sum_profit(text: str, func: Callable[[str], Generator[Decimal, None, None]])
         total += value
     return total
 
-text = (
-    "Загальний дохід працівника складається з декількох частин: "
-    "1000.01 як основний дохід, доповнений додатковими надходженнями "
-    "27.45 і 324.00 доларів."
-)
 
-total_income = sum_profit(text, generator_numbers)
-print(f"Загальний дохід: {total_income}")  # Очікувано: 1351.46
+class ExactSum:
+    """
+    Точна сума чисел у цілих: числа з 0–2 знаками після крапки — у центах
+    (int Python, без Decimal), інші — у Decimal з необмеженою точністю.
+    Окремо рахується сума модулів: вона обмежує кожну проміжну суму
+    послідовного циклу, тож показує, чи міг той цикл округлювати.
+    Частини, пораховані в різних процесах, зливаються без втрат.
+    """
+
+    def __init__(self) -> None:
+        self.cents = 0
+        self.abs_cents = 0
+        self.rest = Decimal(0)
+        self.abs_rest = Decimal(0)
+        # Найбільша кількість знаків після крапки — від неї залежить показник результату
+        self.places = 0
+
+    def add_text(self, text: str) -> None:
+        # Числа групуються за кількістю знаків після крапки, кожна група
+        # сумується через sum(map(int, ...)) — без циклу Python на кожне число
+        tokens = NUMBER_PATTERN.findall(text)
+        dotted = [t for t in tokens if "." in t]
+        self._add_ints([t for t in tokens if "." not in t], 100)
+        if not dotted:
+            return
+        one = [t for t in dotted if t[-2] == "."]
+        two = [t for t in dotted if t[-3:-2] == "."]
+        if one:
+            self._add_ints(" ".join(one).replace(".", "").split(), 10)
+            self.places = max(self.places, 1)
+        if two:
+            self._add_ints(" ".join(two).replace(".", "").split(), 1)
+            self.places = max(self.places, 2)
+        if len(one) + len(two) < len(dotted):
+            for token in dotted:
+                digits = len(token) - token.index(".") - 1
+                if digits > 2:
+                    value = Decimal(token)
+                    self.rest = EXACT.add(self.rest, value)
+                    self.abs_rest = EXACT.add(self.abs_rest, value.copy_abs())
+                    self.places = max(self.places, digits)
+
+    def _add_ints(self, tokens: List[str], scale: int) -> None:
+        # Сума модулів = сума - 2 * (сума від'ємних)
+        total = sum(map(int, tokens))
+        negative = sum(map(int, [t for t in tokens if t[0] == "-"]))
+        self.cents += total * scale
+        self.abs_cents += (total - 2 * negative) * scale
+
+    def merge(self, other: "ExactSum") -> None:
+        self.cents += other.cents
+        self.abs_cents += other.abs_cents
+        self.rest = EXACT.add(self.rest, other.rest)
+        self.abs_rest = EXACT.add(self.abs_rest, other.abs_rest)
+        self.places = max(self.places, other.places)
+
+    def _scaled(self, cents: int, rest: Decimal) -> int:
+        # Ціле значення в одиницях 10**-places (ділиться без остачі)
+        scale = max(self.places, 2)
+        value = cents * 10 ** (scale - 2) + int(EXACT.scaleb(rest, scale))
+        return value // 10 ** (scale - self.places)
+
+    def total(self) -> Optional[Decimal]:
+        """
+        Сума, побітово рівна результату sum_profit у поточному контексті
+        Decimal, або None, якщо той цикл міг округлювати (сума модулів
+        довша за точність контексту) чи дати -0 (ROUND_FLOOR).
+        """
+        context = getcontext()
+        value = self._scaled(self.cents, self.rest)
+        bound = self._scaled(self.abs_cents, self.abs_rest)
+        # чи довший bound за prec цифр; 10**prec будуємо, лише коли bound за розміром близький до нього
+        if bound.bit_length() * 0.302 + 1 > context.prec and bound >= 10 ** context.prec:
+            return None
+        if value == 0 and context.rounding == ROUND_FLOOR:
+            return None
+        return EXACT.scaleb(Decimal(value), -self.places)
+
+
+def _sum_text(text: str) -> ExactSum:
+    part = ExactSum()
+    part.add_text(text)
+    return part
+
+
+def _sum_range(file_path: str, start: int, end: int) -> ExactSum:
+    # Частина файлу [start, end): читається шматками, пам'ять обмежена CHUNK_SIZE
+    part = ExactSum()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(file_path, "rb") as fh:
+        fh.seek(start)
+
+        def chunks() -> Iterator[str]:
+            left = end - start
+            while left > 0:
+                data = fh.read(min(CHUNK_SIZE, left))
+                if not data:
+                    break
+                left -= len(data)
+                yield decoder.decode(data)
+            yield decoder.decode(b"", final=True)
+
+        for piece in complete_pieces(chunks()):
+            part.add_text(piece)
+    return part
+
+
+def split_text(text: str, parts: int) -> List[str]:
+    # Частини, кожна з яких (крім першої) починається одразу після пробільного символу
+    pieces, start = [], 0
+    for i in range(1, parts):
+        m = SPACE_CHAR.search(text, max(start, len(text) * i // parts))
+        if m is None:
+            break
+        pieces.append(text[start:m.end()])
+        start = m.end()
+    pieces.append(text[start:])
+    return pieces
+
+
+def split_file(file_path: str, parts: int) -> List[Tuple[int, int]]:
+    # Межі байтових діапазонів — одразу після пробільного байта
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return [(0, 0)]
+    bounds = [0]
+    with open(file_path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        for i in range(1, parts):
+            m = SPACE_BYTE.search(buf, max(bounds[-1], size * i // parts))
+            if m is None:
+                break
+            bounds.append(m.end())
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def sum_profit_parallel(text: str, workers: Optional[int] = None) -> Decimal:
+    """
+    Те саме, що sum_profit(text, generator_numbers), але швидше: текст
+    ділиться по пробілах на частини, кожна сумується в окремому процесі
+    цілими числами, частини зливаються точно. Якщо послідовний цикл
+    округлював би, рахуємо послідовно — результат завжди побітово той самий.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(text) < PARALLEL_MIN_CHARS:
+        part = _sum_text(text)
+    else:
+        part = ExactSum()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for piece in pool.map(_sum_text, split_text(text, workers)):
+                part.merge(piece)
+    total = part.total()
+    return total if total is not None else sum_profit(text, generator_numbers)
+
+
+def sum_profit_file(file_path: str, workers: Optional[int] = None) -> Decimal:
+    """
+    Сума чисел у файлі (UTF-8) без завантаження його в пам'ять: кожен процес
+    читає свій діапазон байтів. Дорівнює
+    sum_profit(open(file_path, encoding="utf-8"), generator_numbers_stream).
+    """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(file_path)
+    # байтів у файлі не менше, ніж символів, тож поріг той самий, що в sum_profit_parallel
+    if workers == 1 or size < PARALLEL_MIN_CHARS:
+        ranges = [(0, size)]
+    else:
+        ranges = split_file(file_path, workers)
+    part = ExactSum()
+    if len(ranges) == 1:
+        part.merge(_sum_range(file_path, *ranges[0]))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for piece in pool.map(_sum_range, [file_path] * len(ranges), *zip(*ranges)):
+                part.merge(piece)
+    total = part.total()
+    if total is None:
+        with open(file_path, encoding="utf-8") as fh:
+            return sum_profit(fh, generator_numbers_stream)
+    return total
+
+if __name__ == "__main__":
+    # Під захистом __main__: процеси пулу на spawn-платформах імпортують модуль заново
+    text = (
+        "Загальний дохід працівника складається з декількох частин: "
+        "1000.01 як основний дохід, доповнений додатковими надходженнями "
+        "27.45 і 324.00 доларів."
+    )
+
+    total_income = sum_profit(text, generator_numbers)
+    print(f"Загальний дохід: {total_income}")  # Очікувано: 1351.46
@@ -3,20 +3,108 @@
 
 """
 Лог-аналізатор:
-- Читає файл логів (аргумент #1)
-- Опційно приймає рівень логування для фільтрації (аргумент #2): info|error|debug|warning
+- Читає файл логів (аргумент #1); можна кілька шляхів або glob-шаблонів
+- Опційно приймає рівень логування для фільтрації (останній аргумент): info|error|debug|warning
 - Друкує таблицю з кількістю записів за рівнями
 - Якщо вказано рівень — також друкує деталі записів цього рівня
+Файл обробляється потоково за один прохід: пам'ять не залежить від розміру логу.
+З --workers N файл ділиться на діапазони байтів, що розбираються у пулі процесів.
+Звичайний файл мапиться (mmap) і сканується як байти; рядки нестандартного
+вигляду розбираються звичайним parse_log_line.
+--since/--until обмежують аналіз проміжком часу (див. time_index.py).
+--checkpoint/--follow розбирають лише дописане з минулого разу (див. checkpoint.py).
+Стиснені логи (.gz, .bz2, .xz) розпаковуються на льоту (див. compressed.py).
+Кілька файлів розбираються паралельно; таблиця спільна, деталі зливаються
+за часом (k-way merge відсортованих по файлах деталей), --per-file додає підсумки файлів.
+--grep шукає слова в повідомленнях через інвертований індекс (див. token_index.py).
+--histogram/--top додають гістограму за часом і найчастіші помилки (див. log_stats.py).
+--format json|ndjson|csv замість таблиці пише записи й підсумок для інших програм (див. sinks.py).
 """
 
 from __future__ import annotations
 import argparse
-from typing import List, Dict, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager, suppress
+from itertools import chain
+from typing import IO, Any, Callable, List, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
 from collections import Counter
+import glob
+import heapq
+import io
+import mmap
+import os
+import re
+import shutil
 import sys
+import tempfile
+import time
+
+from checkpoint import HEAD_BYTES, Checkpoint
+from log_stats import BUCKET_WIDTHS, LogStats
+from sinks import FORMATS, SINKS, Sink, open_output
+from compressed import (
+    DECOMPRESS_ERRORS, detect_compression, find_gzip_member, iter_gzip_members,
+    open_binary, open_text, read_chunks,
+)
+from time_index import TimeIndex, normalize_bound
+from token_index import TokenIndex, matches, parse_query
 
 # Допустимі рівні — для валідації та нормалізації
 LEVELS = ("INFO", "DEBUG", "ERROR", "WARNING")
+# До цього розміру деталі тримаються в пам'яті, далі — у тимчасовому файлі
+SPOOL_MAX_BYTES = 1 << 20
+# Діапазонів на процес: дрібніші шматки вирівнюють навантаження між процесами
+RANGES_PER_WORKER = 4
+MIN_RANGE_BYTES = 1 << 20
+# Розмір шматка для швидкого сканування байтів (вирівнюється на кінець рядка)
+SCAN_CHUNK_BYTES = 8 << 20
+# Блоки з нестандартними рядками діляться до цього розміру перед повільним розбором
+SLOW_BLOCK_BYTES = 64 << 10
+# Період опитування файлу в режимі --follow, секунд
+FOLLOW_INTERVAL = 1.0
+
+# Швидкий шлях: фіксована розкладка "YYYY-MM-DD HH:MM:SS LEVEL message".
+# Перший байт повідомлення — не пробільний символ ні в ASCII, ні в Unicode
+# (провідні байти \xc2, \xe1-\xe3 можуть почати Unicode-пробіл — такі рядки
+# йдуть повільним шляхом), тож після strip повідомлення точно не порожнє.
+# Шаблони починаються з літерала \n замість ^ з re.M: так рушій перескакує
+# між рядками швидким пошуком символу, тому до шматка дописується \n спереду.
+_FAST_DAY = rb"[0-9]{4}-[0-9][0-9]-[0-9][0-9]"
+_FAST_HOUR = rb" [0-9][0-9]"
+_FAST_MINUTE = rb":[0-9][0-9]"
+_FAST_SECOND = rb":[0-9][0-9]"
+_FAST_STAMP = _FAST_DAY + _FAST_HOUR + _FAST_MINUTE + _FAST_SECOND
+_FAST_MESSAGE = rb" +(?=[!-~\xc3-\xe0\xe4-\xf4])"
+# Рівень розпізнається без урахування регістру, а захоплюється лише його перша
+# літера: однобайтові bytes у CPython кешовані, тож findall не створює об'єктів
+FAST_LINE_RE = re.compile(
+    rb"\n" + _FAST_STAMP + rb" (?=([IDEWidew]))(?i:INFO|DEBUG|ERROR|WARNING)" + _FAST_MESSAGE
+)
+FAST_LEVEL_BY_INITIAL = {
+    initial: lvl for lvl in LEVELS for initial in (lvl[0].encode(), lvl[0].lower().encode())
+}
+FAST_BLANK_RE = re.compile(rb"\n[ \t\r\f\v\x1c-\x1f]*(?=\n)")
+FAST_LONE_CR_RE = re.compile(rb"\r(?!\n)")  # текстовий режим вважає його кінцем рядка
+FAST_DETAIL_RE = {
+    lvl: re.compile(rb"\n(" + _FAST_STAMP + rb") (?i:" + lvl.encode() + rb")" + _FAST_MESSAGE + rb"([^\n]*)")
+    for lvl in LEVELS
+}
+# Для --histogram: (ключ кошика — префікс позначки часу, перша літера рівня)
+FAST_BUCKET_RE = {
+    bucket: re.compile(
+        rb"\n(" + head + rb")" + rest + rb" (?=([IDEWidew]))(?i:INFO|DEBUG|ERROR|WARNING)" + _FAST_MESSAGE
+    )
+    for bucket, head, rest in (
+        ("day", _FAST_DAY, _FAST_HOUR + _FAST_MINUTE + _FAST_SECOND),
+        ("hour", _FAST_DAY + _FAST_HOUR, _FAST_MINUTE + _FAST_SECOND),
+        ("minute", _FAST_DAY + _FAST_HOUR + _FAST_MINUTE, _FAST_SECOND),
+    )
+}
+# Для --top: лише повідомлення записів рівня
+FAST_MESSAGE_RE = {
+    lvl: re.compile(rb"\n" + _FAST_STAMP + rb" (?i:" + lvl.encode() + rb")" + _FAST_MESSAGE + rb"([^\n]*)")
+    for lvl in LEVELS
+}
 
 
 def parse_log_line(line: str) -> dict:
@@ -42,31 +130,37 @@ def parse_log_line(line: str) -> dict:
     return {"date": date, "time": timestr, "level": lvl, "message": message}
 
 
-def load_logs(file_path: str) -> List[dict]:
+def iter_logs(file_path: str) -> Iterator[dict]:
     """
-    Зчитує файл логів, парсить кожен рядок через parse_log_line.
+    Ліниво зчитує файл логів і віддає розібрані записи по одному.
+    Стиснений файл (.gz, .bz2, .xz) розпаковується потоково.
     Пропускає порожні рядки, некоректні рядки логу логічно ігнорує (з попередженням у stderr).
     """
-    logs: List[dict] = []
     try:
-        with open(file_path, "r", encoding="utf-8") as fh:
+        with open_text(file_path, detect_compression(file_path)) as fh:
             for i, raw in enumerate(fh, start=1):
                 line = raw.strip()
                 if not line:
                     continue
                 try:
                     entry = parse_log_line(line)
-                    logs.append(entry)
                 except ValueError as e:
                     print(f"[WARN] Рядок {i} пропущено: {e}", file=sys.stderr)
+                    continue
+                yield entry
     except FileNotFoundError:
         print(f"[ERR] Файл не знайдено: {file_path}", file=sys.stderr)
         sys.exit(1)
-    except OSError as e:
+    except DECOMPRESS_ERRORS as e:
         print(f"[ERR] Помилка читання файлу: {e}", file=sys.stderr)
         sys.exit(1)
 
-    return logs
+
+def load_logs(file_path: str) -> List[dict]:
+    """
+    Зчитує файл логів у список записів (див. iter_logs).
+    """
+    return list(iter_logs(file_path))
 
 
 def filter_logs_by_level(logs: List[dict], level: str) -> List[dict]:
@@ -89,6 +183,936 @@ def count_logs_by_level(logs: Iterable[dict]) -> Dict[str, int]:
     return {lvl: c.get(lvl, 0) for lvl in LEVELS}
 
 
+def format_log_entry(rec: dict) -> str:
+    return f"{rec['date']} {rec['time']} - {rec['message']}"
+
+
+def analyze_logs(
+    logs: Iterable[dict], level: Optional[str], details: IO[str], stats: Optional[LogStats] = None
+) -> Tuple[Dict[str, int], int]:
+    """
+    Один прохід по записах: рахує рівні й одразу пише у details
+    відформатовані записи рівня level (None — без деталей).
+    Повертає (лічильники за рівнями, кількість виведених записів).
+    """
+    counts = dict.fromkeys(LEVELS, 0)
+    matched = 0
+    for rec in logs:
+        lvl = rec["level"]
+        counts[lvl] += 1
+        if stats is not None:
+            stats.add(f"{rec['date']} {rec['time']}", lvl, rec["message"])
+        if lvl == level:
+            details.write(format_log_entry(rec) + "\n")
+            matched += 1
+    return counts, matched
+
+
+def split_ranges(start: int, end: int, parts: int) -> List[Tuple[int, int]]:
+    # Рівні піддіапазони [start, end); межі рядків вирівнює align_range
+    size = end - start
+    if size <= 0:
+        return []
+    parts = max(1, min(parts, size // MIN_RANGE_BYTES or 1))
+    step = -(-size // parts)
+    return [(pos, min(pos + step, end)) for pos in range(start, end, step)]
+
+
+def align_range(buf: mmap.mmap, start: int, end: int) -> Tuple[int, int]:
+    """
+    Зсуває [start, end) на межі рядків: діапазону належать рядки,
+    що починаються в ньому. Рядок, що почався раніше за start, — попереднього.
+    """
+    size = len(buf)
+
+    def line_start(pos: int) -> int:
+        if pos <= 0:
+            return 0
+        if pos >= size:
+            return size
+        nl = buf.find(b"\n", pos - 1)
+        return size if nl == -1 else nl + 1
+
+    return line_start(start), line_start(end)
+
+
+def scan_text_lines(
+    data: bytes, first_line: int, level: Optional[str], details: IO[str],
+    counts: Dict[str, int], warn: Callable[[int, str], None], stats: Optional[LogStats] = None,
+) -> Tuple[int, int]:
+    """
+    Повільний шлях — той самий розбір, що й iter_logs (декодування, strip,
+    parse_log_line, ті самі межі рядків). Повертає (кількість деталей, кількість рядків).
+    """
+    matched = 0
+    line_no = first_line - 1
+    for line_no, raw in enumerate(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"), start=first_line):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            rec = parse_log_line(line)
+        except ValueError as e:
+            warn(line_no, str(e))
+            continue
+        counts[rec["level"]] += 1
+        if stats is not None:
+            stats.add(f"{rec['date']} {rec['time']}", rec["level"], rec["message"])
+        if rec["level"] == level:
+            details.write(format_log_entry(rec) + "\n")
+            matched += 1
+    return matched, line_no - first_line + 1
+
+
+def scan_chunk_fast(
+    chunk: bytes, level: Optional[str], details: IO[str], counts: Dict[str, int],
+    stats: Optional[LogStats] = None,
+) -> Optional[Tuple[int, int]]:
+    """
+    Швидкий шлях для шматка, що закінчується переводом рядка: рівні рахуються регулярним
+    виразом по байтах, декодуються лише повідомлення вибраного рівня.
+    Повертає (кількість деталей, кількість рядків) або None, якщо хоч один рядок
+    не має фіксованої розкладки — тоді шматок повністю розбирає scan_text_lines (з попередженнями).
+    """
+    data = b"\n" + chunk
+    lines = chunk.count(b"\n")
+    tokens = Counter(FAST_LINE_RE.findall(data))
+    parsed = sum(tokens.values())
+    if parsed != lines and parsed + len(FAST_BLANK_RE.findall(data)) != lines:
+        return None
+    if b"\r" in chunk and FAST_LONE_CR_RE.search(chunk):
+        return None
+    found = dict.fromkeys(LEVELS, 0)
+    for initial, n in tokens.items():
+        found[FAST_LEVEL_BY_INITIAL[initial]] += n
+    for lvl, n in found.items():
+        counts[lvl] += n
+    if stats is not None:
+        collect_fast_stats(data, found, stats)
+
+    if not level or not found[level]:
+        return 0, lines
+    write = details.write
+    for stamp, message in FAST_DETAIL_RE[level].findall(data):
+        write(f"{stamp.decode('ascii')} - {message.decode('utf-8').strip()}\n")
+    return found[level], lines
+
+
+def collect_fast_stats(data: bytes, found: Dict[str, int], stats: LogStats) -> None:
+    # Статистика для шматка, що пройшов швидкий шлях: кошики й повідомлення — регулярними виразами
+    if stats.histogram is not None:
+        for (key, initial), n in Counter(FAST_BUCKET_RE[stats.histogram.bucket].findall(data)).items():
+            stats.histogram.add(key.decode("ascii"), FAST_LEVEL_BY_INITIAL[initial], n)
+    for lvl, sketch in stats.top.items():
+        if not found[lvl]:
+            continue
+        messages: Counter = Counter()
+        for raw, n in Counter(FAST_MESSAGE_RE[lvl].findall(data)).items():
+            messages[raw.decode("utf-8").strip()] += n
+        for message, n in messages.items():
+            sketch.update(message, n)
+
+
+def scan_block(
+    data: bytes, first_line: int, level: Optional[str], details: IO[str],
+    counts: Dict[str, int], warn: Callable[[int, str], None], stats: Optional[LogStats] = None,
+) -> Tuple[int, int]:
+    """
+    Швидкий шлях для блоку; якщо в ньому є нестандартний рядок, блок ділиться
+    навпіл по межі рядка, доки повільно не розбиратиметься лише невелика
+    околиця такого рядка. Повертає (кількість деталей, кількість рядків).
+    """
+    if data.endswith(b"\n"):
+        result = scan_chunk_fast(data, level, details, counts, stats)
+        if result is not None:
+            return result
+        mid = data.rfind(b"\n", 0, len(data) // 2) + 1
+        if len(data) > SLOW_BLOCK_BYTES and mid > 0:
+            head_matched, head_lines = scan_block(data[:mid], first_line, level, details, counts, warn, stats)
+            tail_matched, tail_lines = scan_block(
+                data[mid:], first_line + head_lines, level, details, counts, warn, stats
+            )
+            return head_matched + tail_matched, head_lines + tail_lines
+    return scan_text_lines(data, first_line, level, details, counts, warn, stats)
+
+
+def scan_range(
+    buf: mmap.mmap, start: int, end: int, level: Optional[str], details: IO[str],
+    warn: Callable[[int, str], None], first_line: int = 1, stats: Optional[LogStats] = None,
+) -> Tuple[Dict[str, int], int, int]:
+    """
+    Розбирає рядки, що починаються у [start, end) змапленого файлу, шматками
+    по SCAN_CHUNK_BYTES. Повертає (лічильники, кількість деталей, кількість рядків).
+    """
+    counts = dict.fromkeys(LEVELS, 0)
+    matched = 0
+    line_no = first_line
+    start, end = align_range(buf, start, end)
+    pos = start
+    while pos < end:
+        stop = buf.rfind(b"\n", pos, min(pos + SCAN_CHUNK_BYTES, end)) + 1
+        if stop <= pos:
+            # рядок довший за шматок або останній рядок без \n
+            nl = buf.find(b"\n", pos, end)
+            stop = end if nl == -1 else nl + 1
+        n, lines = scan_block(buf[pos:stop], line_no, level, details, counts, warn, stats)
+        matched += n
+        line_no += lines
+        pos = stop
+    return counts, matched, line_no - first_line
+
+
+def scan_chunks(
+    chunks: Iterable[bytes], level: Optional[str], details: IO[str],
+    warn: Callable[[int, str], None], first_line: int = 1, stats: Optional[LogStats] = None,
+) -> Tuple[Dict[str, int], int, int, bytes]:
+    """
+    Розбирає повні рядки з потоку шматків байтів (звичайний файл, розпакований
+    архів). Повертає (лічильники, кількість деталей, кількість рядків,
+    залишок після останнього \\n — неповний рядок).
+    """
+    counts = dict.fromkeys(LEVELS, 0)
+    matched = 0
+    line_no = first_line
+    pending = b""
+    for data in chunks:
+        if pending:
+            data = pending + data
+        cut = data.rfind(b"\n") + 1
+        pending = data[cut:]
+        if not cut:
+            continue  # рядок довший за шматок — дочитуємо
+        part, n, lines = scan_range(data, 0, cut, level, details, warn, line_no, stats)
+        for lvl, k in part.items():
+            counts[lvl] += k
+        matched += n
+        line_no += lines
+    return counts, matched, line_no - first_line, pending
+
+
+def open_log(file_path: str, kind: Optional[str] = None) -> IO[bytes]:
+    try:
+        return open_binary(file_path, kind)
+    except FileNotFoundError:
+        print(f"[ERR] Файл не знайдено: {file_path}", file=sys.stderr)
+        sys.exit(1)
+    except OSError as e:
+        print(f"[ERR] Помилка читання файлу: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+@contextmanager
+def open_mapped(file_path: str) -> Iterator[Optional[mmap.mmap]]:
+    """
+    Мапить файл лише для читання; None — файл порожній або не мапиться
+    (канал, спецфайл), тоді викликач бере звичайний потоковий розбір.
+    """
+    with open_log(file_path) as fh:
+        try:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            yield None
+            return
+        with buf:
+            yield buf
+
+
+def in_time_range(logs: Iterable[dict], since: Optional[str], until: Optional[str]) -> Iterator[dict]:
+    # Фільтр часу для потокового розбору (коли файл не мапиться й індексу немає)
+    for rec in logs:
+        stamp = f"{rec['date']} {rec['time']}"
+        if (since is None or stamp >= since) and (until is None or stamp <= until):
+            yield rec
+
+
+def read_logs(file_path: str, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[dict]:
+    logs = iter_logs(file_path)
+    return logs if since is None and until is None else in_time_range(logs, since, until)
+
+
+def file_span(
+    file_path: str, buf: mmap.mmap, since: Optional[str], until: Optional[str]
+) -> Tuple[int, int, int]:
+    """
+    Діапазон байтів для аналізу: увесь файл або зріз --since/--until,
+    знайдений через розріджений індекс часу (time_index.py).
+    Повертає (start, end, номер першого рядка).
+    """
+    if since is None and until is None:
+        return 0, len(buf), 1
+    return TimeIndex.for_file(file_path, buf).locate(buf, since, until)
+
+
+def print_warning(line_no: int, message: str, file_path: Optional[str] = None) -> None:
+    where = f"{file_path}: " if file_path else ""
+    print(f"[WARN] {where}Рядок {line_no} пропущено: {message}", file=sys.stderr)
+
+
+def analyze_compressed(
+    file_path: str, kind: str, level: Optional[str], details: IO[str],
+    warn: Callable[[int, str], None] = print_warning, stats: Optional[LogStats] = None,
+) -> Tuple[Dict[str, int], int]:
+    """
+    Стиснений файл: розпакування у фоновому потоці (read_chunks) паралельно
+    з розбором тим самим сканером байтів, що й для звичайного файлу.
+    """
+    try:
+        with open_log(file_path, kind) as fh:
+            counts, matched, lines, pending = scan_chunks(read_chunks(fh), level, details, warn, 1, stats)
+            if pending:
+                matched += scan_text_lines(pending, lines + 1, level, details, counts, warn, stats)[0]
+    except DECOMPRESS_ERRORS as e:
+        print(f"[ERR] Помилка читання файлу: {e}", file=sys.stderr)
+        sys.exit(1)
+    return counts, matched
+
+
+def analyze_file(
+    file_path: str, level: Optional[str], details: IO[str],
+    since: Optional[str] = None, until: Optional[str] = None,
+    warn: Callable[[int, str], None] = print_warning, stats: Optional[LogStats] = None,
+) -> Tuple[Dict[str, int], int]:
+    # Послідовний аналіз: mmap + швидкий шлях, для незмаплюваних файлів — iter_logs
+    kind = detect_compression(file_path)
+    if kind is not None:
+        # індексу часу для архіву немає — зріз фільтрується під час читання
+        if since is None and until is None:
+            return analyze_compressed(file_path, kind, level, details, warn, stats)
+        return analyze_logs(read_logs(file_path, since, until), level, details, stats)
+    with open_mapped(file_path) as buf:
+        if buf is None:
+            return analyze_logs(read_logs(file_path, since, until), level, details, stats)
+        start, end, first_line = file_span(file_path, buf, since, until)
+        counts, matched, _ = scan_range(buf, start, end, level, details, warn, first_line, stats)
+        return counts, matched
+
+
+def new_spool(stack: ExitStack) -> IO[str]:
+    # Деталі в пам'яті до SPOOL_MAX_BYTES, далі — у тимчасовому файлі; закривається з stack
+    return stack.enter_context(
+        tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+", encoding="utf-8")
+    )
+
+
+def write_details(scan: Callable[[IO[str]], Any]) -> Tuple[Any, str]:
+    """
+    Виконується у процесі пулу: scan пише деталі у новий тимчасовий файл.
+    Повертає (результат scan, шлях файлу); якщо scan падає, файл видаляється тут же.
+    """
+    details = tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".details", delete=False)
+    try:
+        with details:
+            result = scan(details)
+    except BaseException:
+        os.remove(details.name)
+        raise
+    return result, details.name
+
+
+def remove_details(futures: List[Future]) -> None:
+    # Видаляє тимчасові файли деталей усіх задач, що завершились успішно
+    for future in futures:
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            continue
+        part = future.result()
+        if part is not None and part.details:
+            with suppress(FileNotFoundError):
+                os.remove(part.details)
+
+
+def submit_parts(
+    pool: ProcessPoolExecutor, stack: ExitStack, func: Callable, tasks: Iterable[tuple],
+    stats: Optional[LogStats],
+) -> List[Future]:
+    """
+    Ставить у пул func(*task, stats) для кожного task. Задачам іде порожня
+    копія stats: аргументи серіалізуються вже під час злиття, тож інакше
+    пізніші задачі отримали б частково злиту статистику. Файли деталей,
+    створені задачами, видаляються разом зі stack — і тоді, коли злиття
+    перервав виняток однієї із задач.
+    """
+    worker_stats = stats.empty_copy() if stats is not None else None
+    futures = [pool.submit(func, *task, worker_stats) for task in tasks]
+    stack.callback(remove_details, futures)
+    return futures
+
+
+class WorkerPart(NamedTuple):
+    # Результат процесу пулу для діапазону файлу (analyze_range) чи цілого файлу (analyze_one)
+    counts: Dict[str, int]
+    matched: int
+    warnings: List[Tuple[int, str]]  # номери рядків — від початку діапазону чи файлу
+    line_count: int  # рядків у діапазоні; для цілого файлу не потрібна — 0
+    details: str  # шлях тимчасового файлу деталей
+    stats: Optional[LogStats]
+
+
+def analyze_range(
+    file_path: str, start: int, end: int, level: Optional[str], stats: Optional[LogStats] = None
+) -> WorkerPart:
+    """
+    Виконується у процесі пулу: розбирає один діапазон файлу.
+    Деталі пишуться у тимчасовий файл, попередження — з номерами рядків
+    відносно початку діапазону. stats — порожня копія статистики викликача,
+    заповнюється і повертається для злиття.
+    """
+    warnings: List[Tuple[int, str]] = []
+    with open(file_path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        (counts, matched, line_count), path = write_details(lambda details: scan_range(
+            buf, start, end, level, details, lambda line_no, msg: warnings.append((line_no, msg)), 1, stats
+        ))
+    return WorkerPart(counts, matched, warnings, line_count, path, stats)
+
+
+class GzipPart(NamedTuple):
+    # Результат процесу пулу для членів gzip, що починаються в його діапазоні
+    first: int  # зсув першого члена у стисненому файлі
+    stop: int  # зсув кінця останнього члена
+    head: Optional[bytes]  # текст до першого \n включно; None — \n немає зовсім
+    tail: bytes  # неповний рядок після останнього \n
+    counts: Dict[str, int]
+    matched: int
+    warnings: List[Tuple[int, str]]
+    line_count: int
+    details: Optional[str]
+    stats: Optional[LogStats]
+
+
+def analyze_gzip_members(
+    file_path: str, start: int, end: int, level: Optional[str], stats: Optional[LogStats] = None
+) -> Optional[GzipPart]:
+    """
+    Виконується у процесі пулу: розпаковує й розбирає члени gzip, що
+    починаються у [start, end) стисненого файлу. Межі членів не збігаються
+    з межами рядків, тож перший і останній неповні рядки повертаються
+    сирими — їх склеює з сусідами analyze_gzip_parallel.
+    None — у діапазоні не починається жоден член.
+    """
+    with open(file_path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        first = find_gzip_member(buf, start, end)
+        if first is None:
+            return None
+        stop: List[int] = []
+        chunks = iter_gzip_members(buf, first, end, stop.append)
+        head = b""
+        for data in chunks:
+            nl = data.find(b"\n")
+            if nl != -1:
+                head += data[:nl + 1]
+                rest = data[nl + 1:]
+                break
+            head += data
+        else:
+            return GzipPart(first, stop[0], None, head, dict.fromkeys(LEVELS, 0), 0, [], 0, None, stats)
+        warnings: List[Tuple[int, str]] = []
+        (counts, matched, line_count, tail), path = write_details(lambda details: scan_chunks(
+            chain([rest], chunks), level, details, lambda line_no, msg: warnings.append((line_no, msg)),
+            1, stats,
+        ))
+    return GzipPart(first, stop[0], head, tail, counts, matched, warnings, line_count, path, stats)
+
+
+def analyze_gzip_parallel(
+    file_path: str, level: Optional[str], workers: int, stack: ExitStack, stats: Optional[LogStats] = None
+) -> Optional[Tuple[Dict[str, int], int, List[IO[str]]]]:
+    """
+    Gzip із кількох членів (pigz, bgzip, склеєні ротації): члени розпаковуються
+    паралельно. Результати приймаються, лише якщо знайдені члени встик
+    покривають увесь файл; інакше (один член, сміття в кінці, пошкодження)
+    повертається None і файл розбирається послідовно.
+    """
+    size = os.path.getsize(file_path)
+    parts: List[GzipPart] = []
+    failed = False
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = submit_parts(
+            pool, stack, analyze_gzip_members,
+            [(file_path, start, end, level) for start, end in split_ranges(0, size, workers * RANGES_PER_WORKER)],
+            stats,
+        )
+        for future in futures:
+            try:
+                part = future.result()
+            except DECOMPRESS_ERRORS:
+                failed = True
+                continue
+            if part is not None:
+                parts.append(part)
+    expected = 0
+    for part in parts:
+        failed = failed or part.first != expected
+        expected = part.stop
+    if failed or expected != size:
+        return None
+
+    counts = dict.fromkeys(LEVELS, 0)
+    matched = 0
+    details: List[IO[str]] = []
+    lines_before = 0
+
+    def scan_joined(data: bytes) -> None:
+        # рядок, розрізаний межею між діапазонами, розбирається тут
+        nonlocal matched, lines_before
+        out = io.StringIO()
+        n, lines = scan_text_lines(data, lines_before + 1, level, out, counts, print_warning, stats)
+        matched += n
+        lines_before += lines
+        if n:
+            out.seek(0)
+            details.append(out)
+
+    carry = b""
+    for part in parts:
+        if part.head is None:
+            carry += part.tail
+            continue
+        scan_joined(carry + part.head)
+        for lvl, n in part.counts.items():
+            counts[lvl] += n
+        matched += part.matched
+        if stats is not None:
+            stats.merge(part.stats)
+        for line_no, message in part.warnings:
+            print_warning(lines_before + line_no, message)
+        lines_before += part.line_count
+        if part.matched:
+            details.append(stack.enter_context(open(part.details, "r", encoding="utf-8")))
+        carry = part.tail
+    if carry:
+        scan_joined(carry)
+    return counts, matched, details
+
+
+def analyze_parallel(
+    file_path: str, level: Optional[str], workers: int, stack: ExitStack,
+    since: Optional[str] = None, until: Optional[str] = None, stats: Optional[LogStats] = None,
+) -> Tuple[Dict[str, int], int, List[IO[str]]]:
+    """
+    Паралельний аналіз діапазонами байтів. Результати діапазонів зливаються
+    у порядку файлу, тож звіт збігається з послідовним. Файли деталей
+    реєструються у stack і видаляються разом з ним.
+    """
+    kind = detect_compression(file_path)
+    if kind == "gzip" and since is None and until is None:
+        result = analyze_gzip_parallel(file_path, level, workers, stack, stats)
+        if result is not None:
+            return result
+    if kind is not None:
+        # стиснений файл довільного доступу не має — розбираємо послідовно
+        spool = new_spool(stack)
+        counts, matched = analyze_file(file_path, level, spool, since, until, print_warning, stats)
+        spool.seek(0)
+        return counts, matched, [spool]
+    with open_mapped(file_path) as buf:
+        if buf is None:
+            # не мапиться — розбираємо послідовно
+            spool = new_spool(stack)
+            counts, matched = analyze_logs(read_logs(file_path, since, until), level, spool, stats)
+            spool.seek(0)
+            return counts, matched, [spool]
+        start, end, first_line = file_span(file_path, buf, since, until)
+
+    ranges = split_ranges(start, end, workers * RANGES_PER_WORKER)
+    counts = dict.fromkeys(LEVELS, 0)
+    matched = 0
+    details: List[IO[str]] = []
+    lines_before = first_line - 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = submit_parts(
+            pool, stack, analyze_range, [(file_path, start, end, level) for start, end in ranges], stats
+        )
+        for future in futures:
+            part = future.result()
+            for lvl, n in part.counts.items():
+                counts[lvl] += n
+            matched += part.matched
+            if stats is not None:
+                stats.merge(part.stats)
+            for line_no, message in part.warnings:
+                print_warning(lines_before + line_no, message)
+            lines_before += part.line_count
+            if part.matched:
+                details.append(stack.enter_context(open(part.details, "r", encoding="utf-8")))
+    return counts, matched, details
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """
+    Розгортає glob-шаблони (кожен — у відсортованому порядку) і прибирає
+    повтори. Шаблон без збігів чи відсутній файл — помилка, як і для одного файлу.
+    """
+    paths: Dict[str, None] = {}
+    for pattern in patterns:
+        found = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not found or not os.path.exists(found[0]):
+            print(f"[ERR] Файл не знайдено: {pattern}", file=sys.stderr)
+            sys.exit(1)
+        paths.update(dict.fromkeys(found))
+    return list(paths)
+
+
+def analyze_one(
+    file_path: str, level: Optional[str], since: Optional[str], until: Optional[str],
+    stats: Optional[LogStats] = None,
+) -> WorkerPart:
+    # Виконується у процесі пулу: аналізує один файл з кількох
+    warnings: List[Tuple[int, str]] = []
+    (counts, matched), path = write_details(lambda details: analyze_file(
+        file_path, level, details, since, until, lambda line_no, msg: warnings.append((line_no, msg)), stats
+    ))
+    return WorkerPart(counts, matched, warnings, 0, path, stats)
+
+
+def detail_stamp(line: str) -> str:
+    # Ключ злиття: "дата час" з початку рядка деталей
+    return " ".join(line.split(" ", 2)[:2])
+
+
+def analyze_many(
+    paths: List[str], level: Optional[str], workers: int, stack: ExitStack,
+    since: Optional[str] = None, until: Optional[str] = None, stats: Optional[LogStats] = None,
+) -> Tuple[Dict[str, int], int, List[Iterable[str]], List[Tuple[str, Dict[str, int]]]]:
+    """
+    Кілька файлів: кожен розбирається цілим у своєму процесі пулу.
+    Деталі кожного файлу вже впорядковані за часом, тож спільний розділ
+    деталей — це heapq.merge по файлах (при рівному часі — у порядку файлів),
+    без глобального сортування і без читання всього в пам'ять.
+    Повертає (лічильники, кількість деталей, [деталі], [(файл, лічильники файлу)]).
+    """
+    counts = dict.fromkeys(LEVELS, 0)
+    matched = 0
+    parts: List[IO[str]] = []
+    subtotals: List[Tuple[str, Dict[str, int]]] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = submit_parts(pool, stack, analyze_one, [(path, level, since, until) for path in paths], stats)
+        for path, future in zip(paths, futures):
+            part = future.result()
+            for lvl, n in part.counts.items():
+                counts[lvl] += n
+            matched += part.matched
+            if stats is not None:
+                stats.merge(part.stats)
+            for line_no, message in part.warnings:
+                print_warning(line_no, message, path)
+            subtotals.append((path, part.counts))
+            if part.matched:
+                parts.append(stack.enter_context(open(part.details, "r", encoding="utf-8")))
+    return counts, matched, [heapq.merge(*parts, key=detail_stamp)], subtotals
+
+
+def log_message(line: str) -> Optional[str]:
+    # Повідомлення коректного запису для індексу слів; None — рядок пропускається
+    try:
+        return parse_log_line(line)["message"]
+    except ValueError:
+        return None
+
+
+def grep_file(
+    file_path: str, clauses: List[List[str]], level: Optional[str], details: IO[str],
+    since: Optional[str] = None, until: Optional[str] = None, stats: Optional[LogStats] = None,
+    tagged: bool = False,
+) -> Tuple[Dict[str, int], int]:
+    """
+    Записи, повідомлення яких відповідають запиту: рахує їх за рівнями
+    і пише у details ті, що мають рівень level (None — усі; з tagged рядок
+    містить і рівень: "дата час РІВЕНЬ - повідомлення").
+    Звичайний файл читається лише в рядках зі списків індексу слів
+    (при першому запиті індекс будується); стиснений чи незмаплюваний
+    файл переглядається повністю.
+    """
+    counts = dict.fromkeys(LEVELS, 0)
+    matched = 0
+
+    def take(rec: dict) -> None:
+        nonlocal matched
+        counts[rec["level"]] += 1
+        if stats is not None:
+            stats.add(f"{rec['date']} {rec['time']}", rec["level"], rec["message"])
+        if level is None or rec["level"] == level:
+            if tagged:
+                details.write(f"{rec['date']} {rec['time']} {rec['level']} - {rec['message']}\n")
+            else:
+                details.write(format_log_entry(rec) + "\n")
+            matched += 1
+
+    def take_raw(raw: bytes) -> None:
+        # Рядок зі списку індексу; некоректний (пошкоджений індекс) пропускається
+        try:
+            rec = parse_log_line(raw.decode("utf-8", "replace"))
+        except ValueError:
+            return
+        stamp = f"{rec['date']} {rec['time']}"
+        if (since is None or stamp >= since) and (until is None or stamp <= until):
+            take(rec)
+
+    with ExitStack() as stack:
+        buf = None if detect_compression(file_path) else stack.enter_context(open_mapped(file_path))
+        if buf is None:
+            for rec in read_logs(file_path, since, until):
+                if matches(rec["message"], clauses):
+                    take(rec)
+            return counts, matched
+        index = TokenIndex.for_file(file_path, buf, log_message)
+        # збіги йдуть потоком за зростанням зсуву: пам'ять не залежить від їх кількості
+        for offset in index.lookup(clauses):
+            if offset >= index.indexed_to or (offset and buf[offset - 1] != 0x0A):
+                continue  # не початок рядка — пошкоджений список
+            take_raw(buf[offset:buf.find(b"\n", offset)])
+        tail = buf[index.indexed_to:]  # останній рядок без \n індекс не бачить
+        if tail.strip() and matches(log_message(tail.decode("utf-8", "replace")) or "", clauses):
+            take_raw(tail)
+    return counts, matched
+
+
+def grep_files(
+    paths: List[str], clauses: List[List[str]], level: Optional[str], stack: ExitStack,
+    since: Optional[str] = None, until: Optional[str] = None, stats: Optional[LogStats] = None,
+    tagged: bool = False,
+) -> Tuple[Dict[str, int], int, List[Iterable[str]], List[Tuple[str, Dict[str, int]]]]:
+    # Пошук по файлах по черзі; деталі кількох файлів зливаються за часом, як в analyze_many
+    counts = dict.fromkeys(LEVELS, 0)
+    matched = 0
+    parts: List[IO[str]] = []
+    subtotals: List[Tuple[str, Dict[str, int]]] = []
+    for path in paths:
+        spool = new_spool(stack)
+        part_counts, part_matched = grep_file(path, clauses, level, spool, since, until, stats, tagged)
+        spool.seek(0)
+        for lvl, n in part_counts.items():
+            counts[lvl] += n
+        matched += part_matched
+        subtotals.append((path, part_counts))
+        parts.append(spool)
+    details: List[Iterable[str]] = parts if len(parts) == 1 else [heapq.merge(*parts, key=detail_stamp)]
+    return counts, matched, details, subtotals
+
+
+def resume_state(fh: IO[bytes], state: Optional[Checkpoint]) -> Checkpoint:
+    # Продовжуємо з контрольної точки, лише якщо це той самий файл і він тільки ріс
+    st = os.fstat(fh.fileno())
+    fh.seek(0)
+    head = fh.read(HEAD_BYTES)
+    if state is not None and not state.same_file(st.st_ino, st.st_size, head):
+        print("[INFO] Файл ротовано або обрізано — аналіз з початку.", file=sys.stderr)
+        state = None
+    if state is None:
+        state = Checkpoint(st.st_ino, LEVELS)
+    state.head = head
+    return state
+
+
+def scan_appended(
+    fh: IO[bytes], state: Checkpoint, level: Optional[str], details: IO[str],
+    warn: Callable[[int, str], None],
+) -> int:
+    """
+    Розбирає повні рядки, дописані після state.offset, шматками по SCAN_CHUNK_BYTES;
+    неповний останній рядок лишається до наступного разу. Оновлює state
+    (зсув, кількість рядків, лічильники) і повертає кількість деталей.
+    """
+    fh.seek(state.offset)
+    counts, matched, lines, pending = scan_chunks(
+        iter(lambda: fh.read(SCAN_CHUNK_BYTES), b""), level, details, warn, state.lines + 1
+    )
+    for lvl, n in counts.items():
+        state.counts[lvl] += n
+    state.lines += lines
+    state.offset = fh.tell() - len(pending)
+    return matched
+
+
+def follow_log(
+    file_path: str, fh: IO[bytes], state: Checkpoint, level: Optional[str],
+    checkpoint_path: Optional[str],
+) -> None:
+    """
+    Режим --follow: раз на FOLLOW_INTERVAL секунд дочитує нові рядки, друкує
+    деталі вибраного рівня і оновлює таблицю. У терміналі таблиця
+    перемальовується внизу екрана, інакше друкується один раз при виході (Ctrl+C).
+    Ротацію файлу помічає за зміною inode шляху: старий файл спершу дочитується.
+    """
+    live = sys.stdout.isatty()
+    drawn = False
+    try:
+        while True:
+            time.sleep(FOLLOW_INTERVAL)
+            before = (state.inode, state.offset)
+            out = io.StringIO()
+            scan_appended(fh, state, level, out, print_warning)
+            try:
+                rotated = os.stat(file_path).st_ino != state.inode
+            except FileNotFoundError:
+                rotated = False  # між перейменуванням і появою нового файлу
+            if rotated:
+                fh.close()
+                fh = open_log(file_path)
+            state = resume_state(fh, state)
+            scan_appended(fh, state, level, out, print_warning)
+            if (state.inode, state.offset) == before:
+                continue
+            if checkpoint_path:
+                state.save(checkpoint_path)
+            if live and drawn:
+                # курсор на початок попередньої таблиці й очищення до кінця екрана
+                sys.stdout.write(f"\x1b[{len(LEVELS) + 2}F\x1b[J")
+            sys.stdout.write(out.getvalue())
+            if live:
+                display_log_counts(state.counts)
+                drawn = True
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fh.close()
+        if checkpoint_path:
+            state.save(checkpoint_path)
+    if not live:
+        display_log_counts(state.counts)
+
+
+def run_incremental(
+    file_path: str, raw_level: Optional[str], checkpoint_path: Optional[str], follow: bool
+) -> None:
+    """
+    Інкрементальний аналіз: з --checkpoint розбираються лише байти, дописані
+    після попереднього запуску; таблиця показує накопичені лічильники,
+    деталі — лише нові записи. З --follow далі стежить за файлом.
+    """
+    level = raw_level.upper() if raw_level else None
+    if follow and raw_level and level not in LEVELS:
+        print(f"[ERR] Невідомий рівень: {raw_level}", file=sys.stderr)
+        sys.exit(2)
+    wanted = level if level in LEVELS else None
+    state = Checkpoint.load(checkpoint_path, LEVELS) if checkpoint_path else None
+    fh = open_log(file_path)
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+", encoding="utf-8") as spool:
+        state = resume_state(fh, state)
+        matched = scan_appended(fh, state, wanted, spool, print_warning)
+        if checkpoint_path:
+            state.save(checkpoint_path)
+        spool.seek(0)
+        print_report(state.counts, matched, [spool], raw_level)
+    if follow:
+        follow_log(file_path, fh, state, wanted, checkpoint_path)
+    else:
+        fh.close()
+
+
+def print_report(
+    counts: Dict[str, int], matched: int, details: List[Iterable[str]], raw_level: Optional[str],
+    heading: Optional[str] = None,
+) -> None:
+    """
+    Друкує таблицю рівнів і, якщо задано рівень, деталі з details по черзі
+    (файли копіюються блоками, інші джерела рядків — як є).
+    heading — заголовок деталей, коли рівень не задано (пошук --grep).
+    """
+    # Якщо файл порожній або всі рядки зіпсовані
+    if not any(counts.values()) and heading is None:
+        print("[INFO] Не знайдено жодного коректного запису у файлі.", file=sys.stderr)
+        display_log_counts({lvl: 0 for lvl in LEVELS})
+        return
+
+    display_log_counts(counts)
+
+    # Якщо передано рівень — покажемо деталі для нього
+    if raw_level:
+        level = raw_level.upper()
+        if level not in LEVELS:
+            print(f"[ERR] Невідомий рівень: {raw_level}", file=sys.stderr)
+            sys.exit(2)
+
+        heading = f"Деталі логів для рівня '{level}':"
+
+    if heading:
+        print(f"\n{heading}")
+        if not matched:
+            print("(Немає записів.)")
+            return
+
+        sys.stdout.flush()
+        for part in details:
+            if hasattr(part, "read"):
+                shutil.copyfileobj(part, sys.stdout)
+            else:
+                sys.stdout.writelines(part)
+
+
+def print_subtotals(subtotals: List[Tuple[str, Dict[str, int]]]) -> None:
+    # --per-file: таблиця для кожного файлу перед спільною
+    for file_path, counts in subtotals:
+        print(f"Файл: {file_path}")
+        display_log_counts(counts)
+        print()
+
+
+BUCKET_TITLES = {"minute": "по хвилинах", "hour": "по годинах", "day": "по днях"}
+
+
+def display_stats(stats: LogStats) -> None:
+    """
+    Друкує гістограму (колонка на рівень, кошики за часом) і топ повідомлень.
+    Кількості топу — оцінки Space-Saving: якщо є похибка, справжня кількість
+    лежить між оцінкою мінус похибка і самою оцінкою.
+    """
+    if stats.histogram is not None:
+        print(f"\nГістограма {BUCKET_TITLES[stats.histogram.bucket]}:")
+        print(f"{'Час':<17} | " + " | ".join(f"{lvl:<8}" for lvl in LEVELS))
+        print("-" * 17 + ("|" + "-" * 10) * len(LEVELS))
+        for key, row in stats.histogram.items():
+            print(f"{key:<17} | " + " | ".join(f"{row[lvl]:<8}" for lvl in LEVELS))
+    for lvl, sketch in stats.top.items():
+        print(f"\nТоп-{stats.top_n} повідомлень рівня '{lvl}':")
+        ranked = sketch.top(stats.top_n)
+        if not ranked:
+            print("(Немає записів.)")
+            continue
+        print(f"{'Кількість':<10} | Повідомлення")
+        print("-" * 11 + "|" + "-" * 14)
+        for message, count, error in ranked:
+            note = f" (похибка до {error})" if error else ""
+            print(f"{count:<10} | {message}{note}")
+
+
+def report_summary(
+    counts: Dict[str, int], matched: int, level: Optional[str], stats: Optional[LogStats],
+    subtotals: List[Tuple[str, Dict[str, int]]],
+) -> dict:
+    # Підсумковий запис для --format: те саме, що таблиці текстового звіту
+    summary: dict = {"counts": counts, "total": sum(counts.values()), "level": level, "matched": matched}
+    if subtotals:
+        summary["files"] = [{"path": path, "counts": part} for path, part in subtotals]
+    if stats is not None and stats.histogram is not None:
+        summary["histogram"] = [{"bucket": key, **row} for key, row in stats.histogram.items()]
+    if stats is not None and stats.top:
+        summary["top"] = {
+            lvl: [{"message": message, "count": count, "error": error}
+                  for message, count, error in sketch.top(stats.top_n)]
+            for lvl, sketch in stats.top.items()
+        }
+    return summary
+
+
+def finish_sink(sink: Sink, details: List[Iterable[str]], summary: dict) -> None:
+    # Деталі, ще не віддані приймачу під час розбору (пул, кілька файлів), і підсумок
+    for part in details:
+        sink.writelines(part)
+    sink.close(summary)
+
+
+def split_level(positionals: List[str]) -> Tuple[List[str], Optional[str]]:
+    """
+    Останній позиційний аргумент — рівень, якщо він не схожий на шлях
+    (не існує, без "/", "." і glob-символів), як і раніше: "hw03.py app.log error".
+    """
+    last = positionals[-1]
+    looks_like_path = os.path.exists(last) or glob.has_magic(last) or os.sep in last or "." in last
+    if len(positionals) > 1 and not looks_like_path:
+        return positionals[:-1], last
+    return positionals, None
+
+
 def display_log_counts(counts: Dict[str, int]) -> None:
     """
     Друкує таблицю з підрахунком записів для кожного рівня.
@@ -109,47 +1133,160 @@ def main() -> None:
     )
     parser.add_argument(
         "file_path",
-        help="Шлях до файлу логів"
+        nargs="+",
+        help="Шлях до файлу логів (можна кілька, підтримуються glob-шаблони, напр. 'app.log*'); "
+             "останнім опційно йде рівень логування для детального виводу (info|error|debug|warning)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Кількість процесів для розбору (типово: один файл — 1, кілька — за числом CPU)"
+    )
+    parser.add_argument(
+        "--per-file",
+        action="store_true",
+        help="Показати також таблицю для кожного файлу окремо"
+    )
+    parser.add_argument(
+        "--since",
+        metavar="TIME",
+        help="Лише записи від цього часу: YYYY-MM-DD[ HH:MM[:SS]] (включно)"
+    )
+    parser.add_argument(
+        "--until",
+        metavar="TIME",
+        help="Лише записи до цього часу: YYYY-MM-DD[ HH:MM[:SS]] (включно)"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="Файл контрольної точки: розбирати лише рядки, дописані з попереднього запуску"
+    )
+    parser.add_argument(
+        "--grep", "--match",
+        dest="grep",
+        metavar="QUERY",
+        help="Лише записи, повідомлення яких містять слова запиту: слова через пробіл — AND, "
+             "альтернативи через OR або | (напр. 'db timeout OR refused'); поєднується з рівнем"
+    )
+    parser.add_argument(
+        "--histogram",
+        choices=sorted(BUCKET_WIDTHS),
+        metavar="BUCKET",
+        help="Гістограма кількості записів за рівнями по часових кошиках: minute|hour|day"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=0,
+        metavar="N",
+        help="N найчастіших повідомлень рівнів ERROR і WARNING (наближено, з обмеженою пам'яттю)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="Формат виводу: text (таблиця, типово), json, ndjson або csv — записи й підсумковий запис"
     )
     parser.add_argument(
-        "level",
-        nargs="?",
-        help="Опційно: рівень логування для детального виводу (info|error|debug|warning)"
+        "--follow",
+        action="store_true",
+        help="Стежити за файлом і оновлювати таблицю наживо (Ctrl+C — вихід)"
     )
     args = parser.parse_args()
 
-    logs = load_logs(args.file_path)
-
-    # Якщо файл порожній або всі рядки зіпсовані
-    if not logs:
-        print("[INFO] Не знайдено жодного коректного запису у файлі.", file=sys.stderr)
-        display_log_counts({lvl: 0 for lvl in LEVELS})
+    patterns, raw_level = split_level(args.file_path)
+    paths = expand_paths(patterns)
+    level = raw_level.upper() if raw_level else None
+    wanted = level if level in LEVELS else None
+    if args.follow or args.checkpoint:
+        if args.since or args.until or args.grep or args.histogram or args.top or args.format != "text" \
+                or (args.workers or 1) > 1 or len(paths) > 1:
+            print(
+                "[ERR] --follow/--checkpoint працюють з одним файлом "
+                "і не поєднуються з --since/--until/--grep/--histogram/--top/--format/--workers",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+        if detect_compression(paths[0]):
+            print("[ERR] --follow/--checkpoint працюють лише з нестисненим файлом", file=sys.stderr)
+            sys.exit(2)
+        run_incremental(paths[0], raw_level, args.checkpoint, args.follow)
         return
 
-    counts = count_logs_by_level(logs)
-    display_log_counts(counts)
+    try:
+        since = normalize_bound(args.since) if args.since else None
+        until = normalize_bound(args.until, upper=True) if args.until else None
+    except ValueError as e:
+        print(f"[ERR] {e}", file=sys.stderr)
+        sys.exit(2)
+    if args.top < 0:
+        print("[ERR] --top має бути невід'ємним", file=sys.stderr)
+        sys.exit(2)
+    stats = LogStats(LEVELS, args.histogram, args.top) if args.histogram or args.top else None
+    sink: Optional[Sink] = None
+    if args.format != "text":
+        # таблиці немає, тож невідомий рівень відкидається до розбору
+        if raw_level and wanted is None:
+            print(f"[ERR] Невідомий рівень: {raw_level}", file=sys.stderr)
+            sys.exit(2)
+        sys.stdout.flush()
+        sink = SINKS[args.format](open_output(sys.stdout.fileno()), wanted, LEVELS)
 
-    # Якщо передано рівень — покажемо деталі для нього
-    if args.level:
+    if args.grep is not None:
         try:
-            selected = filter_logs_by_level(logs, args.level)
+            clauses = parse_query(args.grep)
         except ValueError as e:
             print(f"[ERR] {e}", file=sys.stderr)
             sys.exit(2)
+        with ExitStack() as stack:
+            counts, matched, details, subtotals = grep_files(
+                paths, clauses, wanted if raw_level else None, stack, since, until, stats,
+                tagged=sink is not None and not raw_level,
+            )
+            if sink is not None:
+                summary = report_summary(counts, matched, wanted, stats, subtotals if args.per_file else [])
+                finish_sink(sink, details, {"query": args.grep, **summary})
+                return
+            if args.per_file:
+                print_subtotals(subtotals)
+            print_report(counts, matched, details, raw_level, f"Деталі логів для запиту '{args.grep}':")
+        if stats is not None:
+            display_stats(stats)
+        return
 
-        norm_level = args.level.upper()
-        print(f"\nДеталі логів для рівня '{norm_level}':")
-        if not selected:
-            print("(Немає записів.)")
+    with ExitStack() as stack:
+        subtotals: List[Tuple[str, Dict[str, int]]] = []
+        if len(paths) > 1:
+            counts, matched, details, subtotals = analyze_many(
+                paths, wanted, args.workers or os.cpu_count() or 1, stack, since, until, stats
+            )
+        elif (args.workers or 1) > 1:
+            counts, matched, details = analyze_parallel(
+                paths[0], wanted, args.workers, stack, since, until, stats
+            )
+        elif sink is not None:
+            # Підсумок пишеться останнім, тож записи йдуть у приймач одразу під час розбору
+            counts, matched = analyze_file(paths[0], wanted, sink, since, until, print_warning, stats)
+            details = []
+        else:
+            # Таблиця друкується першою, а лічильники відомі лише після проходу,
+            # тому деталі накопичуються у тимчасовому буфері (за потреби — на диску)
+            spool = new_spool(stack)
+            counts, matched = analyze_file(paths[0], wanted, spool, since, until, print_warning, stats)
+            spool.seek(0)
+            details = [spool]
+        if sink is not None:
+            if args.per_file:
+                subtotals = subtotals or [(paths[0], counts)]
+            finish_sink(sink, details, report_summary(counts, matched, wanted, stats, subtotals if args.per_file else []))
             return
-
-        # FP-елемент: map для форматування вихідних рядків
-        lines = map(
-            lambda r: f"{r['date']} {r['time']} - {r['message']}",
-            selected
-        )
-        for out in lines:
-            print(out)
+        if args.per_file:
+            print_subtotals(subtotals or [(paths[0], counts)])
+        print_report(counts, matched, details, raw_level)
+    if stats is not None:
+        display_stats(stats)
 
 
 if __name__ == "__main__":
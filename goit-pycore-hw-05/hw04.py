@@ -1,5 +1,7 @@
 from typing import Callable
 
+from memoize import memoize
+
 
 # ====== Декоратор обробки помилок ======
 def input_error(func: Callable) -> Callable:
@@ -57,6 +59,7 @@ def parse_input(user_input):
     cmd = cmd.strip().lower()
     return cmd, *args
 
+@memoize(maxsize=65536)
 def validate_phone(phone: str) -> str:
     """
     Проста валідація телефону: лише цифри, довжина 7–15.
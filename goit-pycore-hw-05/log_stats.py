@@ -0,0 +1,155 @@
+"""
+Додаткова статистика лог-аналізатора з обмеженою пам'яттю.
+
+Histogram — кількість записів за рівнями в кожному часовому кошику
+(хвилина, година, день): ключі кошиків у списку, лічильники кожного рівня
+в окремій колонці array("Q"). SpaceSaving — найчастіші повідомлення за
+алгоритмом Space-Saving (Metwally та ін., 2005): тримає не більше capacity
+лічильників, тож пам'ять не залежить від довжини логу; оцінка кількості
+завищена щонайбільше на свою похибку, а похибка не перевищує total / capacity.
+Обидві структури зливаються, тож кожен процес пулу рахує свою частину.
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Довжина префікса "YYYY-MM-DD HH:MM:SS", що є ключем кошика
+BUCKET_WIDTHS = {"minute": 16, "hour": 13, "day": 10}
+TOP_LEVELS = ("ERROR", "WARNING")
+# Лічильників у скетчі на кожну з N позицій топу, але не менше мінімуму
+TOP_CAPACITY_FACTOR = 10
+TOP_MIN_CAPACITY = 1000
+
+
+class Histogram:
+    def __init__(self, bucket: str, levels: Sequence[str]) -> None:
+        self.bucket = bucket
+        self.width = BUCKET_WIDTHS[bucket]
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.columns: Dict[str, array] = {lvl: array("Q") for lvl in levels}
+
+    def add(self, stamp: str, level: str, n: int = 1) -> None:
+        key = stamp[:self.width]
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = len(self.keys)
+            self.keys.append(key)
+            for column in self.columns.values():
+                column.append(0)
+        self.columns[level][row] += n
+
+    def merge(self, other: "Histogram") -> None:
+        for row, key in enumerate(other.keys):
+            for lvl, column in other.columns.items():
+                if column[row]:
+                    self.add(key, lvl, column[row])
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, int]]]:
+        # Кошики за зростанням часу
+        for key in sorted(self.keys):
+            row = self.rows[key]
+            yield key, {lvl: column[row] for lvl, column in self.columns.items()}
+
+
+class SpaceSaving:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        # кількість -> елементи з такою кількістю: витіснення й оновлення за O(1)
+        self.buckets: Dict[int, Dict[str, None]] = {}
+        self.min_count = 0
+
+    def update(self, item: str, n: int = 1) -> None:
+        self.total += n
+        count = self.counts.pop(item, None)
+        if count is not None:
+            self._unlink(item, count)
+        elif len(self.counts) < self.capacity:
+            count = 0
+            self.errors[item] = 0
+        else:
+            # витісняємо елемент з найменшою кількістю; новий успадковує її як похибку
+            count = self.min_count
+            victim = next(iter(self.buckets[count]))
+            self._unlink(victim, count)
+            del self.counts[victim], self.errors[victim]
+            self.errors[item] = count
+        count += n
+        self.counts[item] = count
+        self.buckets.setdefault(count, {})[item] = None
+        if count < self.min_count:
+            self.min_count = count
+        elif self.min_count not in self.buckets:
+            # найчастіше (n=1) мінімум зростає рівно на одиницю
+            self.min_count = self.min_count + 1 if self.min_count + 1 in self.buckets else min(self.buckets)
+
+    def _unlink(self, item: str, count: int) -> None:
+        bucket = self.buckets[count]
+        del bucket[item]
+        if not bucket:
+            del self.buckets[count]
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """
+        Злиття двох скетчів: елемент, якого немає в заповненому скетчі,
+        міг мати там щонайбільше його мінімум — він додається і до оцінки,
+        і до похибки. Лишаються capacity найбільших.
+        """
+        floor = self.min_count if len(self.counts) >= self.capacity else 0
+        other_floor = other.min_count if len(other.counts) >= other.capacity else 0
+        merged = {
+            item: (
+                self.counts.get(item, floor) + other.counts.get(item, other_floor),
+                self.errors.get(item, floor) + other.errors.get(item, other_floor),
+            )
+            for item in self.counts.keys() | other.counts.keys()
+        }
+        kept = sorted(merged.items(), key=lambda kv: -kv[1][0])[:self.capacity]
+        total = self.total + other.total
+        self.__init__(self.capacity)
+        self.total = total
+        for item, (count, error) in kept:
+            self.counts[item] = count
+            self.errors[item] = error
+            self.buckets.setdefault(count, {})[item] = None
+        self.min_count = min(self.buckets) if self.buckets else 0
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        # [(елемент, оцінка кількості, похибка)]; рівні оцінки — за алфавітом
+        ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+        return [(item, count, self.errors[item]) for item, count in ranked]
+
+
+class LogStats:
+    """
+    Набір статистик одного проходу: гістограма (якщо задано кошик)
+    і скетчі найчастіших повідомлень рівнів TOP_LEVELS (якщо top > 0).
+    """
+
+    def __init__(self, levels: Sequence[str], bucket: Optional[str] = None, top: int = 0) -> None:
+        self.levels = tuple(levels)
+        self.histogram = Histogram(bucket, levels) if bucket else None
+        self.top_n = top
+        capacity = max(top * TOP_CAPACITY_FACTOR, TOP_MIN_CAPACITY)
+        self.top: Dict[str, SpaceSaving] = {lvl: SpaceSaving(capacity) for lvl in TOP_LEVELS} if top else {}
+
+    def empty_copy(self) -> "LogStats":
+        # Для процесів пулу: свіжа статистика з тими самими налаштуваннями
+        return LogStats(self.levels, self.histogram.bucket if self.histogram else None, self.top_n)
+
+    def add(self, stamp: str, level: str, message: str) -> None:
+        if self.histogram is not None:
+            self.histogram.add(stamp, level)
+        sketch = self.top.get(level)
+        if sketch is not None:
+            sketch.update(message)
+
+    def merge(self, other: "LogStats") -> None:
+        if self.histogram is not None:
+            self.histogram.merge(other.histogram)
+        for lvl, sketch in self.top.items():
+            sketch.merge(other.top[lvl])
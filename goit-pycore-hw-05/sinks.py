@@ -0,0 +1,113 @@
+"""
+Машинозчитувані формати звіту лог-аналізатора: json, ndjson, csv.
+
+Приймач (sink) отримує рядки деталей у тому вигляді, в якому їх пише
+аналізатор ("дата час - повідомлення", по одному рядку за виклик write),
+розбирає їх на поля й одразу пише записи у великий буфер виводу, нічого
+не накопичуючи. Рівень рядка — вибраний рівень аналізу; у пошуку без
+рівня рядки мають вигляд "дата час РІВЕНЬ - повідомлення". Підсумок
+(лічильники тощо) пишеться останнім окремим записом — він відомий лише
+після проходу.
+"""
+
+from __future__ import annotations
+import csv
+import json
+from abc import ABC, abstractmethod
+from typing import IO, Iterable, Optional, Sequence, Tuple
+
+FORMATS = ("text", "json", "ndjson", "csv")
+OUTPUT_BUFFER_BYTES = 1 << 20
+CSV_FIELDS = ("record", "date", "time", "level", "message", "count")
+
+
+def parse_detail(line: str, level: Optional[str], levels: Sequence[str]) -> Tuple[str, str, Optional[str], str]:
+    # (дата, час, рівень, повідомлення) з рядка деталей
+    date, timestr, rest = line.rstrip("\n").split(" ", 2)
+    tag, sep, message = rest.partition(" - ")
+    if sep and tag in levels:
+        return date, timestr, tag, message
+    return date, timestr, level, rest[2:]
+
+
+class Sink(ABC):
+    def __init__(self, out: IO[str], level: Optional[str], levels: Sequence[str]) -> None:
+        self.out = out
+        self.level = level
+        self.levels = levels
+        self.entries = 0
+
+    def write(self, line: str) -> None:
+        self.entry(*parse_detail(line, self.level, self.levels))
+        self.entries += 1
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.write(line)
+
+    @abstractmethod
+    def entry(self, date: str, timestr: str, level: Optional[str], message: str) -> None:
+        ...
+
+    @abstractmethod
+    def close(self, summary: dict) -> None:
+        ...
+
+
+class NdjsonSink(Sink):
+    # Рядок JSON на запис; останній рядок — {"type": "summary", ...}
+    def entry(self, date: str, timestr: str, level: Optional[str], message: str) -> None:
+        self.out.write(json.dumps(
+            {"type": "entry", "date": date, "time": timestr, "level": level, "message": message},
+            ensure_ascii=False,
+        ) + "\n")
+
+    def close(self, summary: dict) -> None:
+        self.out.write(json.dumps({"type": "summary", **summary}, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+
+class JsonSink(Sink):
+    # Один документ {"entries": [...], "summary": {...}}; масив пишеться потоково
+    def __init__(self, out: IO[str], level: Optional[str], levels: Sequence[str]) -> None:
+        super().__init__(out, level, levels)
+        out.write('{"entries": [')
+
+    def entry(self, date: str, timestr: str, level: Optional[str], message: str) -> None:
+        self.out.write(("\n" if not self.entries else ",\n") + json.dumps(
+            {"date": date, "time": timestr, "level": level, "message": message}, ensure_ascii=False
+        ))
+
+    def close(self, summary: dict) -> None:
+        self.out.write('\n], "summary": ' + json.dumps(summary, ensure_ascii=False) + "}\n")
+        self.out.flush()
+
+
+class CsvSink(Sink):
+    """
+    Записи — рядки record=entry; підсумок — рядки record=count (кількість
+    за рівнем) і record=matched (скільки записів виведено). Гістограма й топ
+    у CSV не потрапляють — для них є json/ndjson.
+    """
+
+    def __init__(self, out: IO[str], level: Optional[str], levels: Sequence[str]) -> None:
+        super().__init__(out, level, levels)
+        self.writer = csv.writer(out)
+        self.writer.writerow(CSV_FIELDS)
+
+    def entry(self, date: str, timestr: str, level: Optional[str], message: str) -> None:
+        self.writer.writerow(("entry", date, timestr, level or "", message, ""))
+
+    def close(self, summary: dict) -> None:
+        for lvl, n in summary["counts"].items():
+            self.writer.writerow(("count", "", "", lvl, "", n))
+        self.writer.writerow(("matched", "", "", summary["level"] or "", "", summary["matched"]))
+        self.out.flush()
+
+
+SINKS = {"json": JsonSink, "ndjson": NdjsonSink, "csv": CsvSink}
+
+
+def open_output(fileno: int) -> IO[str]:
+    # Власний великий буфер поверх stdout: без порядкового скидання в терміналі
+    return open(fileno, "w", encoding="utf-8", newline="", buffering=OUTPUT_BUFFER_BYTES, closefd=False)
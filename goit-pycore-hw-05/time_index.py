@@ -0,0 +1,190 @@
+"""
+Розріджений індекс часу для лог-файлів: позначка часу -> зсув у байтах.
+
+Кожні INDEX_STEP_BYTES байтів запам'ятовується (час, зсув, номер рядка)
+першого рядка з позначкою "YYYY-MM-DD HH:MM:SS". Індекс лежить поруч із
+логом (<log>.idx, JSON) і будується при першому запиті; якщо лог відтоді
+лише виріс — індекс дописується з місця, де зупинився, а не перебудовується.
+Підміну, обрізання чи перезапис логу на місці (відбиток проіндексованих байтів,
+див. checkpoint.fingerprint) індекс помічає і будується заново.
+Запит --since/--until бісектить індекс до потрібного шматка, тож вартість
+залежить від розміру зрізу, а не файлу. Передбачається, що час у лозі не спадає.
+"""
+
+from __future__ import annotations
+import json
+import mmap
+import os
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from checkpoint import fingerprint
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 2
+INDEX_STEP_BYTES = 256 << 10
+STAMP_RE = re.compile(rb"[0-9]{4}-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]")
+STAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# (позначка часу, зсув початку рядка, номер рядка з 1)
+Entry = Tuple[str, int, int]
+
+
+def normalize_bound(text: str, upper: bool = False) -> str:
+    """
+    Приводить межу до вигляду "YYYY-MM-DD HH:MM:SS" (порівнюється як рядок).
+    Межі включні; неповна межа покриває весь свій період: --until 2024-01-22
+    означає до 23:59:59 цього дня, --since 2024-01-22 10:30 — з 10:30:00.
+    """
+    text = text.strip().replace("T", " ")
+    for fmt, span in (
+        ("%Y-%m-%d %H:%M:%S", timedelta(0)),
+        ("%Y-%m-%d %H:%M", timedelta(minutes=1)),
+        ("%Y-%m-%d %H", timedelta(hours=1)),
+        ("%Y-%m-%d", timedelta(days=1)),
+    ):
+        try:
+            moment = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if upper and span:
+            moment += span - timedelta(seconds=1)
+        return moment.strftime(STAMP_FORMAT)
+    raise ValueError(f"Некоректна межа часу: {text} (очікується YYYY-MM-DD[ HH:MM[:SS]])")
+
+
+def line_stamp(buf: mmap.mmap, pos: int) -> Optional[str]:
+    m = STAMP_RE.match(buf, pos)
+    return m.group().decode("ascii") if m else None
+
+
+class TimeIndex:
+    def __init__(self, inode: int = 0, step: int = INDEX_STEP_BYTES) -> None:
+        self.inode = inode
+        self.step = step
+        self.entries: List[Entry] = []
+        # Проіндексовано до цього зсуву (кінець останнього повного рядка);
+        # lines — кількість рядків до нього
+        self.indexed_to = 0
+        self.lines = 0
+        # відбиток байтів до indexed_to (див. checkpoint.fingerprint)
+        self.fingerprint = ""
+
+    @classmethod
+    def for_file(cls, file_path: str, buf: mmap.mmap, step: int = INDEX_STEP_BYTES) -> "TimeIndex":
+        """
+        Завантажує індекс із <log>.idx, дописує його, якщо лог виріс,
+        або будує заново, якщо лог підмінили, обрізали чи переписали на місці.
+        """
+        inode = os.stat(file_path).st_ino
+        index = cls.load(file_path + INDEX_SUFFIX)
+        if index is None or index.inode != inode or index.step != step or index.indexed_to > len(buf) \
+                or index.fingerprint != fingerprint(buf, index.indexed_to):
+            index = cls(inode, step)
+        if index.extend(buf):
+            index.save(file_path + INDEX_SUFFIX)
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> Optional["TimeIndex"]:
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                raw = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if raw.get("version") != INDEX_VERSION:
+            return None
+        index = cls(raw["inode"], raw["step"])
+        index.indexed_to = raw["indexed_to"]
+        index.lines = raw["lines"]
+        index.fingerprint = raw["fingerprint"]
+        index.entries = [tuple(e) for e in raw["entries"]]
+        return index
+
+    def save(self, path: str) -> None:
+        # Атомарно, як знімки книги в hw08; немає прав на запис — індекс лише в пам'яті
+        raw = {
+            "version": INDEX_VERSION,
+            "inode": self.inode,
+            "step": self.step,
+            "indexed_to": self.indexed_to,
+            "lines": self.lines,
+            "fingerprint": self.fingerprint,
+            "entries": self.entries,
+        }
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(raw, fh, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def extend(self, buf: mmap.mmap) -> bool:
+        """
+        Індексує хвіст від indexed_to до останнього повного рядка.
+        Повертає True, якщо індекс змінився.
+        """
+        end = buf.rfind(b"\n") + 1
+        if end <= self.indexed_to:
+            return False
+        pos, line_no = self.indexed_to, self.lines + 1
+        next_mark = self.entries[-1][1] + self.step if self.entries else 0
+        while pos < end:
+            if pos >= next_mark:
+                stamp = line_stamp(buf, pos)
+                if stamp is not None:
+                    self.entries.append((stamp, pos, line_no))
+                    next_mark = pos + self.step
+            # наступний рядок: стрибок до позначки або просто на рядок нижче
+            target = max(next_mark, pos + 1)
+            if target >= end:
+                line_no += buf[pos:end].count(b"\n")
+                break
+            nxt = buf.find(b"\n", target - 1, end) + 1
+            line_no += buf[pos:nxt].count(b"\n")
+            pos = nxt
+        self.indexed_to = end
+        self.lines = line_no - 1
+        self.fingerprint = fingerprint(buf, end)
+        return True
+
+    def locate(self, buf: mmap.mmap, since: Optional[str], until: Optional[str]) -> Tuple[int, int, int]:
+        """
+        Повертає (start, end, номер першого рядка) — межі рядків, час яких
+        потрапляє у [since, until]. Хвіст після indexed_to (рядок без \\n)
+        переглядається напряму.
+        """
+        stamps = [e[0] for e in self.entries]
+        start, first_line = 0, 1
+        if since is not None:
+            i = bisect_left(stamps, since)
+            if i:
+                _, start, first_line = self.entries[i - 1]
+            start, first_line = self._seek(buf, start, first_line, lambda s: s >= since)
+        end = len(buf)
+        if until is not None:
+            j = bisect_right(stamps, until)
+            if j < len(self.entries):
+                end = self.entries[j][1]
+            from_pos, from_line = start, first_line
+            if j and self.entries[j - 1][1] > start:
+                _, from_pos, from_line = self.entries[j - 1]
+            end, _ = self._seek(buf, from_pos, from_line, lambda s: s > until, end)
+        return start, max(start, end), first_line
+
+    @staticmethod
+    def _seek(buf: mmap.mmap, pos: int, line_no: int, found, limit: Optional[int] = None) -> Tuple[int, int]:
+        # Перший рядок від pos, позначка якого задовольняє found; рядки без позначки пропускаються
+        limit = len(buf) if limit is None else limit
+        while pos < limit:
+            stamp = line_stamp(buf, pos)
+            if stamp is not None and found(stamp):
+                return pos, line_no
+            nl = buf.find(b"\n", pos, limit)
+            if nl == -1:
+                break
+            pos, line_no = nl + 1, line_no + 1
+        return limit, line_no
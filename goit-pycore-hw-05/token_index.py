@@ -0,0 +1,462 @@
+"""
+Інвертований індекс слів повідомлень лог-файлу: слово -> зсуви рядків.
+
+Слова — послідовності \\w у нижньому регістрі, лише з повідомлень коректних
+записів (дата, час і рівень не індексуються). Індекс лежить поруч із логом
+(<log>.tok) і будується один раз; якщо лог відтоді лише виріс — хвіст
+індексується окремим сегментом, що дописується в кінець файлу.
+
+Формат: MAGIC, далі сегменти. Сегмент — довжина заголовка, JSON-заголовок
+(яку частину логу покриває, відбиток логу, див. checkpoint.fingerprint),
+відсортований словник (слова через \\n), вирівнювання до 8 байтів, початки
+списків (uint64, на одне більше за слова) і самі списки зсувів (uint64);
+числа — little-endian. Останній сегмент зливається з попереднім, поки
+не стане помітно меншим за нього (як перенос у двійковому лічильнику);
+злитий сегмент теж дописується в кінець, а старі стають мертвими байтами.
+Коли мертвих байтів більше, ніж живих, файл переписується начисто і
+атомарно підміняється. Записані сегменти ніколи не змінюються на місці,
+тож читач, що вже змапив файл, бачить цілі дані.
+
+Слово шукається бісекцією в словнику сегмента, списки читаються через
+mmap без копіювання, а збіги видаються потоком за зростанням зсуву.
+Рядки діляться лише за \\n.
+"""
+
+from __future__ import annotations
+import heapq
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from checkpoint import fingerprint
+
+INDEX_SUFFIX = ".tok"
+INDEX_VERSION = 2
+MAGIC = b"LOGTOK\x00\x02"
+HEADER_LEN = struct.Struct("<Q")
+ITEM_BYTES = 8
+BUILD_CHUNK_BYTES = 8 << 20
+# Хвіст логу довший за це індексується кількома сегментами: пам'ять на побудову обмежена
+SEGMENT_LOG_BYTES = 256 << 20
+# Скільки значень найкоротшого списку перетинається за раз (див. intersect)
+INTERSECT_WINDOW = 4096
+TOKEN_RE = re.compile(r"\w+")
+# Альтернативи запиту: слово OR (великими літерами) або |
+OR_RE = re.compile(r"\s+OR\s+|\|")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """
+    Запит у диз'юнктивній формі: альтернативи через OR або |, слова в
+    альтернативі поєднуються через AND. "db timeout OR disk full" ->
+    [["db", "timeout"], ["disk", "full"]]. Регістр неважливий.
+    """
+    clauses = []
+    for part in OR_RE.split(query):
+        terms = sorted(set(tokenize(part)))
+        if terms:
+            clauses.append(terms)
+    if not clauses:
+        raise ValueError(f"Порожній пошуковий запит: {query!r}")
+    return clauses
+
+
+def matches(message: str, clauses: List[List[str]]) -> bool:
+    # Перевірка без індексу (стиснені й незмаплювані файли)
+    tokens = set(tokenize(message))
+    return any(all(term in tokens for term in terms) for terms in clauses)
+
+
+def intersect(lists: List[Sequence[int]]) -> Iterator[int]:
+    """
+    Спільні значення відсортованих списків, за зростанням. Найкоротший
+    перебирається вікнами по INTERSECT_WINDOW значень; з решти списків
+    бісекцією береться лише відповідний вікну відрізок, і перетин рахує
+    set на рівні C. Пам'ять — на одне вікно, а не на весь результат.
+    """
+    lists = sorted(lists, key=len)
+    first, rest = lists[0], lists[1:]
+    if not rest:
+        yield from first
+        return
+    pos = [0] * len(rest)
+    for w in range(0, len(first), INTERSECT_WINDOW):
+        window = first[w:w + INTERSECT_WINDOW]
+        common = set(window)
+        for k, other in enumerate(rest):
+            lo = bisect_left(other, window[0], pos[k])
+            hi = bisect_right(other, window[-1], lo)
+            pos[k] = hi
+            common.intersection_update(other[lo:hi])
+            if not common:
+                break
+        yield from sorted(common)
+
+
+def union(streams: List[Iterator[int]]) -> Iterator[int]:
+    # Злиття відсортованих потоків без повторів
+    if len(streams) == 1:
+        yield from streams[0]
+        return
+    last = None
+    for value in heapq.merge(*streams):
+        if value != last:
+            yield value
+            last = value
+
+
+def _pad(size: int) -> int:
+    return -size % ITEM_BYTES
+
+
+def _le_bytes(numbers: array) -> bytes:
+    if sys.byteorder == "big":
+        numbers = array("Q", numbers)
+        numbers.byteswap()
+    return numbers.tobytes()
+
+
+class Segment:
+    """
+    Сегмент індексу: слова рядків логу з [indexed_from, indexed_to).
+    Списки лежать у файлі від data_start або, якщо файл записати не
+    вдалося, в пам'яті (memory).
+    """
+
+    def __init__(self, header: dict, vocab: List[str], starts: array, start: int = 0, size: int = 0) -> None:
+        self.header = header
+        self.vocab = vocab
+        self.starts = starts
+        self.start = start  # зсув сегмента у файлі
+        self.size = size  # довжина сегмента у файлі, кратна 8
+        self.memory: Optional[Dict[str, array]] = None
+
+    @property
+    def postings(self) -> int:
+        return self.starts[-1] if self.starts else 0
+
+    @property
+    def data_start(self) -> int:
+        return self.start + self.size - self.postings * ITEM_BYTES
+
+    def term_range(self, term: str) -> Optional[range]:
+        # Номери елементів списку слова серед усіх списків сегмента
+        i = bisect_left(self.vocab, term)
+        if i == len(self.vocab) or self.vocab[i] != term:
+            return None
+        return range(self.starts[i], self.starts[i + 1])
+
+    @classmethod
+    def read(cls, fh, start: int, file_size: int) -> Optional["Segment"]:
+        # None — сегмент обірваний чи пошкоджений (решта файлу ігнорується)
+        try:
+            fh.seek(start)
+            (header_len,) = HEADER_LEN.unpack(fh.read(HEADER_LEN.size))
+            if start + HEADER_LEN.size + header_len > file_size:
+                return None
+            header = json.loads(fh.read(header_len).decode("utf-8"))
+            if header.get("version") != INDEX_VERSION:
+                return None
+            terms, vocab_bytes = header["terms"], header["vocab_bytes"]
+            head = HEADER_LEN.size + header_len + vocab_bytes
+            size = head + _pad(head) + (terms + 1 + header["postings"]) * ITEM_BYTES
+            if start + size > file_size:
+                return None
+            vocab = fh.read(vocab_bytes).decode("utf-8").split("\n") if terms else []
+            fh.seek(_pad(head), os.SEEK_CUR)
+            starts = array("Q")
+            starts.fromfile(fh, terms + 1)
+        except (OSError, ValueError, KeyError, TypeError, EOFError, struct.error):
+            return None
+        if sys.byteorder == "big":
+            starts.byteswap()
+        if len(vocab) != terms or starts[-1] != header["postings"]:
+            return None
+        return cls(header, vocab, starts, start, size)
+
+
+class TokenIndex:
+    def __init__(self, inode: int = 0) -> None:
+        self.inode = inode
+        # Проіндексовано до цього зсуву (кінець останнього повного рядка)
+        self.indexed_to = 0
+        self.fingerprint = ""
+        # Живі сегменти у порядку логу: кожен починається там, де закінчився попередній
+        self.segments: List[Segment] = []
+        self.path: Optional[str] = None  # None — індекс лише в пам'яті
+        self.writable = True  # False — запис у файл не вдався, нові сегменти в пам'яті
+        self.file_end = 0  # кінець останнього цілого сегмента у файлі
+        self.dead_bytes = 0  # байти сегментів, замінених злиттям
+        self._mm: Optional[mmap.mmap] = None
+
+    @classmethod
+    def for_file(cls, file_path: str, buf: mmap.mmap, message_of: Callable[[str], Optional[str]]) -> "TokenIndex":
+        """
+        Завантажує індекс із <log>.tok, дописує його, якщо лог виріс,
+        або будує заново, якщо лог підмінили, обрізали чи переписали на місці.
+        message_of повертає повідомлення рядка або None для некоректного рядка.
+        """
+        inode = os.stat(file_path).st_ino
+        path = file_path + INDEX_SUFFIX
+        index = cls.load(path)
+        if index is None or index.inode != inode or index.indexed_to > len(buf) \
+                or index.fingerprint != fingerprint(buf, index.indexed_to):
+            index = cls.create(path, inode)
+        index.extend(buf, message_of)
+        return index
+
+    @classmethod
+    def create(cls, path: str, inode: int) -> "TokenIndex":
+        # Порожній файл індексу (атомарно); немає прав на запис — індекс лише в пам'яті
+        index = cls(inode)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(MAGIC)
+            os.replace(tmp, path)
+        except OSError:
+            return index
+        index.path = path
+        index.file_end = len(MAGIC)
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> Optional["TokenIndex"]:
+        # Читаються заголовки і словники сегментів; списки — на вимогу через mmap
+        try:
+            fh = open(path, "rb")
+        except OSError:
+            return None
+        with fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                return None
+            file_size = os.fstat(fh.fileno()).st_size
+            index = None
+            pos = len(MAGIC)
+            while pos < file_size:
+                seg = Segment.read(fh, pos, file_size)
+                if seg is None:
+                    break
+                if index is None:
+                    index = cls(seg.header["inode"])
+                if not index._accept(seg):
+                    break
+                pos += seg.size
+        if index is None:
+            return None
+        index.path = path
+        index.file_end = pos
+        return index
+
+    def _accept(self, seg: Segment) -> bool:
+        """
+        Додає сегмент, прочитаний з файлу. Злитий сегмент замінює живі
+        сегменти, які покриває; сегмент, що не продовжує індекс, — ознака
+        пошкодження (False).
+        """
+        header = seg.header
+        if header["inode"] != self.inode or header["indexed_to"] < header["indexed_from"]:
+            return False
+        replaced = []
+        while self.segments and self.segments[-1].header["indexed_from"] >= header["indexed_from"]:
+            replaced.append(self.segments.pop())
+        start = self.segments[-1].header["indexed_to"] if self.segments else 0
+        if start != header["indexed_from"] or header["indexed_to"] < self.indexed_to:
+            return False
+        self.dead_bytes += sum(old.size for old in replaced)
+        self.segments.append(seg)
+        self.indexed_to = header["indexed_to"]
+        self.fingerprint = header["fingerprint"]
+        return True
+
+    # ---- читання ----
+
+    def _mapped(self) -> mmap.mmap:
+        if self._mm is None or len(self._mm) < self.file_end:
+            with open(self.path, "rb") as fh:
+                self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def _numbers(self, seg: Segment, items: range) -> Sequence[int]:
+        # Частина списків сегмента: вигляд на mmap без копіювання (на big-endian — копія)
+        if seg.memory is not None:
+            raise ValueError("сегмент у пам'яті не має файлових списків")
+        start = seg.data_start + items.start * ITEM_BYTES
+        view = memoryview(self._mapped())[start:start + len(items) * ITEM_BYTES]
+        if sys.byteorder == "little":
+            return view.cast("Q")
+        numbers = array("Q")
+        numbers.frombytes(view)
+        numbers.byteswap()
+        return numbers
+
+    def postings_for(self, seg: Segment, term: str) -> Sequence[int]:
+        if seg.memory is not None:
+            return seg.memory.get(term, ())
+        items = seg.term_range(term)
+        return self._numbers(seg, items) if items is not None else ()
+
+    def lookup(self, clauses: List[List[str]]) -> Iterator[int]:
+        """
+        Зсуви рядків, що задовольняють запит, потоком за зростанням.
+        Сегменти покривають лог по порядку; у сегменті для кожної
+        альтернативи перетинаються списки, альтернативи зливаються.
+        """
+        for seg in self.segments:
+            streams = []
+            for terms in clauses:
+                lists = [self.postings_for(seg, term) for term in terms]
+                if all(lists):
+                    streams.append(intersect(lists))
+            yield from union(streams)
+
+    # ---- дописування ----
+
+    def extend(self, buf: mmap.mmap, message_of: Callable[[str], Optional[str]]) -> bool:
+        """
+        Індексує повні рядки від indexed_to новими сегментами (не більше
+        SEGMENT_LOG_BYTES логу кожен). Повертає True, якщо індекс змінився.
+        """
+        end = buf.rfind(b"\n") + 1
+        if end <= self.indexed_to:
+            return False
+        pos = self.indexed_to
+        while pos < end:
+            stop = buf.find(b"\n", min(pos + SEGMENT_LOG_BYTES, end) - 1, end) + 1
+            self._add_segment(pos, stop, fingerprint(buf, stop), self._build(buf, pos, stop, message_of))
+            pos = stop
+        return True
+
+    @staticmethod
+    def _build(buf: mmap.mmap, pos: int, end: int, message_of: Callable[[str], Optional[str]]) -> Dict[str, array]:
+        postings: Dict[str, array] = defaultdict(lambda: array("Q"))
+        while pos < end:
+            stop = buf.rfind(b"\n", pos, min(pos + BUILD_CHUNK_BYTES, end)) + 1 or buf.find(b"\n", pos, end) + 1
+            offset = pos
+            for raw in buf[pos:stop - 1].split(b"\n"):
+                message = message_of(raw.decode("utf-8", "replace"))
+                if message is not None:
+                    for term in set(tokenize(message)):
+                        postings[term].append(offset)
+                offset += len(raw) + 1
+            pos = stop
+        return postings
+
+    def _add_segment(self, start: int, end: int, stamp: str, postings: Dict[str, array]) -> None:
+        header = {
+            "version": INDEX_VERSION,
+            "inode": self.inode,
+            "indexed_from": start,
+            "indexed_to": end,
+            "fingerprint": stamp,
+        }
+        vocab = sorted(postings)
+        if self.path is not None and self.writable:
+            starts = array("Q", [0])
+            for term in vocab:
+                starts.append(starts[-1] + len(postings[term]))
+
+            def write_postings(fh) -> None:
+                for term in vocab:
+                    fh.write(_le_bytes(postings[term]))
+
+            try:
+                seg = self._write(header, vocab, starts, write_postings)
+            except OSError:
+                self.writable = False
+            else:
+                self.segments.append(seg)
+                self.indexed_to, self.fingerprint = end, stamp
+                self._merge_tail()
+                return
+        seg = Segment(header, vocab, array("Q"))
+        seg.memory = dict(postings)
+        self.segments.append(seg)
+        self.indexed_to, self.fingerprint = end, stamp
+
+    def _write(self, header: dict, vocab: List[str], starts: array, write_postings: Callable) -> Segment:
+        """
+        Дописує сегмент у кінець файлу (після останнього цілого сегмента;
+        обірваний хвіст попереднього запису перезаписується).
+        """
+        blob = "\n".join(vocab).encode("utf-8")
+        header = dict(header, terms=len(vocab), vocab_bytes=len(blob), postings=starts[-1])
+        raw_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        head = HEADER_LEN.size + len(raw_header) + len(blob)
+        with open(self.path, "r+b") as fh:
+            fh.seek(self.file_end)
+            fh.write(HEADER_LEN.pack(len(raw_header)))
+            fh.write(raw_header)
+            fh.write(blob)
+            fh.write(b"\0" * _pad(head))
+            fh.write(_le_bytes(starts))
+            write_postings(fh)
+            size = fh.tell() - self.file_end
+            fh.truncate()
+        seg = Segment(header, vocab, starts, self.file_end, size)
+        self.file_end += size
+        return seg
+
+    def _merge_tail(self) -> None:
+        # Як перенос у двійковому лічильнику: останній сегмент зливається з
+        # попереднім, поки не стане помітно меншим за нього — сегментів O(log n)
+        while len(self.segments) >= 2 and self.segments[-1].postings * 2 >= self.segments[-2].postings:
+            older, newer = self.segments[-2], self.segments[-1]
+            merged = self._merge(older, newer)
+            self.dead_bytes += older.size + newer.size
+            self.segments[-2:] = [merged]
+        if self.dead_bytes > self.file_end - len(MAGIC) - self.dead_bytes:
+            self._compact()
+
+    def _merge(self, older: Segment, newer: Segment) -> Segment:
+        # Злиття словників; списки копіюються з mmap потоком, у порядку словника
+        vocab = sorted(set(older.vocab).union(newer.vocab))
+        ranges = []
+        starts = array("Q", [0])
+        for term in vocab:
+            pair = (older.term_range(term), newer.term_range(term))
+            ranges.append(pair)
+            starts.append(starts[-1] + sum(len(r) for r in pair if r is not None))
+        header = dict(newer.header, indexed_from=older.header["indexed_from"])
+        view = memoryview(self._mapped())
+
+        def write_postings(fh) -> None:
+            for pair in ranges:
+                for seg, items in zip((older, newer), pair):
+                    if items is not None:
+                        start = seg.data_start + items.start * ITEM_BYTES
+                        fh.write(view[start:start + len(items) * ITEM_BYTES])
+
+        return self._write(header, vocab, starts, write_postings)
+
+    def _compact(self) -> None:
+        # Переписує живі сегменти у новий файл і атомарно підміняє старий
+        view = memoryview(self._mapped())
+        tmp = self.path + ".tmp"
+        starts = []
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(MAGIC)
+                for seg in self.segments:
+                    starts.append(fh.tell())
+                    fh.write(view[seg.start:seg.start + seg.size])
+                file_end = fh.tell()
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+        for seg, start in zip(self.segments, starts):
+            seg.start = start
+        self.file_end = file_end
+        self.dead_bytes = 0
+        self._mm = None
@@ -1,6 +1,8 @@
 from collections import UserDict
 from typing import List, Optional
 
+from search_index import NameIndex
+
 
 class Field:
     def __init__(self, value):
@@ -61,17 +63,30 @@ class Record:
 
         
 class AddressBook(UserDict):
+    # Індекс пошуку за іменем; будується при першому search і далі підтримується.
+    _name_index: Optional[NameIndex] = None
+
     def add_record(self, record: Record):
         key = record.name.value
         if key in self.data:
             raise ValueError(f"Record with name '{key}' already exists.")
         self.data[key] = record
+        if self._name_index is not None:
+            self._name_index.add(key)
 
     def find(self, name: str):
         return self.data.get(name)
 
+    def search(self, query: str, limit: int = 10) -> List[Record]:
+        # Префіксний + нечіткий пошук за іменем (див. search_index.py)
+        if self._name_index is None:
+            self._name_index = NameIndex(iter(self.data))
+        return [self.data[name] for name in self._name_index.search(query.strip(), limit)]
+
     def delete(self, name: str):
         if name in self.data:
             del self.data[name]
+            if self._name_index is not None:
+                self._name_index.remove(name)
             return True
         return False
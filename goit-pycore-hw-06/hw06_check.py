@@ -31,5 +31,9 @@ print(john)  # Contact name: John, phones: 1112223333; 5555555555
 found_phone = john.find_phone("5555555555")
 print(f"{john.name}: {found_phone}")  # 5555555555
 
+# Пошук за початком імені та з одруківкою
+print([rec.name.value for rec in book.search("ja")])  # ['Jane']
+print([rec.name.value for rec in book.search("Johm")])  # ['John']
+
 # Видалення запису Jane
 book.delete("Jane")
@@ -1,9 +1,11 @@
 
 from collections import UserDict
-from typing import List, Optional, Callable, Dict, Tuple
+from typing import List, Optional, Callable, Dict, Iterator, Tuple
 from datetime import datetime, date, timedelta
 import calendar
 
+from search_index import NameIndex
+
 
 class Field:
     def __init__(self, value):
@@ -49,10 +51,17 @@ class Record:
         self.name = Name(name)
         self.phones = []
         self.birthday = None
+        # книга-власник: їй запис повідомляє про свої зміни (індекси номерів і ДН)
+        self._book = None
+
+    def _notify(self, op: str, *args: str) -> None:
+        if self._book is not None:
+            self._book._record_changed(self, op, *args)
 
     def add_phone(self, phone: str) -> Phone:
         p = Phone(phone)
         self.phones.append(p)
+        self._notify("add_phone", p.value)
         return p
 
     def remove_phone(self, phone: str) -> bool:
@@ -60,6 +69,7 @@ class Record:
         for i, p in enumerate(self.phones):
             if p.value == phone:
                 del self.phones[i]
+                self._notify("remove_phone", phone)
                 return True
         return False
 
@@ -67,7 +77,8 @@ class Record:
         # Замінює перший збіг old_phone на new_phone; True якщо успішно.
         for p in self.phones:
             if p.value == old_phone:
-                p.value = new_phone  # пройде валідацію Phone
+                p.value = Phone(new_phone).value  # пройде валідацію Phone
+                self._notify("edit_phone", old_phone, new_phone)
                 return True
         return False
 
@@ -79,64 +90,155 @@ class Record:
 
     def add_birthday(self, birthday_str: str) -> None:
         self.birthday = Birthday(birthday_str)
+        self._notify("add_birthday")
 
     def __str__(self):
         return f"Contact name: {self.name.value}, phones: {'; '.join(p.value for p in self.phones)}"
 
         
 class AddressBook(UserDict):
+    # Індекс пошуку за іменем; будується при першому search і далі підтримується.
+    _name_index: Optional[NameIndex] = None
+
+    def __init__(self, *args, **kwargs):
+        # Зворотний індекс телефон -> імена власників (ім'я повторюється,
+        # якщо номер записано в контакт кілька разів)
+        self._phone_index: Dict[str, List[str]] = {}
+        # Календар ДН: 366 кошиків за днем року (див. day_of_year) та
+        # ім'я -> кошик, щоб знайти старий кошик при зміні дати
+        self._birthday_buckets: List[set] = [set() for _ in range(366)]
+        self._birthday_doy: Dict[str, int] = {}
+        super().__init__(*args, **kwargs)
+
+    def _index_phone(self, name: str, phone: str) -> None:
+        self._phone_index.setdefault(phone, []).append(name)
+
+    def _unindex_phone(self, name: str, phone: str) -> None:
+        owners = self._phone_index.get(phone)
+        if owners and name in owners:
+            owners.remove(name)
+            if not owners:
+                del self._phone_index[phone]
+
+    def _index_birthday(self, name: str, birthday: Optional[Birthday]) -> None:
+        self._unindex_birthday(name)
+        if birthday:
+            doy = day_of_year(birthday.value)
+            self._birthday_buckets[doy - 1].add(name)
+            self._birthday_doy[name] = doy
+
+    def _unindex_birthday(self, name: str) -> None:
+        doy = self._birthday_doy.pop(name, None)
+        if doy is not None:
+            self._birthday_buckets[doy - 1].discard(name)
+
+    def _record_changed(self, record: Record, op: str, *args: str) -> None:
+        name = record.name.value
+        if op == "add_phone":
+            self._index_phone(name, args[0])
+        elif op == "remove_phone":
+            self._unindex_phone(name, args[0])
+        elif op == "edit_phone":
+            self._unindex_phone(name, args[0])
+            self._index_phone(name, args[1])
+        elif op == "add_birthday":
+            self._index_birthday(name, record.birthday)
+
     def add_record(self, record: Record):
         key = record.name.value
         if key in self.data:
             raise ValueError(f"Record with name '{key}' already exists.")
         self.data[key] = record
+        record._book = self
+        for p in record.phones:
+            self._index_phone(key, p.value)
+        self._index_birthday(key, record.birthday)
+        if self._name_index is not None:
+            self._name_index.add(key)
 
     def find(self, name: str):
         return self.data.get(name)
 
+    def search(self, query: str, limit: int = 10) -> List[Record]:
+        # Префіксний + нечіткий пошук за іменем (див. search_index.py).
+        # Індекс будується з імен книги лише при першому пошуку.
+        if self._name_index is None:
+            self._name_index = NameIndex(iter(self.data))
+        return [self.data[name] for name in self._name_index.search(query.strip(), limit)]
+
+    def find_by_phone(self, phone: str) -> List[Record]:
+        # Хто власник номера? O(1) за індексом замість перебору всіх записів
+        owners = self._phone_index.get(phone.strip(), ())
+        return [self.data[name] for name in dict.fromkeys(owners)]
+
     def delete(self, name: str):
         if name in self.data:
-            del self.data[name]
+            record = self.data.pop(name)
+            record._book = None
+            for p in record.phones:
+                self._unindex_phone(name, p.value)
+            self._unindex_birthday(name)
+            if self._name_index is not None:
+                self._name_index.remove(name)
             return True
         return False
 
-    def get_upcoming_birthdays(self, today: Optional[date] = None) -> Dict[str, List[str]]:
-        #Повертає словник {weekday_name: [names, ...]} для ДН у найближчі 7 днів.
+    def get_upcoming_birthdays(self, today: Optional[date] = None, days: int = 7) -> Dict[str, List[str]]:
+        #Повертає словник {weekday_name: [names, ...]} для ДН у найближчі `days` днів.
         #Якщо ДН припадає на вихідні (сб/нд), переносимо вітання на понеділок.
 
         if today is None:
             today = date.today()
+        if days < 0:
+            raise ValueError("Number of days must be non-negative.")
 
-        # межа вікна 7 днів (без урахування минулих)
-        window_end = today + timedelta(days=7)
         result: Dict[str, List[str]] = {}
 
-        for rec in self.data.values():
-            if not rec.birthday:
-                continue
-            bday = rec.birthday.value
-
-            # наступний ДН у поточному або наступному році
-            candidate = bday.replace(year=today.year)
-            if candidate < today:
-                candidate = bday.replace(year=today.year + 1)
-
-            # у вікні 7 днів?
-            if today <= candidate <= window_end:
-                wd = candidate.weekday()  # 0=Mon ... 6=Sun
-                # якщо субота/неділя — переносимо на понеділок
-                if wd in (5, 6):
-                    # знайти понеділок
-                    days_to_monday = (7 - wd) % 7
-                    candidate = candidate + timedelta(days=days_to_monday)
-                weekday_name = calendar.day_name[candidate.weekday()]
-                result.setdefault(weekday_name, []).append(rec.name.value)
+        for name, candidate in self._birthdays_in_window(today, days):
+            wd = candidate.weekday()  # 0=Mon ... 6=Sun
+            # якщо субота/неділя — переносимо на понеділок
+            if wd in (5, 6):
+                # знайти понеділок
+                days_to_monday = (7 - wd) % 7
+                candidate = candidate + timedelta(days=days_to_monday)
+            weekday_name = calendar.day_name[candidate.weekday()]
+            result.setdefault(weekday_name, []).append(name)
 
         # сортуємо імена для стабільного виводу
         for k in result:
             result[k].sort(key=str.casefold)
         return result
-    
+
+    def _birthdays_in_window(self, today: date, days: int) -> Iterator[Tuple[str, date]]:
+        # Пари (ім'я, дата ДН) для ДН у вікні today..today+days включно.
+        # Торкаємося лише кошиків днів вікна; кожен кошик — не більше разу,
+        # щоб у вікні > року ДН не дублювались.
+        seen = set()
+        for offset in range(min(days, 366) + 1):
+            d = today + timedelta(days=offset)
+            for doy in birthday_doys_on(d):
+                if doy in seen:
+                    continue
+                seen.add(doy)
+                for name in self._birthday_buckets[doy - 1]:
+                    yield name, d
+
+
+def day_of_year(d: date) -> int:
+    # Номер дня у високосному календарі (1..366): 29 лютого має власний день
+    return date(2000, d.month, d.day).timetuple().tm_yday
+
+
+FEB_29_DOY = 60
+
+
+def birthday_doys_on(d: date) -> Tuple[int, ...]:
+    # Чиї ДН святкуються в день d: у невисокосний рік 28 лютого — ще й 29 лютого
+    doy = day_of_year(d)
+    if d.month == 2 and d.day == 28 and not calendar.isleap(d.year):
+        return doy, FEB_29_DOY
+    return (doy,)
+
 
 def parse_input(user_input: str) -> Tuple[str, List[str]]:
     parts = user_input.strip().split()
@@ -162,6 +264,10 @@ def input_error(func: Callable) -> Callable:
                 return "Give me name, old phone and new phone please."
             if fname in {"show_phone", "show_birthday", "add_birthday"}:
                 return "Enter user name."
+            if fname == "find_phone":
+                return "Enter phone number."
+            if fname == "search_contacts":
+                return "Enter search query."
             return "Not enough arguments."
         except ValueError as e:
             return str(e) if str(e) else "Wrong input. Try again."
@@ -202,6 +308,31 @@ def show_phone(args: List[str], book: AddressBook) -> str:
     return f"{name}: {phones}"
 
 
+@input_error
+def find_phone(args: List[str], book: AddressBook) -> str:
+    phone, *_ = args
+    owners = book.find_by_phone(phone)
+    if not owners:
+        return "No contact with this phone."
+    return "\n".join(str(rec) for rec in owners)
+
+
+@input_error
+def search_contacts(args: List[str], book: AddressBook) -> str:
+    # search <query> [limit]
+    query, *rest = args
+    limit = 10
+    if rest:
+        try:
+            limit = int(rest[0])
+        except ValueError:
+            raise ValueError("Limit must be an integer.")
+    found = book.search(query, limit)
+    if not found:
+        return "No matching contacts."
+    return "\n".join(str(rec) for rec in found)
+
+
 @input_error
 def show_all(_: List[str], book: AddressBook) -> str:
     if not book.data:
@@ -237,10 +368,15 @@ def show_birthday(args: List[str], book: AddressBook) -> str:
 
 
 @input_error
-def birthdays(_: List[str], book: AddressBook) -> str:
-    upcoming = book.get_upcoming_birthdays()
+def birthdays(args: List[str], book: AddressBook) -> str:
+    # Необов'язковий аргумент — довжина вікна у днях (типово 7)
+    try:
+        days = int(args[0]) if args else 7
+    except ValueError:
+        raise ValueError("Number of days must be an integer.")
+    upcoming = book.get_upcoming_birthdays(days=days)
     if not upcoming:
-        return "No birthdays in the next 7 days."
+        return f"No birthdays in the next {days} days."
     # Гарний формат: день тижня: імена, через кому
     order = list(calendar.day_name)  # Monday..Sunday
     parts = []
@@ -271,6 +407,10 @@ def main():
             print(change_contact(args, book))
         elif command == "phone":
             print(show_phone(args, book))
+        elif command == "find-phone":
+            print(find_phone(args, book))
+        elif command == "search":
+            print(search_contacts(args, book))
         elif command == "all":
             print(show_all(args, book))
         elif command == "add-birthday":
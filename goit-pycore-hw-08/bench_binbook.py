@@ -0,0 +1,96 @@
+"""
+Порівняння завантаження книги: pickle (addressbook.pkl) проти бінарного .nvb (mmap).
+
+    python bench_binbook.py [--records 1000000] [--dir /tmp]
+
+Кожне завантаження виконується в окремому процесі, щоб чесно виміряти
+час і піковий RSS саме цього формату.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import date
+
+import hw08
+
+
+def generate_book(n: int, seed: int = 42) -> hw08.AddressBook:
+    rnd = random.Random(seed)
+    book = hw08.AddressBook()
+    first = date(1950, 1, 1).toordinal()
+    for i in range(n):
+        rec = hw08.Record(f"user{i:07d}")
+        for _ in range(rnd.randint(1, 3)):
+            rec.add_phone(f"{rnd.randrange(10**10):010d}")
+        if rnd.random() < 0.7:
+            rec.birthday = hw08.Birthday(date.fromordinal(first + rnd.randrange(20000)))
+        book.add_record(rec)
+    return book
+
+
+def peak_rss_kb() -> int:
+    # VmHWM скидається при exec, а ru_maxrss на Linux успадковується від батька
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(fmt: str, path: str) -> None:
+    # Виконується у підпроцесі: завантажити, торкнутися одного запису, звітувати
+    start = time.perf_counter()
+    book = hw08.load_data(path)
+    loaded = time.perf_counter() - start
+    start = time.perf_counter()
+    rec = book.find("user0000123")
+    lookup = time.perf_counter() - start
+    assert rec is not None and rec.phones
+    rss_kb = peak_rss_kb()
+    print(f"{fmt} {loaded:.6f} {lookup:.6f} {rss_kb}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pickle vs .nvb load time and RSS.")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--dir", default=".")
+    parser.add_argument("--child", nargs=2, metavar=("FORMAT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    pkl = os.path.join(args.dir, "bench_book.pkl")
+    nvb = os.path.join(args.dir, "bench_book.nvb")
+    print(f"Generating {args.records} records...")
+    book = generate_book(args.records)
+    hw08.save_data(book, pkl)
+    hw08.save_data(book, nvb)
+    del book
+    print(f"{'format':<8} {'size MB':>9} {'load s':>9} {'find s':>9} {'max RSS MB':>11}")
+    for fmt, path in (("pickle", pkl), ("nvb", nvb)):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", fmt, path],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"{fmt:<8} {size_mb:>9.1f} {float(out[1]):>9.3f} {float(out[2]):>9.6f} "
+              f"{int(out[3]) / 1024:>11.1f}")
+    for path in (pkl, nvb):
+        os.remove(path)
+        if os.path.exists(path + hw08.JOURNAL_SUFFIX):
+            os.remove(path + hw08.JOURNAL_SUFFIX)
+
+
+if __name__ == "__main__":
+    main()
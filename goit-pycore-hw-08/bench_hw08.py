@@ -0,0 +1,173 @@
+"""
+Бенчмарк операцій адресної книги hw08 на синтетичних даних.
+
+    python bench_hw08.py [--sizes 1000 10000 100000] [--backend dict|compact|sqlite|nvb]
+                         [--output bench_results.json] [--no-memory]
+
+Для кожного розміру книги та операції (add_record, find, get_upcoming_birthdays,
+show_all, save_data, load_data) записує пропускну здатність, p50/p99 затримки
+та піковий приріст пам'яті (tracemalloc, окремим проходом). Результат —
+JSON-файл для порівняння з наступними оптимізаціями.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, List
+
+import hw08
+
+
+BACKENDS = {
+    # backend -> (розширення файлу книги, фабрика порожньої книги)
+    "dict": (".pkl", lambda path: hw08.AddressBook()),
+    "compact": (".pkl", lambda path: hw08.CompactAddressBook()),
+    "sqlite": (".db", lambda path: hw08.SqliteAddressBook(path)),
+    "nvb": (".nvb", lambda path: hw08.BinaryAddressBook(path)),
+}
+
+FIRST_BIRTHDAY = date(1950, 1, 1).toordinal()
+
+
+def generate_contacts(n: int, seed: int = 42) -> Iterator[hw08.ContactRow]:
+    # Відтворювані контакти: 1-3 телефони, у 70% — день народження
+    rnd = random.Random(seed)
+    for i in range(n):
+        phones = [f"{rnd.randrange(10**10):010d}" for _ in range(rnd.randint(1, 3))]
+        bday = FIRST_BIRTHDAY + rnd.randrange(20000) if rnd.random() < 0.7 else None
+        yield f"user{i:08d}", phones, bday
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(q * (len(sorted_samples) - 1) + 0.5))]
+
+
+def timed(calls: List[Callable[[], object]]) -> Dict[str, float]:
+    # Кожен виклик — окремий зразок затримки
+    samples = []
+    perf = time.perf_counter
+    start = perf()
+    for call in calls:
+        t = perf()
+        call()
+        samples.append(perf() - t)
+    total = perf() - start
+    samples.sort()
+    return {
+        "count": len(samples),
+        "total_s": total,
+        "ops_per_s": len(samples) / total if total else 0.0,
+        "p50_us": percentile(samples, 0.50) * 1e6,
+        "p99_us": percentile(samples, 0.99) * 1e6,
+    }
+
+
+def peak_memory(calls: List[Callable[[], object]]) -> int:
+    # Піковий приріст виділеної Python-пам'яті під час серії викликів
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    for call in calls:
+        call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - base
+
+
+def bench_size(n: int, backend: str, workdir: str, seed: int, memory: bool) -> List[dict]:
+    suffix, factory = BACKENDS[backend]
+    rnd = random.Random(seed + 1)
+    rows = list(generate_contacts(n, seed))
+    results = []
+
+    def run(op: str, make_calls: Callable[[], List[Callable[[], object]]]) -> None:
+        stats = timed(make_calls())
+        if memory:
+            stats["peak_mem_bytes"] = peak_memory(make_calls())
+        stats.update(size=n, op=op)
+        results.append(stats)
+        print(f"{n:>10} {op:<24} {stats['ops_per_s']:>14.1f} {stats['p50_us']:>12.2f} "
+              f"{stats['p99_us']:>12.2f} {stats.get('peak_mem_bytes', 0) / 2**20:>10.1f}")
+
+    books = []
+
+    def add_calls():
+        # Нова порожня книга на кожен прохід: вимірюємо наповнення з нуля
+        path = os.path.join(workdir, f"add{len(books)}{suffix}")
+        book = factory(path)
+        books.append(book)
+        return [lambda row=row: book.add_record(hw08.record_from_row(row, None)) for row in rows]
+
+    run("add_record", add_calls)
+    book = books[0]
+    for extra in books[1:]:
+        extra.close()
+
+    names = [rows[rnd.randrange(n)][0] for _ in range(min(n, 10000))]
+    run("find", lambda: [lambda name=name: book.find(name) for name in names])
+
+    days = [date(2024, 1, 1) + timedelta(days=rnd.randrange(366)) for _ in range(200)]
+    run("get_upcoming_birthdays", lambda: [lambda d=d: book.get_upcoming_birthdays(d) for d in days])
+
+    reps = 3 if n <= 10**5 else 1
+    run("show_all", lambda: [lambda: hw08.show_all([], book)] * reps)
+
+    path = os.path.join(workdir, f"book{suffix}")
+    run("save_data", lambda: [lambda: hw08.save_data(book, path)] * reps)
+
+    def load_once():
+        loaded = hw08.load_data(path)
+        loaded.close()
+
+    run("load_data", lambda: [load_once] * reps)
+    book.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark hw08 address book operations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Розміри книги (до 10^7)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="dict")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Не вимірювати пам'ять (tracemalloc помітно сповільнює прогін)")
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'operation':<24} {'ops/s':>14} {'p50 us':>12} {'p99 us':>12} {'peak MB':>10}")
+    results = []
+    for n in args.sizes:
+        workdir = tempfile.mkdtemp(prefix="bench_hw08_")
+        try:
+            results.extend(bench_size(n, args.backend, workdir, args.seed, not args.no_memory))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Компактний бінарний формат адресної книги (*.nvb) з ледачим читанням через mmap.
+
+Розкладка файлу (little-endian, кожна секція вирівняна на 8 байтів):
+    header         magic "NVAB", version, count, phone_count, journal_seq
+    name_offsets   u32[count + 1]  — межі імен у таблиці рядків
+    name_order     u32[count]      — індекси записів, відсортовані за іменем (для bisect)
+    phone_offsets  u32[count + 1]  — межі телефонів запису у масиві phones
+    birthdays      i32[count]      — date.toordinal(), 0 = ДН не задано
+    birthday_doys  u16[count]      — день року у високосному календарі, 0 = немає
+    phones         u64[phone_count] — 10-значні номери як цілі числа
+    names          bytes           — UTF-8 імена підряд
+
+Читач нічого не розпаковує наперед: масиви — це memoryview над mmap,
+а запис декодується лише при зверненні до нього.
+Модуль оперує простими значеннями: (name, [phones...], ordinal або None).
+"""
+
+from __future__ import annotations
+import mmap
+import struct
+import sys
+from array import array
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+MAGIC = b"NVAB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQ")  # magic, version, reserved, count, phone_count, journal_seq
+PHONE_DIGITS = 10
+
+ContactRow = Tuple[str, List[str], Optional[int]]
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _doy(ordinal: int) -> int:
+    d = date.fromordinal(ordinal)
+    return date(2000, d.month, d.day).timetuple().tm_yday
+
+
+def _section_sizes(count: int, phone_count: int) -> List[Tuple[str, int, int]]:
+    # (typecode, кількість елементів, розмір елемента) у порядку розміщення
+    return [
+        ("I", count + 1, 4),
+        ("I", count, 4),
+        ("I", count + 1, 4),
+        ("i", count, 4),
+        ("H", count, 2),
+        ("Q", phone_count, 8),
+    ]
+
+
+def write_book(path: str, rows: Iterable[ContactRow], journal_seq: int = 0) -> int:
+    """
+    Записує рядки книги у файл формату .nvb; повертає кількість записів.
+    Порядок записів зберігається (як у dict книги).
+    """
+    name_offsets = array("I", [0])
+    phone_offsets = array("I", [0])
+    birthdays = array("i")
+    doys = array("H")
+    phones = array("Q")
+    blobs: List[bytes] = []
+    pos = 0
+    for name, phone_list, ordinal in rows:
+        raw = name.encode("utf-8")
+        blobs.append(raw)
+        pos += len(raw)
+        name_offsets.append(pos)
+        phones.extend(int(p) for p in phone_list)
+        phone_offsets.append(len(phones))
+        birthdays.append(ordinal or 0)
+        doys.append(_doy(ordinal) if ordinal else 0)
+
+    count = len(blobs)
+    # порівняння байтів UTF-8 — той самий порядок, що й у читача при bisect
+    name_order = array("I", sorted(range(count), key=blobs.__getitem__))
+
+    sections = [name_offsets, name_order, phone_offsets, birthdays, doys, phones]
+    if sys.byteorder != "little":
+        for arr in sections:
+            arr.byteswap()
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, count, len(phones), journal_seq))
+        offset = HEADER.size
+        for arr in sections:
+            pad = _align(offset) - offset
+            f.write(b"\0" * pad)
+            f.write(arr.tobytes())
+            offset += pad + len(arr) * arr.itemsize
+        f.write(b"\0" * (_align(offset) - offset))
+        for raw in blobs:
+            f.write(raw)
+    return count
+
+
+class BinaryBook:
+    """
+    Read-only доступ до файлу .nvb. Відкриття — O(1): лише mmap і memoryview.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fh = open(path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, phone_count, journal_seq = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an address book file")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported format version {version}")
+        self.count = count
+        self.journal_seq = journal_seq
+
+        buf = memoryview(self._mm)
+        cols = []
+        offset = HEADER.size
+        for typecode, n, size in _section_sizes(count, phone_count):
+            offset = _align(offset)
+            chunk = buf[offset:offset + n * size]
+            if sys.byteorder == "little":
+                cols.append(chunk.cast(typecode))
+            else:
+                # big-endian: без копії не обійтися
+                arr = array(typecode, chunk.tobytes())
+                arr.byteswap()
+                cols.append(arr)
+            offset += n * size
+        (self.name_offsets, self.name_order, self.phone_offsets,
+         self.birthdays, self.birthday_doys, self.phones) = cols
+        self.names = buf[_align(offset):]
+        self._phone_index: Optional[Dict[int, List[int]]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _name_bytes(self, i: int) -> bytes:
+        return bytes(self.names[self.name_offsets[i]:self.name_offsets[i + 1]])
+
+    def name(self, i: int) -> str:
+        return self._name_bytes(i).decode("utf-8")
+
+    def index(self, name: str) -> int:
+        # Бінарний пошук по відсортованій перестановці; -1 якщо імені немає
+        key = name.encode("utf-8")
+        order = self.name_order
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name_bytes(order[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._name_bytes(order[lo]) == key:
+            return order[lo]
+        return -1
+
+    def row(self, i: int) -> ContactRow:
+        start, end = self.phone_offsets[i], self.phone_offsets[i + 1]
+        phones = [f"{self.phones[j]:0{PHONE_DIGITS}d}" for j in range(start, end)]
+        ordinal = self.birthdays[i]
+        return self.name(i), phones, ordinal or None
+
+    def rows(self) -> Iterator[ContactRow]:
+        for i in range(self.count):
+            yield self.row(i)
+
+    def indices_by_phone(self, phone: str) -> List[int]:
+        # Зворотний індекс номер -> записи будується один раз, при першому запиті
+        if len(phone) != PHONE_DIGITS or not phone.isdigit():
+            return []
+        if self._phone_index is None:
+            index: Dict[int, List[int]] = {}
+            offsets, phones = self.phone_offsets, self.phones
+            for i in range(self.count):
+                for j in range(offsets[i], offsets[i + 1]):
+                    index.setdefault(phones[j], []).append(i)
+            self._phone_index = index
+        return self._phone_index.get(int(phone), [])
+
+    def indices_by_birthday_doy(self, doys: Iterable[int]) -> List[int]:
+        # Сканує лише колонку u16, не декодуючи жодного імені
+        wanted = set(doys)
+        return [i for i, d in enumerate(self.birthday_doys) if d in wanted]
+
+    def close(self) -> None:
+        for col in (self.name_offsets, self.name_order, self.phone_offsets,
+                    self.birthdays, self.birthday_doys, self.phones, self.names):
+            if isinstance(col, memoryview):
+                col.release()
+        self._mm.close()
+        self._fh.close()
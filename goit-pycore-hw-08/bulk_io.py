@@ -0,0 +1,160 @@
+"""
+Потоковий імпорт/експорт контактів у CSV та JSON Lines.
+
+Формат рядка:
+    CSV   — name,phones,birthday   (телефони через ';', ДН як DD.MM.YYYY або порожньо)
+    JSONL — {"name": ..., "phones": [...], "birthday": "DD.MM.YYYY" | null}
+Файл читається пачками; кожна пачка перевіряється в пулі процесів функцією
+validate(name, phones, birthday) -> ContactRow, яку передає книга (hw08.py).
+У роботі одночасно не більше кількох пачок, тож пам'ять не залежить від
+розміру файлу. Некоректні рядки не зупиняють імпорт, а повертаються як відмови.
+"""
+
+from __future__ import annotations
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+# (name, [phones...], birthday ordinal або None) — як у binbook/sqlite_store
+ContactRow = Tuple[str, List[str], Optional[int]]
+# (номер рядка у файлі, name, [phones...], birthday-рядок або None);
+# name=None позначає рядок, який не вдалося розібрати — тоді в останньому полі причина
+RawRow = Tuple[int, Optional[str], List[str], Optional[str]]
+# (номер рядка, причина відмови)
+Rejection = Tuple[int, str]
+# (номер рядка, перевірений рядок) — номер потрібен для відмов, знайдених уже книгою
+Numbered = Tuple[int, ContactRow]
+Validator = Callable[[str, List[str], Optional[str]], ContactRow]
+
+BATCH_SIZE = 20000
+CSV_FIELDS = ("name", "phones", "birthday")
+JSONL_SUFFIXES = (".jsonl", ".ndjson", ".json")
+
+
+def detect_format(path: str) -> str:
+    if path.lower().endswith(JSONL_SUFFIXES):
+        return "jsonl"
+    if path.lower().endswith(".csv"):
+        return "csv"
+    raise ValueError("Unsupported file type. Use .csv or .jsonl")
+
+
+def read_raw_rows(path: str) -> Iterator[RawRow]:
+    fmt = detect_format(path)
+    with open(path, "r", encoding="utf-8", newline="") as fh:
+        if fmt == "csv":
+            reader = csv.reader(fh)
+            for row in reader:
+                line_no = reader.line_num
+                if not row or row == list(CSV_FIELDS):
+                    continue  # порожній рядок або заголовок
+                row += [""] * (3 - len(row))
+                name, phones, birthday = row[0], row[1], row[2]
+                yield line_no, name, [p for p in phones.split(";") if p.strip()], birthday or None
+        else:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    yield line_no, None, [], "Invalid JSON line."
+                    continue
+                yield (line_no, *json_fields(obj))
+
+
+def json_fields(obj: object) -> Tuple[Optional[str], List[str], Optional[str]]:
+    # (name, phones, birthday) з об'єкта JSONL; name=None — рядок відхилено, причина в останньому полі
+    if not isinstance(obj, dict):
+        return None, [], "Invalid JSON line."
+    name, phones, birthday = obj.get("name"), obj.get("phones"), obj.get("birthday")
+    if name is None:
+        return None, [], "name is required."
+    if not isinstance(name, str):
+        return None, [], "name must be a string."
+    if phones is None:
+        phones = []
+    if not isinstance(phones, list) or not all(isinstance(p, str) for p in phones):
+        return None, [], "phones must be a list of strings."
+    if birthday is not None and not isinstance(birthday, str):
+        return None, [], "birthday must be a string or null."
+    return name, phones, birthday
+
+
+def validate_batch(validate: Validator, batch: List[RawRow]) -> Tuple[List[Numbered], List[Rejection]]:
+    # Виконується у процесі пулу
+    valid: List[Numbered] = []
+    rejected: List[Rejection] = []
+    for line_no, name, phones, birthday in batch:
+        if name is None:
+            rejected.append((line_no, birthday))
+            continue
+        try:
+            valid.append((line_no, validate(name, phones, birthday)))
+        except ValueError as e:
+            rejected.append((line_no, str(e) or "Wrong input."))
+    return valid, rejected
+
+
+def _batches(rows: Iterable[RawRow], size: int) -> Iterator[List[RawRow]]:
+    batch: List[RawRow] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validated_batches(
+    path: str,
+    validate: Validator,
+    workers: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[Tuple[List[Numbered], List[Rejection]]]:
+    """
+    Повертає пачки (коректні рядки з номерами, відмови) у порядку файлу.
+    workers=0/1 — перевірка в поточному процесі (без пулу).
+    """
+    batches = _batches(read_raw_rows(path), batch_size)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for batch in batches:
+            yield validate_batch(validate, batch)
+        return
+
+    # Обмежене вікно: не більше 2*workers пачок у польоті (а не весь файл, як у Pool.imap)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for batch in batches:
+            pending.append(pool.submit(validate_batch, validate, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_rows(path: str, rows: Iterable[ContactRow], format_birthday: Callable[[int], str]) -> int:
+    # Потоковий експорт: пишемо рядок за рядком через буфер файлу
+    fmt = detect_format(path)
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="", buffering=1 << 20) as fh:
+        if fmt == "csv":
+            writer = csv.writer(fh)
+            writer.writerow(CSV_FIELDS)
+            for name, phones, ordinal in rows:
+                writer.writerow((name, ";".join(phones), format_birthday(ordinal) if ordinal else ""))
+                count += 1
+        else:
+            for name, phones, ordinal in rows:
+                obj = {"name": name, "phones": phones,
+                       "birthday": format_birthday(ordinal) if ordinal else None}
+                fh.write(json.dumps(obj, ensure_ascii=False) + "\n")
+                count += 1
+    return count
@@ -1,25 +1,61 @@
 
 from collections import UserDict
-from typing import List, Optional, Callable, Dict, Tuple
+from collections.abc import MutableMapping
+from typing import Any, List, Optional, Callable, Dict, Iterable, Iterator, Tuple
 from datetime import datetime, date, timedelta
+from array import array
+from bisect import bisect_left, bisect_right
+import argparse
 import calendar
+import contextlib
+import os
 import pickle
+import sys
+import weakref
+
+from binbook import BinaryBook, ContactRow, write_book
+import bulk_io
+from journal import Journal
+from search_index import NameIndex
+from sqlite_store import SqliteStore
 
 
 class Field:
+    # __slots__ замість __dict__: поле — це лише одне значення
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
     def __str__(self):
         return str(self.value)
 
+    @classmethod
+    def trusted(cls, value):
+        # Поле з уже перевіреного значення (сховище, імпорт) — без повторної перевірки
+        field = cls.__new__(cls)
+        field.value = value
+        return field
+
+    def __getstate__(self):
+        return {"value": self.value}
+
+    def __setstate__(self, state):
+        # Старі знімки містять __dict__ ({'value': ...} або {'_value': ...})
+        for key, val in state.items():
+            setattr(self, key, val)
+
 class Name(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         if value == '':
             raise ValueError("Name must be a non-empty string.")
         self.value = value.strip()
 
 class Phone(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         digits = value.strip()
         if not digits.isdigit() or len(digits) != 10:
@@ -29,6 +65,8 @@ class Phone(Field):
 
 class Birthday(Field):
     #Зберігає дату народження як datetime.date (формат вводу DD.MM.YYYY).
+    __slots__ = ("_value",)
+
     @property
     def value(self) -> date:
         return self._value
@@ -46,14 +84,33 @@ class Birthday(Field):
 
 
 class Record:
+    # _book — книга-власник: їй запис повідомляє про свої зміни (журнал, індекси).
+    # __weakref__ потрібен ледачим книгам, що кешують записи у WeakValueDictionary.
+    __slots__ = ("name", "phones", "birthday", "_book", "__weakref__")
+
     def __init__(self, name):
         self.name = Name(name)
         self.phones = []
         self.birthday = None
+        self._book = None
+
+    def __getstate__(self):
+        # Посилання на книгу не серіалізуємо — книга відновлює його сама
+        return {"name": self.name, "phones": self.phones, "birthday": self.birthday}
+
+    def __setstate__(self, state):
+        self._book = None
+        for key, val in state.items():
+            setattr(self, key, val)
+
+    def _notify(self, op: str, *args: str) -> None:
+        if self._book is not None:
+            self._book._record_changed(self, op, *args)
 
     def add_phone(self, phone: str) -> Phone:
         p = Phone(phone)
         self.phones.append(p)
+        self._notify("add_phone", p.value)
         return p
 
     def remove_phone(self, phone: str) -> bool:
@@ -61,6 +118,7 @@ class Record:
         for i, p in enumerate(self.phones):
             if p.value == phone:
                 del self.phones[i]
+                self._notify("remove_phone", phone)
                 return True
         return False
 
@@ -68,7 +126,8 @@ class Record:
         # Замінює перший збіг old_phone на new_phone; True якщо успішно.
         for p in self.phones:
             if p.value == old_phone:
-                p.value = new_phone  # пройде валідацію Phone
+                p.value = Phone(new_phone).value  # пройде валідацію Phone
+                self._notify("edit_phone", old_phone, new_phone)
                 return True
         return False
 
@@ -80,64 +139,836 @@ class Record:
 
     def add_birthday(self, birthday_str: str) -> None:
         self.birthday = Birthday(birthday_str)
+        self._notify("add_birthday", self.birthday.value.strftime("%d.%m.%Y"))
 
     def __str__(self):
         return f"Contact name: {self.name.value}, phones: {'; '.join(p.value for p in self.phones)}"
 
         
 class AddressBook(UserDict):
+    # Журнал змін (див. journal.py); None — книга живе лише в пам'яті.
+    journal: Optional[Journal] = None
+    # Номер останнього запису журналу, що вже увійшов у знімок книги.
+    journal_seq = 0
+    # Індекс пошуку за іменем; будується при першому search і далі підтримується.
+    _name_index: Optional[NameIndex] = None
+
+    def __init__(self, *args, **kwargs):
+        # Зворотний індекс телефон -> імена власників (ім'я повторюється,
+        # якщо номер записано в контакт кілька разів). None — книга шукає сама.
+        self._phone_index: Optional[Dict[str, List[str]]] = {}
+        # Календар ДН: 366 кошиків за днем року (див. day_of_year) та
+        # ім'я -> кошик, щоб знайти старий кошик при зміні дати. None — як вище.
+        self._birthday_buckets: Optional[List[set]] = [set() for _ in range(366)]
+        self._birthday_doy: Dict[str, int] = {}
+        super().__init__(*args, **kwargs)
+
+    def __getstate__(self):
+        # У знімок йдуть лише дані; відкритий файл журналу не серіалізується,
+        # індекси перебудовуються при завантаженні
+        return {"data": self.data, "journal_seq": self.journal_seq}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._phone_index = {}
+        self._birthday_buckets = [set() for _ in range(366)]
+        self._birthday_doy = {}
+        for rec in self.data.values():
+            rec._book = self
+            self._index_phones(rec.name.value, rec.phones)
+            self._index_birthday(rec.name.value, rec.birthday)
+
+    def _index_phone(self, name: str, phone: str) -> None:
+        if self._phone_index is not None:
+            self._phone_index.setdefault(phone, []).append(name)
+
+    def _unindex_phone(self, name: str, phone: str) -> None:
+        if self._phone_index is None:
+            return
+        owners = self._phone_index.get(phone)
+        if owners and name in owners:
+            owners.remove(name)
+            if not owners:
+                del self._phone_index[phone]
+
+    def _index_phones(self, name: str, phones: List[Phone]) -> None:
+        for p in phones:
+            self._index_phone(name, p.value)
+
+    def _index_birthday(self, name: str, birthday: Optional[Birthday]) -> None:
+        if self._birthday_buckets is None:
+            return
+        self._unindex_birthday(name)
+        if birthday:
+            doy = day_of_year(birthday.value)
+            self._birthday_buckets[doy - 1].add(name)
+            self._birthday_doy[name] = doy
+
+    def _unindex_birthday(self, name: str) -> None:
+        doy = self._birthday_doy.pop(name, None)
+        if doy is not None:
+            self._birthday_buckets[doy - 1].discard(name)
+
+    def _log(self, op: str, *args: str) -> None:
+        if self.journal is not None:
+            self.journal_seq = self.journal.append(op, list(args))
+
+    def _record_changed(self, record: Record, op: str, *args: str) -> None:
+        name = record.name.value
+        if op == "add_phone":
+            self._index_phone(name, args[0])
+        elif op == "remove_phone":
+            self._unindex_phone(name, args[0])
+        elif op == "edit_phone":
+            self._unindex_phone(name, args[0])
+            self._index_phone(name, args[1])
+        elif op == "add_birthday":
+            self._index_birthday(name, record.birthday)
+        if self.journal is not None:
+            self._log(op, name, *args)
+
     def add_record(self, record: Record):
         key = record.name.value
         if key in self.data:
             raise ValueError(f"Record with name '{key}' already exists.")
         self.data[key] = record
+        record._book = self
+        self._index_phones(key, record.phones)
+        self._index_birthday(key, record.birthday)
+        if self._name_index is not None:
+            self._name_index.add(key)
+        # Запис може прийти вже з телефонами/ДН — журналюємо його повністю
+        # (без журналу аргументи навіть не форматуємо: імпорт, пакетний режим)
+        if self.journal is not None:
+            self._log("add_record", key)
+            for p in record.phones:
+                self._log("add_phone", key, p.value)
+            if record.birthday:
+                self._log("add_birthday", key, record.birthday.value.strftime("%d.%m.%Y"))
+
+    def insert_row(self, row: ContactRow) -> None:
+        # Додає вже перевірений рядок (імпорт); ледачі книги пишуть його у сховище напряму
+        self.add_record(record_from_row(row, None))
 
     def find(self, name: str):
         return self.data.get(name)
 
+    def search(self, query: str, limit: int = 10) -> List[Record]:
+        # Префіксний + нечіткий пошук за іменем (див. search_index.py).
+        # Індекс будується з імен книги лише при першому пошуку.
+        if self._name_index is None:
+            self._name_index = NameIndex(iter(self.data))
+        return [self.data[name] for name in self._name_index.search(query.strip(), limit)]
+
+    def find_by_phone(self, phone: str) -> List[Record]:
+        # Хто власник номера? O(1) за індексом замість перебору всіх записів
+        owners = self._phone_index.get(phone.strip(), ())
+        return [self.data[name] for name in dict.fromkeys(owners)]
+
     def delete(self, name: str):
         if name in self.data:
-            del self.data[name]
+            record = self.data.pop(name)
+            record._book = None
+            for p in record.phones:
+                self._unindex_phone(name, p.value)
+            if self._birthday_buckets is not None:
+                self._unindex_birthday(name)
+            if self._name_index is not None:
+                self._name_index.remove(name)
+            if self.journal is not None:
+                self._log("delete", name)
             return True
         return False
 
-    def get_upcoming_birthdays(self, today: Optional[date] = None) -> Dict[str, List[str]]:
-        #Повертає словник {weekday_name: [names, ...]} для ДН у найближчі 7 днів.
+    def get_upcoming_birthdays(self, today: Optional[date] = None, days: int = 7) -> Dict[str, List[str]]:
+        #Повертає словник {weekday_name: [names, ...]} для ДН у найближчі `days` днів.
         #Якщо ДН припадає на вихідні (сб/нд), переносимо вітання на понеділок.
 
         if today is None:
             today = date.today()
+        if days < 0:
+            raise ValueError("Number of days must be non-negative.")
 
-        # межа вікна 7 днів (без урахування минулих)
-        window_end = today + timedelta(days=7)
         result: Dict[str, List[str]] = {}
 
-        for rec in self.data.values():
-            if not rec.birthday:
-                continue
-            bday = rec.birthday.value
-
-            # наступний ДН у поточному або наступному році
-            candidate = bday.replace(year=today.year)
-            if candidate < today:
-                candidate = bday.replace(year=today.year + 1)
-
-            # у вікні 7 днів?
-            if today <= candidate <= window_end:
-                wd = candidate.weekday()  # 0=Mon ... 6=Sun
-                # якщо субота/неділя — переносимо на понеділок
-                if wd in (5, 6):
-                    # знайти понеділок
-                    days_to_monday = (7 - wd) % 7
-                    candidate = candidate + timedelta(days=days_to_monday)
-                weekday_name = calendar.day_name[candidate.weekday()]
-                result.setdefault(weekday_name, []).append(rec.name.value)
+        for name, candidate in self._birthdays_in_window(today, days):
+            wd = candidate.weekday()  # 0=Mon ... 6=Sun
+            # якщо субота/неділя — переносимо на понеділок
+            if wd in (5, 6):
+                # знайти понеділок
+                days_to_monday = (7 - wd) % 7
+                candidate = candidate + timedelta(days=days_to_monday)
+            weekday_name = calendar.day_name[candidate.weekday()]
+            result.setdefault(weekday_name, []).append(name)
 
         # сортуємо імена для стабільного виводу
         for k in result:
             result[k].sort(key=str.casefold)
         return result
-    
+
+    def _birthdays_in_window(self, today: date, days: int) -> Iterator[Tuple[str, date]]:
+        # Пари (ім'я, дата ДН) для ДН у вікні today..today+days включно.
+        if self._birthday_buckets is None:
+            # ледачі книги: перевіряємо кандидатів, яких знайшло їхнє сховище
+            window_end = today + timedelta(days=days)
+            for rec in self._birthday_candidates(today, window_end):
+                if not rec.birthday:
+                    continue
+                candidate = next_birthday(rec.birthday.value, today)
+                if candidate <= window_end:
+                    yield rec.name.value, candidate
+            return
+
+        # Календарний індекс: торкаємося лише кошиків днів вікна.
+        # Кожен кошик — не більше разу, щоб у вікні > року ДН не дублювались.
+        seen = set()
+        for offset in range(min(days, 366) + 1):
+            d = today + timedelta(days=offset)
+            for doy in birthday_doys_on(d):
+                if doy in seen:
+                    continue
+                seen.add(doy)
+                for name in self._birthday_buckets[doy - 1]:
+                    yield name, d
+
+    def _birthday_candidates(self, today: date, window_end: date) -> Iterable[Record]:
+        # Записи, серед яких шукаємо ДН у вікні; базова книга — перебирає всі
+        return self.data.values()
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+
+
+def day_of_year(d: date) -> int:
+    # Номер дня у високосному календарі (1..366): 29 лютого має власний день
+    return date(2000, d.month, d.day).timetuple().tm_yday
+
+
+FEB_29_DOY = 60
+
+
+def birthday_doys_on(d: date) -> Tuple[int, ...]:
+    # Чиї ДН святкуються в день d: у невисокосний рік 28 лютого — ще й 29 лютого
+    doy = day_of_year(d)
+    if d.month == 2 and d.day == 28 and not calendar.isleap(d.year):
+        return doy, FEB_29_DOY
+    return (doy,)
+
+
+def window_doys(today: date, days: int) -> set:
+    return {doy for i in range(min(days, 366) + 1)
+            for doy in birthday_doys_on(today + timedelta(days=i))}
+
+
+def next_birthday(bday: date, today: date) -> date:
+    # Найближчий ДН, не раніше today; 29 лютого у невисокосний рік — 28 лютого
+    for year in (today.year, today.year + 1):
+        try:
+            candidate = bday.replace(year=year)
+        except ValueError:
+            candidate = date(year, 2, 28)
+        if candidate >= today:
+            return candidate
+    return candidate
+
+
+def record_from_row(row: ContactRow, book: AddressBook) -> Record:
+    # Будує Record з простих значень сховища напряму, без _notify і без повторної
+    # перевірки полів: дані вже збережені (або пройшли validate_contact)
+    name, phones, bday = row
+    rec = Record.__new__(Record)
+    rec.name = Name.trusted(name)
+    rec.phones = [Phone.trusted(p) for p in phones]
+    rec.birthday = Birthday.trusted(date.fromordinal(bday)) if bday is not None else None
+    rec._book = book
+    return rec
+
+
+def record_to_row(rec: Record) -> ContactRow:
+    bday = rec.birthday.value.toordinal() if rec.birthday else None
+    return rec.name.value, [p.value for p in rec.phones], bday
+
+
+def validate_contact(name: str, phones: List[str], birthday: Optional[str]) -> ContactRow:
+    # Перевірка рядка імпорту тими самими правилами, що й у Name/Phone/Birthday
+    bday = Birthday(birthday).value.toordinal() if birthday else None
+    return Name(name).value, [Phone(p).value for p in phones], bday
+
+
+def book_rows(book: AddressBook) -> Iterator[ContactRow]:
+    # Усі записи книги як прості значення; ледачі книги не будують Record зайвий раз
+    rows = getattr(book.data, "rows", None)
+    if rows is not None:
+        return rows()
+    return (record_to_row(rec) for rec in book.data.values())
+
+
+class SqliteRecords(MutableMapping):
+    """
+    Відображення name -> Record поверх SqliteStore.
+    Record створюється лише при зверненні до конкретного імені; поки на нього
+    є посилання, повертається той самий об'єкт (WeakValueDictionary).
+    """
+
+    def __init__(self, store: SqliteStore, book: "SqliteAddressBook") -> None:
+        self.store = store
+        self.book = book
+        self._live: "weakref.WeakValueDictionary[str, Record]" = weakref.WeakValueDictionary()
+
+    def _materialize(self, name: str) -> Optional[Record]:
+        rec = self._live.get(name)
+        if rec is not None:
+            return rec
+        row = self.store.get(name)
+        if row is None:
+            return None
+        rec = record_from_row(row, self.book)
+        self._live[name] = rec
+        return rec
+
+    def __getitem__(self, name: str) -> Record:
+        rec = self._materialize(name)
+        if rec is None:
+            raise KeyError(name)
+        return rec
+
+    def get(self, name, default=None):
+        rec = self._materialize(name)
+        return default if rec is None else rec
+
+    def __contains__(self, name) -> bool:
+        return name in self._live or self.store.contains(name)
+
+    def __setitem__(self, name: str, rec: Record) -> None:
+        self.store.add(name)
+        for p in rec.phones:
+            self.store.add_phone(name, p.value)
+        if rec.birthday:
+            bday = rec.birthday.value
+            self.store.set_birthday(name, bday.toordinal(), day_of_year(bday))
+        self._live[name] = rec
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self.store.delete(name)
+        self._live.pop(name, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.store.names()
+
+    def __len__(self) -> int:
+        return self.store.count()
+
+    def rows(self) -> Iterator[ContactRow]:
+        return self.store.rows()
+
+
+class SqliteAddressBook(AddressBook):
+    """
+    Книга, що тримає записи у файлі SQLite замість пам'яті.
+    Відкриття не залежить від кількості контактів; Record будується лише для
+    find/phone/birthdays, а зміни записів одразу пишуться в базу.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        # телефони і дні року індексує сама база (phones_by_phone, contacts_by_doy)
+        self._phone_index = None
+        self._birthday_buckets = None
+        self.store = SqliteStore(path)
+        self.data = SqliteRecords(self.store, self)
+
+    def _record_changed(self, record: Record, op: str, *args: str) -> None:
+        name = record.name.value
+        if op == "add_phone":
+            self.store.add_phone(name, *args)
+        elif op == "remove_phone":
+            self.store.remove_phone(name, *args)
+        elif op == "edit_phone":
+            self.store.edit_phone(name, *args)
+        elif op == "add_birthday":
+            bday = record.birthday.value
+            self.store.set_birthday(name, bday.toordinal(), day_of_year(bday))
+
+    def insert_row(self, row: ContactRow) -> None:
+        self.store.insert_row(*row)
+        if self._name_index is not None:
+            self._name_index.add(row[0])
+
+    def find_by_phone(self, phone: str) -> List[Record]:
+        return [self.data[name] for name in self.store.names_by_phone(phone.strip())]
+
+    def _birthday_candidates(self, today: date, window_end: date) -> Iterable[Record]:
+        # Індекс по дню року: матеріалізуємо лише іменинників вікна
+        doys = window_doys(today, (window_end - today).days)
+        return [self.data[name] for name in self.store.names_by_birthday_doy(doys)]
+
+    def close(self) -> None:
+        self.store.close()
+
+
+class BinaryRecords(MutableMapping):
+    """
+    Відображення name -> Record поверх незмінного файлу .nvb (BinaryBook).
+    Запис декодується з mmap лише при зверненні; змінені та нові записи
+    живуть у пам'яті (changed), видалені з файлу — у множині deleted.
+    """
+
+    def __init__(self, base: BinaryBook, book: "BinaryAddressBook") -> None:
+        self.base = base
+        self.book = book
+        self.changed: Dict[str, Record] = {}
+        self.new_names: Dict[str, None] = {}  # впорядкована множина доданих імен
+        self.deleted: set = set()
+        self._live: "weakref.WeakValueDictionary[str, Record]" = weakref.WeakValueDictionary()
+
+    def _materialize(self, name: str) -> Optional[Record]:
+        rec = self.changed.get(name) or self._live.get(name)
+        if rec is not None:
+            return rec
+        if name in self.deleted:
+            return None
+        i = self.base.index(name)
+        if i < 0:
+            return None
+        rec = record_from_row(self.base.row(i), self.book)
+        self._live[name] = rec
+        return rec
+
+    def __getitem__(self, name: str) -> Record:
+        rec = self._materialize(name)
+        if rec is None:
+            raise KeyError(name)
+        return rec
+
+    def get(self, name, default=None):
+        rec = self._materialize(name)
+        return default if rec is None else rec
+
+    def __contains__(self, name) -> bool:
+        return self._materialize(name) is not None
+
+    def __setitem__(self, name: str, rec: Record) -> None:
+        if name in self.deleted:
+            self.deleted.discard(name)
+        elif self.base.index(name) < 0:
+            self.new_names[name] = None
+        self.changed[name] = rec
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self.changed.pop(name, None)
+        self._live.pop(name, None)
+        if name in self.new_names:
+            del self.new_names[name]
+        else:
+            self.deleted.add(name)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self.base)):
+            name = self.base.name(i)
+            if name not in self.deleted:
+                yield name
+        yield from self.new_names
+
+    def __len__(self) -> int:
+        return len(self.base) - len(self.deleted) + len(self.new_names)
+
+    def rows(self) -> Iterator[ContactRow]:
+        # Незмінені записи йдуть прямо з файлу, без побудови Record
+        for i in range(len(self.base)):
+            name = self.base.name(i)
+            if name in self.deleted:
+                continue
+            rec = self.changed.get(name)
+            yield record_to_row(rec) if rec is not None else self.base.row(i)
+        for name in self.new_names:
+            yield record_to_row(self.changed[name])
+
+
+class BinaryAddressBook(AddressBook):
+    """
+    Книга поверх файлу .nvb: відкриття майже без копіювання (mmap),
+    зміни — у пам'яті та в журналі, доки save_data не запише новий файл.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        # Індекс телефонів файлу будує BinaryBook при першому запиті,
+        # дні народження фільтруються по колонці birthday_doys
+        self._phone_index = None
+        self._birthday_buckets = None
+        if not os.path.exists(path):
+            write_book(path, [])
+        self.path = path
+        base = BinaryBook(path)
+        self.journal_seq = base.journal_seq
+        self.data = BinaryRecords(base, self)
+
+    def _record_changed(self, record: Record, op: str, *args: str) -> None:
+        self.data.changed[record.name.value] = record
+        super()._record_changed(record, op, *args)
+
+    def find_by_phone(self, phone: str) -> List[Record]:
+        phone = phone.strip()
+        data = self.data
+        names = []
+        for i in data.base.indices_by_phone(phone):
+            name = data.base.name(i)
+            if name not in data.deleted and name not in data.changed:
+                names.append(name)
+        names.extend(name for name, rec in data.changed.items() if rec.find_phone(phone))
+        return [data[name] for name in dict.fromkeys(names)]
+
+    def _birthday_candidates(self, today: date, window_end: date) -> Iterable[Record]:
+        # Фільтр по колонці днів року у файлі + усі змінені в пам'яті записи
+        doys = window_doys(today, (window_end - today).days)
+        data = self.data
+        result = []
+        for i in data.base.indices_by_birthday_doy(doys):
+            name = data.base.name(i)
+            if name not in data.deleted and name not in data.changed:
+                result.append(data[name])
+        result.extend(data.changed.values())
+        return result
+
+    def reopen(self) -> None:
+        # Після запису нового файлу: скидаємо накопичені зміни і мапимо файл заново
+        self.data.base.close()
+        self.data = BinaryRecords(BinaryBook(self.path), self)
+
+    def close(self) -> None:
+        super().close()
+        self.data.base.close()
+
+
+# Індекс номерів компактної книги перебудовується, коли змін після побудови
+# більше за PHONE_DELTA_MIN і за 1/2**PHONE_DELTA_SHIFT його розміру:
+# вартість перебудови розподіляється на пропорційну кількість змін
+PHONE_DELTA_MIN = 1024
+PHONE_DELTA_SHIFT = 4
+
+
+class CompactRecords(MutableMapping):
+    """
+    Колонкове сховище name -> Record для мільйонів контактів в одному процесі.
+    Кожен контакт — рядок (row) у масивах: ДН як ordinal у array('i'),
+    телефони як цілі у array('Q'), зв'язані у список через array('q').
+    Record — лише тонке представлення: будується при зверненні, а його зміни
+    книга переносить у колонки (CompactAddressBook._record_changed).
+    """
+
+    def __init__(self, book: "CompactAddressBook") -> None:
+        self.book = book
+        self.row_of: Dict[str, int] = {}        # ім'я -> рядок (порядок додавання)
+        self.birthdays = array("i")             # рядок -> ordinal, 0 — ДН немає
+        self.phone_head = array("q")            # рядок -> перший слот телефону, -1 — немає
+        self.phone_vals = array("Q")            # слот -> номер як ціле
+        self.phone_next = array("q")            # слот -> наступний слот, -1 — кінець
+        self._free_slot = -1                    # список звільнених слотів (через phone_next)
+        self._init_indexes()
+
+    def __getstate__(self):
+        # Індекси та кеш не зберігаємо: вони відновлюються з колонок
+        return {
+            "row_of": self.row_of,
+            "birthdays": self.birthdays,
+            "phone_head": self.phone_head,
+            "phone_vals": self.phone_vals,
+            "phone_next": self.phone_next,
+            "_free_slot": self._free_slot,
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.book = None  # під'єднує CompactAddressBook.__setstate__
+        self._init_indexes()
+
+    def _init_indexes(self) -> None:
+        self._live: "weakref.WeakValueDictionary[str, Record]" = weakref.WeakValueDictionary()
+        self.names: List[Optional[str]] = [None] * len(self.birthdays)
+        self._free_rows = []
+        # Індекс номерів: відсортовані номери і паралельний масив їхніх рядків
+        # (пошук — bisect). Будується при першому пошуку за номером; None — ще ні
+        # або застарів. Зміни після побудови — у невідсортованій дельті та
+        # лічильнику видалених пар (номер, рядок), доки їх не забагато.
+        self._phone_keys: Optional[array] = None
+        self._phone_rows: Optional[array] = None
+        self._phone_delta_keys = array("Q")
+        self._phone_delta_rows = array("I")
+        self._phone_removed: Dict[Tuple[int, int], int] = {}
+        self._phone_removed_count = 0
+        # день року -> рядки з ДН у цей день
+        self._by_doy = [array("I") for _ in range(366)]
+        for name, row in self.row_of.items():
+            self.names[row] = name
+            if self.birthdays[row]:
+                self._by_doy[day_of_year(date.fromordinal(self.birthdays[row])) - 1].append(row)
+        self._free_rows = [row for row, name in enumerate(self.names) if name is None]
+
+    # ---- телефони ----
+
+    def _slots(self, row: int) -> Iterator[int]:
+        slot = self.phone_head[row]
+        while slot != -1:
+            yield slot
+            slot = self.phone_next[slot]
+
+    def _build_phone_index(self) -> None:
+        pairs = sorted(
+            (self.phone_vals[slot], row)
+            for row in self.row_of.values() for slot in self._slots(row)
+        )
+        self._phone_keys = array("Q", [value for value, _ in pairs])
+        self._phone_rows = array("I", [row for _, row in pairs])
+        self._phone_delta_keys = array("Q")
+        self._phone_delta_rows = array("I")
+        self._phone_removed = {}
+        self._phone_removed_count = 0
+
+    def _phone_index_stale(self) -> bool:
+        # Зміни після побудови накопичилися — дешевше перебудувати індекс із колонок
+        changes = len(self._phone_delta_keys) + self._phone_removed_count
+        return changes > max(PHONE_DELTA_MIN, len(self._phone_keys) >> PHONE_DELTA_SHIFT)
+
+    def _delta_positions(self, value: int) -> Iterator[int]:
+        keys = self._phone_delta_keys
+        i = -1
+        while True:
+            try:
+                i = keys.index(value, i + 1)
+            except ValueError:
+                return
+            yield i
+
+    def _index_phone(self, value: int, row: int) -> None:
+        # Новий номер — у невідсортовану дельту: вставка в середину масивів коштувала б O(n)
+        if self._phone_keys is None:
+            return
+        self._phone_delta_keys.append(value)
+        self._phone_delta_rows.append(row)
+        if self._phone_index_stale():
+            self._phone_keys = self._phone_rows = None
+
+    def _unindex_phone(self, value: int, row: int) -> None:
+        # Номер з дельти видаляється одразу, з відсортованих масивів — позначкою
+        if self._phone_keys is None:
+            return
+        for i in self._delta_positions(value):
+            if self._phone_delta_rows[i] == row:
+                del self._phone_delta_keys[i]
+                del self._phone_delta_rows[i]
+                return
+        key = (value, row)
+        self._phone_removed[key] = self._phone_removed.get(key, 0) + 1
+        self._phone_removed_count += 1
+        if self._phone_index_stale():
+            self._phone_keys = self._phone_rows = None
+
+    def add_phone(self, row: int, phone: str) -> None:
+        value = int(phone)
+        slot = self._free_slot
+        if slot == -1:
+            slot = len(self.phone_vals)
+            self.phone_vals.append(value)
+            self.phone_next.append(-1)
+        else:
+            self._free_slot = self.phone_next[slot]
+            self.phone_vals[slot] = value
+            self.phone_next[slot] = -1
+        # дописуємо в кінець списку, щоб зберегти порядок телефонів
+        last = -1
+        for last in self._slots(row):
+            pass
+        if last == -1:
+            self.phone_head[row] = slot
+        else:
+            self.phone_next[last] = slot
+        self._index_phone(value, row)
+
+    def _find_slot(self, row: int, value: int) -> Tuple[int, int]:
+        # (попередній слот, слот) першого збігу; (-1, -1) якщо немає
+        prev = -1
+        for slot in self._slots(row):
+            if self.phone_vals[slot] == value:
+                return prev, slot
+            prev = slot
+        return -1, -1
+
+    def remove_phone(self, row: int, phone: str) -> None:
+        value = int(phone)
+        prev, slot = self._find_slot(row, value)
+        if slot == -1:
+            return
+        if prev == -1:
+            self.phone_head[row] = self.phone_next[slot]
+        else:
+            self.phone_next[prev] = self.phone_next[slot]
+        self.phone_next[slot] = self._free_slot
+        self._free_slot = slot
+        self._unindex_phone(value, row)
+
+    def edit_phone(self, row: int, old_phone: str, new_phone: str) -> None:
+        old, new = int(old_phone), int(new_phone)
+        _, slot = self._find_slot(row, old)
+        if slot != -1:
+            self.phone_vals[slot] = new
+            self._unindex_phone(old, row)
+            self._index_phone(new, row)
+
+    def names_by_phone(self, phone: str) -> List[str]:
+        if len(phone) != 10 or not phone.isdigit():
+            return []
+        if self._phone_keys is None:
+            self._build_phone_index()
+        value = int(phone)
+        lo = bisect_left(self._phone_keys, value)
+        hi = bisect_right(self._phone_keys, value, lo)
+        # рядок -> скільки разів у ньому цей номер (з дельтою і без видалених)
+        counts: Dict[int, int] = {}
+        for row in self._phone_rows[lo:hi]:
+            counts[row] = counts.get(row, 0) + 1
+        for i in self._delta_positions(value):
+            row = self._phone_delta_rows[i]
+            counts[row] = counts.get(row, 0) + 1
+        if self._phone_removed:
+            for row in counts:
+                counts[row] -= self._phone_removed.get((value, row), 0)
+        return [self.names[row] for row in sorted(counts) if counts[row] > 0]
+
+    # ---- дні народження ----
+
+    def set_birthday(self, row: int, ordinal: int) -> None:
+        old = self.birthdays[row]
+        if old:
+            self._by_doy[day_of_year(date.fromordinal(old)) - 1].remove(row)
+        self.birthdays[row] = ordinal
+        if ordinal:
+            self._by_doy[day_of_year(date.fromordinal(ordinal)) - 1].append(row)
+
+    def names_by_birthday_doy(self, doys: Iterable[int]) -> List[str]:
+        return [self.names[row] for doy in doys for row in self._by_doy[doy - 1]]
+
+    # ---- рядки ----
+
+    def insert_row(self, name: str, phones: List[str], ordinal: Optional[int]) -> int:
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self.names[row] = name
+        else:
+            row = len(self.birthdays)
+            self.names.append(name)
+            self.birthdays.append(0)
+            self.phone_head.append(-1)
+        self.row_of[name] = row
+        for phone in phones:
+            self.add_phone(row, phone)
+        self.set_birthday(row, ordinal or 0)
+        return row
+
+    def row_values(self, row: int) -> ContactRow:
+        phones = [f"{self.phone_vals[slot]:010d}" for slot in self._slots(row)]
+        return self.names[row], phones, self.birthdays[row] or None
+
+    def rows(self) -> Iterator[ContactRow]:
+        for row in self.row_of.values():
+            yield self.row_values(row)
+
+    # ---- MutableMapping ----
+
+    def __getitem__(self, name: str) -> Record:
+        rec = self._live.get(name)
+        if rec is None:
+            rec = record_from_row(self.row_values(self.row_of[name]), self.book)
+            self._live[name] = rec
+        return rec
+
+    def get(self, name, default=None):
+        return self[name] if name in self.row_of else default
+
+    def __contains__(self, name) -> bool:
+        return name in self.row_of
+
+    def __setitem__(self, name: str, rec: Record) -> None:
+        if name in self.row_of:
+            del self[name]
+        self.insert_row(*record_to_row(rec))
+        self._live[name] = rec
+
+    def __delitem__(self, name: str) -> None:
+        row = self.row_of.pop(name)
+        self._live.pop(name, None)
+        for phone in self.row_values(row)[1]:
+            self.remove_phone(row, phone)
+        self.set_birthday(row, 0)
+        self.names[row] = None
+        self._free_rows.append(row)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.row_of)
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+
+class CompactAddressBook(AddressBook):
+    """
+    Книга в компактному колонковому режимі (див. CompactRecords).
+    Індекси телефонів і днів народження — теж компактні, всередині сховища.
+    Зберігається в той самий .pkl зі знімком і журналом.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._phone_index = None
+        self._birthday_buckets = None
+        self.data = CompactRecords(self)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._phone_index = None
+        self._birthday_buckets = None
+        self._birthday_doy = {}
+        self.data.book = self
+
+    def _record_changed(self, record: Record, op: str, *args: str) -> None:
+        data = self.data
+        row = data.row_of[record.name.value]
+        if op == "add_phone":
+            data.add_phone(row, *args)
+        elif op == "remove_phone":
+            data.remove_phone(row, *args)
+        elif op == "edit_phone":
+            data.edit_phone(row, *args)
+        elif op == "add_birthday":
+            data.set_birthday(row, record.birthday.value.toordinal())
+        super()._record_changed(record, op, *args)
+
+    def insert_row(self, row: ContactRow) -> None:
+        self.data.insert_row(*row)
+        if self._name_index is not None:
+            self._name_index.add(row[0])
+
+    def find_by_phone(self, phone: str) -> List[Record]:
+        return [self.data[name] for name in self.data.names_by_phone(phone.strip())]
+
+    def _birthday_candidates(self, today: date, window_end: date) -> Iterable[Record]:
+        doys = window_doys(today, (window_end - today).days)
+        return [self.data[name] for name in self.data.names_by_birthday_doy(doys)]
+
+
+def compact_book(book: AddressBook) -> CompactAddressBook:
+    # Переносить книгу в компактний режим; журнал лишається той самий
+    compact = CompactAddressBook()
+    for row in book_rows(book):
+        compact.data.insert_row(*row)
+    compact.journal = book.journal
+    compact.journal_seq = book.journal_seq
+    return compact
+
 
 def parse_input(user_input: str) -> Tuple[str, List[str]]:
     parts = user_input.strip().split()
@@ -164,6 +995,12 @@ def input_error(func: Callable) -> Callable:
                 return "Give me name, old phone and new phone please."
             if fname in {"show_phone", "show_birthday", "add_birthday"}:
                 return "Enter user name."
+            if fname == "find_phone":
+                return "Enter phone number."
+            if fname == "search_contacts":
+                return "Enter search query."
+            if fname in {"import_file", "export_file"}:
+                return "Enter file name."
             return "Not enough arguments."
         except ValueError as e:
             return str(e) if str(e) else "Wrong input. Try again."
@@ -204,6 +1041,31 @@ def show_phone(args: List[str], book: AddressBook) -> str:
     return f"{name}: {phones}"
 
 
+@input_error
+def find_phone(args: List[str], book: AddressBook) -> str:
+    phone, *_ = args
+    owners = book.find_by_phone(phone)
+    if not owners:
+        return "No contact with this phone."
+    return "\n".join(str(rec) for rec in owners)
+
+
+@input_error
+def search_contacts(args: List[str], book: AddressBook) -> str:
+    # search <query> [limit]
+    query, *rest = args
+    limit = 10
+    if rest:
+        try:
+            limit = int(rest[0])
+        except ValueError:
+            raise ValueError("Limit must be an integer.")
+    found = book.search(query, limit)
+    if not found:
+        return "No matching contacts."
+    return "\n".join(str(rec) for rec in found)
+
+
 @input_error
 def show_all(_: List[str], book: AddressBook) -> str:
     if not book.data:
@@ -239,10 +1101,91 @@ def show_birthday(args: List[str], book: AddressBook) -> str:
 
 
 @input_error
-def birthdays(_: List[str], book: AddressBook) -> str:
-    upcoming = book.get_upcoming_birthdays()
+def delete_contact(args: List[str], book: AddressBook) -> str:
+    name, *_ = args
+    if not book.delete(name):
+        raise KeyError
+    return "Contact deleted."
+
+
+@contextlib.contextmanager
+def bulk_changes(book: AddressBook) -> Iterator[None]:
+    """
+    Масові зміни (імпорт, пакетний режим): журнал книги на цей час від'єднано,
+    а SQLite-книга пише все однією транзакцією. Після блоку — і тоді, коли
+    він урвався винятком, — зміни фіксуються повним знімком у файл журналу.
+    """
+    journal, book.journal = book.journal, None
+    store = getattr(book, "store", None)
+    try:
+        with store.transaction() if store is not None else contextlib.nullcontext():
+            yield
+    finally:
+        book.journal = journal
+        if journal is not None:
+            # без знімка вже застосовані зміни блоку зникли б при наступному запуску
+            save_data(book, journal.path[:-len(JOURNAL_SUFFIX)])
+
+
+def import_contacts(book: AddressBook, path: str, workers: Optional[int] = None) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Потоковий імпорт CSV/JSONL (див. bulk_io.py). Повертає (кількість доданих, відмови).
+    Іде як масова зміна (bulk_changes): після імпорту книга зберігається повним знімком.
+    """
+    imported = 0
+    rejected: List[Tuple[int, str]] = []
+    with bulk_changes(book):
+        for rows, bad in bulk_io.validated_batches(path, validate_contact, workers):
+            rejected.extend(bad)
+            for line_no, row in rows:
+                if row[0] in book.data:
+                    rejected.append((line_no, f"Record with name '{row[0]}' already exists."))
+                    continue
+                book.insert_row(row)
+                imported += 1
+    return imported, rejected
+
+
+@input_error
+def import_file(args: List[str], book: AddressBook) -> str:
+    path, *_ = args
+    try:
+        imported, rejected = import_contacts(book, path)
+    except FileNotFoundError:
+        return f"File not found: {path}"
+    except OSError as e:
+        return f"Cannot read {path}: {e.strerror or e}"
+    lines = [f"Imported {imported} contacts, rejected {len(rejected)}."]
+    rejected.sort(key=lambda item: item[0])  # відмови пулу і книги — в порядку файлу
+    for line_no, reason in rejected[:10]:
+        lines.append(f"  line {line_no}: {reason}")
+    if len(rejected) > 10:
+        lines.append(f"  ... and {len(rejected) - 10} more.")
+    return "\n".join(lines)
+
+
+@input_error
+def export_file(args: List[str], book: AddressBook) -> str:
+    path, *_ = args
+    try:
+        count = bulk_io.write_rows(
+            path, book_rows(book), lambda ordinal: date.fromordinal(ordinal).strftime("%d.%m.%Y")
+        )
+    except OSError as e:
+        return f"Cannot write {path}: {e.strerror or e}"
+    return f"Exported {count} contacts to {path}."
+
+
+@input_error
+def birthdays(args: List[str], book: AddressBook) -> str:
+    # Необов'язковий аргумент — довжина вікна у днях (типово 7)
+    try:
+        days = int(args[0]) if args else 7
+    except ValueError:
+        raise ValueError("Number of days must be an integer.")
+    upcoming = book.get_upcoming_birthdays(days=days)
     if not upcoming:
-        return "No birthdays in the next 7 days."
+        return f"No birthdays in the next {days} days."
     # Гарний формат: день тижня: імена, через кому
     order = list(calendar.day_name)  # Monday..Sunday
     parts = []
@@ -251,56 +1194,245 @@ def birthdays(_: List[str], book: AddressBook) -> str:
             parts.append(f"{day}: {', '.join(upcoming[day])}")
     return "\n".join(parts)
 
+
+def hello(_: List[str], book: AddressBook) -> str:
+    return "How can I help you?"
+
+
+# Таблиця команд: один пошук у dict замість ланцюжка if/elif
+COMMANDS: Dict[str, Callable[[List[str], AddressBook], str]] = {
+    "hello": hello,
+    "add": add_contact,
+    "change": change_contact,
+    "phone": show_phone,
+    "find-phone": find_phone,
+    "search": search_contacts,
+    "import": import_file,
+    "export": export_file,
+    "all": show_all,
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+    "birthdays": birthdays,
+    "delete": delete_contact,
+}
+EXIT_COMMANDS = ("close", "exit")
+# Скільки відповідей накопичувати перед записом у вивід
+BATCH_FLUSH_LINES = 4096
+
+
+def run_batch(lines: Iterable[str], book: AddressBook, write: Callable[[str], Any]) -> int:
+    """
+    Пакетний режим: команди з потоку рядків, відповіді буферизуються і пишуться
+    шматками. Порожні рядки та коментарі (#) пропускаються, close/exit зупиняє пакет.
+    Пакет іде як масова зміна (bulk_changes): книга зберігається один раз наприкінці.
+    Повертає кількість виконаних команд.
+    """
+    commands = COMMANDS
+    out: List[str] = []
+    count = 0
+    try:
+        with bulk_changes(book):
+            for line in lines:
+                parts = line.split()
+                if not parts or parts[0].startswith("#"):
+                    continue
+                command = parts[0].lower()
+                if command in EXIT_COMMANDS:
+                    out.append("Good bye!")
+                    break
+                handler = commands.get(command)
+                out.append(handler(parts[1:], book) if handler is not None else "Invalid command.")
+                count += 1
+                if len(out) >= BATCH_FLUSH_LINES:
+                    write("\n".join(out) + "\n")
+                    out.clear()
+    finally:
+        if out:
+            write("\n".join(out) + "\n")
+    return count
+
 # ==========================
 # СЕРІАЛІЗАЦІЯ
 # ==========================
 
 DEFAULT_DB = "addressbook.pkl"
+JOURNAL_SUFFIX = ".journal"
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+BINARY_SUFFIX = ".nvb"
+# Новий знімок робимо, коли журнал виріс до такої частки знімка: тоді
+# відтворення хвоста при запуску не довше за читання самого знімка,
+# а вартість запису знімка розподіляється на пропорційну кількість змін
+SNAPSHOT_RATIO = 0.5
+# ...але не раніше, ніж журнал досягне стількох байтів (малі книги)
+SNAPSHOT_MIN_BYTES = 64 << 10
+
+
+def apply_journal_entry(book: AddressBook, op: str, args: List[str]) -> None:
+    # Відтворює одну мутацію з журналу (журнал книги на цей час від'єднано)
+    if op == "add_record":
+        book.add_record(Record(args[0]))
+    elif op == "delete":
+        book.delete(args[0])
+    else:
+        record = book.find(args[0])
+        if op == "add_phone":
+            record.add_phone(args[1])
+        elif op == "remove_phone":
+            record.remove_phone(args[1])
+        elif op == "edit_phone":
+            record.edit_phone(args[1], args[2])
+        elif op == "add_birthday":
+            record.add_birthday(args[1])
+        else:
+            raise ValueError(f"Unknown journal operation: {op}")
+
 
 def save_data(book: AddressBook, filename: str = DEFAULT_DB) -> None:
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
+    # Формат визначає розширення filename: так само save_data конвертує книгу
+    if filename.endswith(SQLITE_SUFFIXES):
+        if isinstance(book, SqliteAddressBook) and \
+                os.path.realpath(book.store.path) == os.path.realpath(filename):
+            return  # SQLite фіксує кожну зміну сам
+        # Нова база в тимчасовому файлі й атомарна підміна: наявний файл
+        # замінюється цілком, а не доповнюється (і не лишається напівзаписаним)
+        tmp = filename + ".tmp"
+        for path in (tmp, tmp + "-wal", tmp + "-shm"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+        store = SqliteStore(tmp)
+        try:
+            store.insert_rows(book_rows(book))
+        finally:
+            store.close()
+        # WAL старої бази застосувався б до нової
+        for path in (filename + "-wal", filename + "-shm"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+        os.replace(tmp, filename)
+        return
+
+    # Повний знімок: пишемо у тимчасовий файл і атомарно підміняємо старий,
+    # після чого журнал можна обнулити — його записи вже у знімку.
+    tmp = filename + ".tmp"
+    if filename.endswith(BINARY_SUFFIX):
+        write_book(tmp, book_rows(book), book.journal_seq)
+    else:
+        snapshot = book
+        if isinstance(book, (SqliteAddressBook, BinaryAddressBook)):
+            snapshot = AddressBook()
+            snapshot.data = dict(book.data.items())
+            snapshot.journal_seq = book.journal_seq
+        with open(tmp, "wb") as f:
+            pickle.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    own_file = isinstance(book, BinaryAddressBook) and book.path == filename
+    if own_file:
+        book.data.base.close()  # старий файл не можна підмінити, поки він змаплений (Windows)
+    os.replace(tmp, filename)
+    if own_file:
+        book.reopen()
+    if book.journal is not None and book.journal.path == filename + JOURNAL_SUFFIX:
+        book.journal.truncate()
+
 
 def load_data(filename: str = DEFAULT_DB) -> AddressBook:
+    # Знімок + відтворення хвоста журналу; до книги під'єднується журнал,
+    # тож кожна наступна зміна одразу дописується на диск.
+    # Файл .db/.sqlite/.sqlite3 відкривається як SqliteAddressBook.
+    # Файл .nvb мапиться як BinaryAddressBook і теж має журнал.
+    if filename.endswith(SQLITE_SUFFIXES):
+        return SqliteAddressBook(filename)
+    if filename.endswith(BINARY_SUFFIX):
+        book = BinaryAddressBook(filename)
+    else:
+        try:
+            with open(filename, "rb") as f:
+                book = pickle.load(f)
+        except FileNotFoundError:
+            book = AddressBook()
+    journal = Journal(filename + JOURNAL_SUFFIX)
+    for _, op, args in journal.replay(book.journal_seq):
+        apply_journal_entry(book, op, args)
+    journal.seq = book.journal_seq = max(journal.seq, book.journal_seq)
+    book.journal = journal
+    return book
+
+
+def maybe_snapshot(book: AddressBook, filename: str = DEFAULT_DB) -> None:
+    # Періодичне стискання: журнал не росте безмежно між запусками
+    journal = book.journal
+    if journal is None or not journal.pending or journal.bytes < SNAPSHOT_MIN_BYTES:
+        return
     try:
-        with open(filename, "rb") as f:
-            return pickle.load(f)
-    except FileNotFoundError:
-        return AddressBook()
+        snapshot_bytes = os.path.getsize(filename)
+    except OSError:
+        snapshot_bytes = 0
+    if journal.bytes >= SNAPSHOT_RATIO * snapshot_bytes:
+        save_data(book, filename)
 
 # ==========================
 # ГОЛОВНИЙ ЦИКЛ
 # ==========================
 
 def main():
-    book = load_data()
+    parser = argparse.ArgumentParser(description="Assistant bot with an address book.")
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB,
+        help="Файл книги: *.pkl (знімок + журнал), *.nvb (бінарний, mmap) або *.db/*.sqlite (SQLite)"
+    )
+    parser.add_argument(
+        "--convert-to",
+        metavar="FILE",
+        help="Записати книгу з --db у FILE (формат за розширенням) і вийти"
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Тримати *.pkl-книгу в компактному колонковому режимі (мільйони контактів)"
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="Виконати команди з FILE (або stdin) без запрошень і зберегти книгу один раз"
+    )
+    cli = parser.parse_args()
+
+    book = load_data(cli.db)
+    if cli.compact and type(book) is AddressBook:
+        book = compact_book(book)
+        save_data(book, cli.db)  # далі книга вже завантажується компактною
+    if cli.convert_to:
+        save_data(book, cli.convert_to)
+        print(f"Converted {len(book)} contacts: {cli.db} -> {cli.convert_to}")
+        book.close()
+        return
+    if cli.batch:
+        with open(cli.batch, encoding="utf-8") if cli.batch != "-" else contextlib.nullcontext(sys.stdin) as fh:
+            run_batch(fh, book, sys.stdout.write)  # знімок робить сам пакет (bulk_changes)
+        book.close()
+        return
     print("Welcome to the assistant bot!")
     while True:
         user_input = input("Enter a command: ")
         command, args = parse_input(user_input)
 
         if command in ("close", "exit"):
-            save_data(book)
+            # Усі зміни вже в журналі; повний знімок — лише якщо журнал великий
+            maybe_snapshot(book, cli.db)
+            book.close()
             print("Good bye!")
             break
-        elif command == "hello":
-            print("How can I help you?")
-        elif command == "add":
-            print(add_contact(args, book))
-        elif command == "change":
-            print(change_contact(args, book))
-        elif command == "phone":
-            print(show_phone(args, book))
-        elif command == "all":
-            print(show_all(args, book))
-        elif command == "add-birthday":
-            print(add_birthday(args, book))
-        elif command == "show-birthday":
-            print(show_birthday(args, book))
-        elif command == "birthdays":
-            print(birthdays(args, book))
-        else:
+        handler = COMMANDS.get(command)
+        if handler is None:
             print("Invalid command.")
+        else:
+            print(handler(args, book))
+        maybe_snapshot(book, cli.db)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+"""
+Журнал змін (write-ahead log) для адресної книги.
+
+Кожна мутація книги дописується в кінець файлу одним JSON-рядком:
+    [seq, "op", [arg1, arg2, ...]]
+Знімок (snapshot) книги зберігає номер останнього застосованого запису,
+тож при завантаженні відтворюється лише "хвіст" журналу після знімка.
+Модуль нічого не знає про класи книги — лише про рядки журналу.
+"""
+
+from __future__ import annotations
+import json
+import os
+from typing import Iterator, List, Tuple
+
+
+JournalEntry = Tuple[int, str, List[str]]
+
+
+class Journal:
+    def __init__(self, path: str, fsync: bool = False) -> None:
+        # fsync=True — кожен запис переживе і падіння ОС, але append стає на порядок повільнішим
+        self.path = path
+        self.fsync = fsync
+        self.seq = 0       # номер останнього запису у файлі
+        self.pending = 0   # кількість записів після останнього знімка
+        # розмір файлу в байтах: за ним книга вирішує, коли робити новий знімок
+        self.bytes = os.path.getsize(path) if os.path.exists(path) else 0
+        self._fh = None
+
+    def replay(self, after_seq: int = 0) -> Iterator[JournalEntry]:
+        """
+        Повертає записи з seq > after_seq у порядку запису.
+        Обірваний останній рядок (падіння посеред запису) відкидається і обрізається з файлу.
+        """
+        good_offset = 0
+        try:
+            fh = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with fh:
+            for raw in fh:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    seq, op, args = json.loads(raw)
+                except ValueError:
+                    break
+                good_offset += len(raw)
+                self.seq = seq
+                if seq > after_seq:
+                    self.pending += 1
+                    yield seq, op, args
+        if good_offset < os.path.getsize(self.path):
+            with open(self.path, "r+b") as fh:
+                fh.truncate(good_offset)
+        self.bytes = good_offset
+
+    def append(self, op: str, args: List[str]) -> int:
+        # Один рядок на мутацію: вартість запису не залежить від розміру книги
+        if self._fh is None:
+            self._fh = open(self.path, "ab")
+        self.seq += 1
+        line = (json.dumps([self.seq, op, args], ensure_ascii=False) + "\n").encode("utf-8")
+        self._fh.write(line)
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+        self.pending += 1
+        self.bytes += len(line)
+        return self.seq
+
+    def truncate(self) -> None:
+        # Викликається після успішного знімка: усі записи вже в ньому.
+        # Нумерація seq продовжується, щоб знімок і журнал не переплутались.
+        self.close()
+        with open(self.path, "w", encoding="utf-8"):
+            pass
+        self.pending = 0
+        self.bytes = 0
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
@@ -0,0 +1,112 @@
+"""
+Пошук контактів за іменем: префіксний і нечіткий (з одруківками).
+
+- Префікс: відсортований масив пар (casefold-ім'я, ім'я) + bisect.
+- Нечіткий пошук: триграмний індекс по casefold-іменах; кандидати беруться
+  з найрідших триграм запиту, ранжування — за схожістю Жаккара.
+Модуль працює лише з рядками імен і нічого не знає про Record.
+
+Кожне ДЗ самодостатнє, тож модуль лежить у трьох однакових копіях:
+goit-pycore-hw-06, goit-pycore-hw-07 і goit-pycore-hw-08. Змінюйте їх разом.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+# Мінімальна схожість Жаккара за триграмами для нечіткого збігу
+MIN_SIMILARITY = 0.3
+
+
+def trigrams(folded: str) -> Set[str]:
+    # Як у pg_trgm: два пробіли попереду й один позаду, щоб початок слова важив більше
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        # одне сортування на весь набір дешевше, ніж insort по одному
+        self._sorted: List[Tuple[str, str]] = sorted((n.casefold(), n) for n in names)
+        self._trigrams: Dict[str, Set[str]] = {}
+        for folded, name in self._sorted:
+            for t in trigrams(folded):
+                self._trigrams.setdefault(t, set()).add(name)
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def add(self, name: str) -> None:
+        folded = name.casefold()
+        insort(self._sorted, (folded, name))
+        for t in trigrams(folded):
+            self._trigrams.setdefault(t, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        key = (name.casefold(), name)
+        i = bisect_left(self._sorted, key)
+        if i == len(self._sorted) or self._sorted[i] != key:
+            return
+        del self._sorted[i]
+        for t in trigrams(key[0]):
+            names = self._trigrams.get(t)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._trigrams[t]
+
+    def prefix(self, query: str, limit: int) -> List[str]:
+        folded = query.casefold()
+        result = []
+        i = bisect_left(self._sorted, (folded,))
+        while i < len(self._sorted) and len(result) < limit:
+            key, name = self._sorted[i]
+            if not key.startswith(folded):
+                break
+            result.append(name)
+            i += 1
+        return result
+
+    def fuzzy(self, query: str, limit: int) -> List[str]:
+        q = trigrams(query.casefold())
+        min_shared = max(1, int(MIN_SIMILARITY * len(q) + 0.999))
+        postings = sorted((self._trigrams.get(t, ()) for t in q), key=len)
+        # Ім'я, що має >= min_shared спільних триграм, обов'язково є хоча б
+        # в одному з (len(q) - min_shared + 1) найменших списків: лише вони
+        # дають кандидатів (Counter.update рахує на рівні C)
+        split = len(q) - min_shared + 1
+        counts: Counter = Counter()
+        for names in postings[:split]:
+            counts.update(names)
+        rest = postings[split:]
+
+        scored = []
+        for name, shared in counts.items():
+            # Оцінка зверху: навіть якщо ім'я є в усіх частих списках,
+            # чи дотягне воно до порогу? Більшість кандидатів відсіюється тут.
+            best = shared + len(rest)
+            own = len(name) + 1  # кількість триграм імені (з відступами)
+            if best < min_shared or best < MIN_SIMILARITY * (len(q) + own - best):
+                continue
+            for names in rest:
+                if name in names:
+                    shared += 1
+            similarity = shared / (len(q) + own - shared)
+            if shared >= min_shared and similarity >= MIN_SIMILARITY:
+                scored.append((-similarity, name.casefold(), name))
+        scored.sort()
+        return [name for _, _, name in scored[:limit]]
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        # Спершу префіксні збіги, далі — нечіткі, без повторів
+        found = self.prefix(query, limit)
+        if len(found) < limit and len(query) >= 3:
+            seen = set(found)
+            for name in self.fuzzy(query, limit):
+                if name not in seen:
+                    found.append(name)
+                    if len(found) == limit:
+                        break
+        return found
@@ -0,0 +1,166 @@
+"""
+Сховище адресної книги у локальному файлі SQLite.
+
+Модуль працює лише з простими значеннями (ім'я, рядки телефонів,
+порядковий номер дати ДН) — об'єкти Record будує сама книга (hw08.py),
+і лише тоді, коли вони справді потрібні.
+"""
+
+from __future__ import annotations
+import sqlite3
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    name         TEXT PRIMARY KEY,
+    birthday     INTEGER,          -- date.toordinal()
+    birthday_doy INTEGER           -- день року у високосному календарі, 1..366
+);
+CREATE TABLE IF NOT EXISTS phones (
+    id    INTEGER PRIMARY KEY,     -- зберігає порядок додавання телефонів
+    name  TEXT NOT NULL,
+    phone TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS phones_by_name ON phones(name, id);
+CREATE INDEX IF NOT EXISTS phones_by_phone ON phones(phone);
+CREATE INDEX IF NOT EXISTS contacts_by_doy ON contacts(birthday_doy);
+"""
+
+# (name, [phones...], birthday ordinal або None)
+ContactRow = Tuple[str, List[str], Optional[int]]
+
+
+class SqliteStore:
+    def __init__(self, path: str) -> None:
+        # isolation_level=None — кожна мутація одразу фіксується (autocommit);
+        # WAL + synchronous=NORMAL робить такі дрібні транзакції дешевими.
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def names(self) -> Iterator[str]:
+        for (name,) in self.conn.execute("SELECT name FROM contacts ORDER BY rowid"):
+            yield name
+
+    def contains(self, name: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM contacts WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def get(self, name: str) -> Optional[ContactRow]:
+        row = self.conn.execute(
+            "SELECT birthday FROM contacts WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        phones = [p for (p,) in self.conn.execute(
+            "SELECT phone FROM phones WHERE name = ? ORDER BY id", (name,)
+        )]
+        return name, phones, row[0]
+
+    def add(self, name: str) -> None:
+        self.conn.execute("INSERT INTO contacts(name) VALUES (?)", (name,))
+
+    def delete(self, name: str) -> None:
+        with self.transaction():
+            self.conn.execute("DELETE FROM phones WHERE name = ?", (name,))
+            self.conn.execute("DELETE FROM contacts WHERE name = ?", (name,))
+
+    def add_phone(self, name: str, phone: str) -> None:
+        self.conn.execute("INSERT INTO phones(name, phone) VALUES (?, ?)", (name, phone))
+
+    def remove_phone(self, name: str, phone: str) -> None:
+        # Як і Record.remove_phone — лише перший збіг
+        self.conn.execute(
+            "DELETE FROM phones WHERE id = "
+            "(SELECT MIN(id) FROM phones WHERE name = ? AND phone = ?)",
+            (name, phone),
+        )
+
+    def edit_phone(self, name: str, old_phone: str, new_phone: str) -> None:
+        self.conn.execute(
+            "UPDATE phones SET phone = ? WHERE id = "
+            "(SELECT MIN(id) FROM phones WHERE name = ? AND phone = ?)",
+            (new_phone, name, old_phone),
+        )
+
+    def set_birthday(self, name: str, ordinal: int, doy: int) -> None:
+        self.conn.execute(
+            "UPDATE contacts SET birthday = ?, birthday_doy = ? WHERE name = ?",
+            (ordinal, doy, name),
+        )
+
+    def insert_row(self, name: str, phones: List[str], ordinal: Optional[int]) -> None:
+        # Увесь контакт одразу (імпорт); у транзакції викликача, якщо вона відкрита
+        doy = None
+        if ordinal:
+            d = date.fromordinal(ordinal)
+            doy = date(2000, d.month, d.day).timetuple().tm_yday
+        self.conn.execute(
+            "INSERT INTO contacts(name, birthday, birthday_doy) VALUES (?, ?, ?)",
+            (name, ordinal, doy),
+        )
+        self.conn.executemany(
+            "INSERT INTO phones(name, phone) VALUES (?, ?)",
+            ((name, p) for p in phones),
+        )
+
+    def insert_rows(self, rows: Iterable[ContactRow]) -> int:
+        # Масове додавання однією транзакцією (конвертація, імпорт)
+        count = 0
+        with self.transaction():
+            for row in rows:
+                self.insert_row(*row)
+                count += 1
+        return count
+
+    def rows(self) -> Iterator[ContactRow]:
+        # Усі контакти одним проходом (експорт, конвертація)
+        cur = self.conn.execute(
+            "SELECT c.name, c.birthday, p.phone FROM contacts c "
+            "LEFT JOIN phones p ON p.name = c.name ORDER BY c.rowid, p.id"
+        )
+        current = None
+        for name, birthday, phone in cur:
+            if current is None or current[0] != name:
+                if current is not None:
+                    yield current
+                current = (name, [], birthday)
+            if phone is not None:
+                current[1].append(phone)
+        if current is not None:
+            yield current
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        # Одна транзакція на багато змін (масовий імпорт) замість autocommit на кожну.
+        # Вкладений виклик (імпорт чи видалення усередині пакетного режиму) лише
+        # приєднується до зовнішньої: власний BEGIN тут був би помилкою.
+        if self.conn.in_transaction:
+            yield
+            return
+        with self.conn:
+            self.conn.execute("BEGIN")
+            yield
+
+    def names_by_birthday_doy(self, doys: Iterable[int]) -> List[str]:
+        doys = list(doys)
+        marks = ",".join("?" * len(doys))
+        return [n for (n,) in self.conn.execute(
+            f"SELECT name FROM contacts WHERE birthday_doy IN ({marks})", doys
+        )]
+
+    def names_by_phone(self, phone: str) -> List[str]:
+        return [n for (n,) in self.conn.execute(
+            "SELECT DISTINCT name FROM phones WHERE phone = ?", (phone,)
+        )]
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,62 @@
+from hw08 import Record, SqliteAddressBook, book_rows, load_data, run_batch, save_data
+
+
+def make_sqlite_book(path, names):
+    book = SqliteAddressBook(str(path))
+    for i, name in enumerate(names):
+        record = Record(name)
+        record.add_phone(f"{i:010d}")
+        book.add_record(record)
+    return book
+
+
+def test_convert_sqlite_to_other_sqlite(tmp_path):
+    book = make_sqlite_book(tmp_path / "a.db", ["John", "Jane"])
+    save_data(book, str(tmp_path / "b.db"))
+    expected = list(book_rows(book))
+    book.close()
+
+    converted = load_data(str(tmp_path / "b.db"))
+    assert list(book_rows(converted)) == expected
+    converted.close()
+
+
+def test_convert_into_existing_sqlite_replaces_it(tmp_path):
+    make_sqlite_book(tmp_path / "b.db", ["John", "Old"]).close()
+    book = make_sqlite_book(tmp_path / "a.db", ["John", "Jane"])
+    save_data(book, str(tmp_path / "b.db"))
+    expected = list(book_rows(book))
+    book.close()
+
+    converted = load_data(str(tmp_path / "b.db"))
+    assert list(book_rows(converted)) == expected
+    converted.close()
+    assert not (tmp_path / "b.db.tmp").exists()
+
+
+def test_save_sqlite_into_own_file_is_noop(tmp_path):
+    book = make_sqlite_book(tmp_path / "a.db", ["John"])
+    save_data(book, str(tmp_path / "a.db"))
+    book.add_record(Record("Jane"))
+    assert [row[0] for row in book_rows(book)] == ["John", "Jane"]
+    book.close()
+
+
+def test_interrupted_batch_keeps_applied_changes(tmp_path):
+    path = str(tmp_path / "book.pkl")
+    book = load_data(path)
+
+    def lines():
+        yield "add John 1234567890"
+        yield "add Jane 0987654321"
+        raise KeyboardInterrupt
+
+    try:
+        run_batch(lines(), book, lambda text: None)
+    except KeyboardInterrupt:
+        pass
+    book.close()
+
+    reloaded = load_data(path)
+    assert [row[0] for row in book_rows(reloaded)] == ["John", "Jane"]
+    reloaded.close()